@@ -0,0 +1,4 @@
+"""
+Benchmark Suite for Argus Digital Sentinel
+Times the analyzer, collector, report and endpoint hot paths against a stored baseline
+"""
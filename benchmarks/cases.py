@@ -0,0 +1,376 @@
+"""
+Benchmark Cases for Argus Digital Sentinel
+Defines the analyzer, report and endpoint workloads timed by the benchmark runner
+"""
+
+import io
+import json
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+from flask import Flask, url_for
+
+from src.models.user import db, User
+from src.models.scan import DigitalFootprintScan
+from src.services.ai_analyzer import analyzer
+from src.services.data_collector import collector
+from src.services.item_ledger import ItemLedger
+from src.services.risk_rollup import risk_rollups
+from src.services.risk_summary import risk_summaries
+from src.services.timeline_parser import compact_timeline, tweet_items
+
+from .corpus import (PLATFORMS, make_platform_analyses, make_platform_data, make_rng,
+                     make_scan_history, make_text, make_texts, make_timeline_response)
+from .timing import Case
+
+TEXT_SIZES = [100, 1000, 10000, 100000]
+BATCH_SIZE = 500
+PLATFORM_ITEMS = 200
+SEEDED_SCANS = 500
+CONCURRENT_SCANS = 8
+HISTORY_PAGES = 50
+SLOW_API_LATENCY = 0.02
+
+
+def reset_analysis_caches():
+    """Make every timed call redo its keyword extraction"""
+    analyzer.item_cache.clear()
+
+
+def reset_caches():
+    """Make every timed call refetch platform data and redo its analysis"""
+    collector.cache.clear()
+    reset_analysis_caches()
+
+
+def analyzer_cases() -> List[Case]:
+    rng = make_rng()
+    cases = []
+
+    for size in TEXT_SIZES:
+        text = make_text(rng, size)
+        cases.append(Case(
+            f'analyze_text_content[{size}]',
+            lambda text=text: analyzer.analyze_text_content(text, 'twitter'),
+            iterations=200 if size <= 10000 else 30,
+            setup=reset_analysis_caches
+        ))
+
+    texts = make_texts(rng, BATCH_SIZE, 280)
+    cases.append(Case(
+        f'analyze_batch[{BATCH_SIZE}]',
+        lambda: analyzer.analyze_batch(texts, 'twitter'),
+        iterations=20, setup=reset_analysis_caches, items=BATCH_SIZE
+    ))
+    cases.append(Case(
+        f'analyze_batch_scores_only[{BATCH_SIZE}]',
+        lambda: analyzer.analyze_batch(texts, 'twitter', include_factors=False),
+        iterations=20, setup=reset_analysis_caches, items=BATCH_SIZE
+    ))
+
+    for platform in PLATFORMS:
+        data = make_platform_data(platform, rng, items=PLATFORM_ITEMS)
+        cases.append(Case(
+            f'analyze_platform_data[{platform}]',
+            lambda platform=platform, data=data: analyzer.analyze_platform_data(platform, data),
+            iterations=30, setup=reset_analysis_caches
+        ))
+
+    # A deep Twitter history, streamed page by page versus analyzed as one joined response
+    pages = [make_platform_data('twitter', rng, items=PLATFORM_ITEMS) for _ in range(HISTORY_PAGES)]
+    joined = make_platform_data('twitter', rng, items=1)
+    joined['tweets']['result']['timeline']['instructions'][0]['entries'] = [
+        entry for page in pages for entry in page['tweets']['result']['timeline']['instructions'][0]['entries']
+    ]
+    history_items = HISTORY_PAGES * PLATFORM_ITEMS
+    cases.append(Case(
+        f'analyze_history[twitter,{history_items}].streamed',
+        lambda: analyzer.analyze_history('twitter', [('profile', pages[0]['profile'])] +
+                                         [('tweets', page['tweets']) for page in pages]),
+        iterations=10, setup=reset_analysis_caches, items=history_items
+    ))
+    cases.append(Case(
+        f'analyze_history[twitter,{history_items}].joined',
+        lambda: analyzer.analyze_platform_data('twitter', joined),
+        iterations=10, setup=reset_analysis_caches, items=history_items
+    ))
+
+    # The same history as a config's first scan, recording every item in the ledger
+    ledger_app = create_ledger_app()
+
+    def analyze_history_with_ledger():
+        with ledger_app.app_context():
+            analyzer.analyze_history('twitter', [('profile', pages[0]['profile'])] +
+                                     [('tweets', page['tweets']) for page in pages], ItemLedger(1))
+            # Rolled back so every call records the items afresh
+            db.session.rollback()
+
+    cases.append(Case(
+        f'analyze_history[twitter,{history_items}].ledger',
+        analyze_history_with_ledger,
+        iterations=5, setup=reset_analysis_caches, items=history_items
+    ))
+
+    # A raw timeline page, parsed from the stream versus loaded whole and walked
+    raw_timeline = make_timeline_response(rng, items=PLATFORM_ITEMS)
+    cases.append(Case(
+        f'parse_timeline[twitter,{PLATFORM_ITEMS}].streamed',
+        lambda: list(tweet_items(compact_timeline(io.BytesIO(raw_timeline)))),
+        iterations=50, items=PLATFORM_ITEMS
+    ))
+    cases.append(Case(
+        f'parse_timeline[twitter,{PLATFORM_ITEMS}].loaded',
+        lambda: list(tweet_items(json.loads(raw_timeline))),
+        iterations=50, items=PLATFORM_ITEMS
+    ))
+
+    analyses = make_platform_analyses(rng)
+    cases.append(Case(
+        'calculate_overall_risk',
+        lambda: analyzer.calculate_overall_risk(analyses),
+        iterations=500
+    ))
+
+    return cases
+
+
+def report_cases() -> List[Case]:
+    # Imported here so analyzer-only runs skip the plotting stack
+    from src.services.report_generator import report_generator
+
+    rng = make_rng()
+    analyses = make_platform_analyses(rng)
+    history = make_scan_history(rng)
+    output_dir = tempfile.mkdtemp(prefix='argus-bench-')
+
+    return [
+        Case(
+            'generate_dashboard_data',
+            lambda: report_generator.generate_dashboard_data(analyses),
+            iterations=500
+        ),
+    ] + chart_cases(analyses, history, output_dir)
+
+
+def chart_cases(analyses, history, output_dir) -> List[Case]:
+    """Cold renders (what a cache miss costs) and repeat requests served from the chart cache"""
+    from src.services.chart_renderer import (ChartRenderer, render_chart, risk_trend_data,
+                                             platform_distribution_data, risk_factors_data)
+
+    charts = [
+        ('risk_trend', risk_trend_data(history)),
+        ('platform_distribution', platform_distribution_data(analyses)),
+        ('risk_factors', risk_factors_data(analyses))
+    ]
+    # Inline renderer so cold timings measure drawing, not pool start-up
+    renderer = ChartRenderer(output_dir, workers=0)
+
+    cases = []
+    for kind, data in charts:
+        cases.append(Case(
+            f'chart.{kind}',
+            lambda kind=kind, data=data: render_chart(kind, data),
+            iterations=5, warmup=1
+        ))
+        cases.append(Case(
+            f'chart.{kind}.preview_svg',
+            lambda kind=kind, data=data: render_chart(kind, data, 'svg', 72),
+            iterations=5, warmup=1
+        ))
+        cases.append(Case(
+            f'chart.{kind}.cached',
+            lambda kind=kind, data=data: renderer.render(kind, data),
+            iterations=200, warmup=1
+        ))
+    return cases
+
+
+def create_app() -> Flask:
+    """Application wired like main.py, on an in-memory database and without background workers"""
+    from src.routes.user import user_bp
+    from src.routes.scan import scan_bp
+    from src.routes.reports import reports_bp
+    from src.routes.analysis import analysis_bp
+
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SERVER_NAME'] = 'benchmark.local'
+
+    app.register_blueprint(user_bp, url_prefix='/api')
+    app.register_blueprint(scan_bp, url_prefix='/api')
+    app.register_blueprint(reports_bp, url_prefix='/api')
+    app.register_blueprint(analysis_bp, url_prefix='/api')
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        seed_database()
+
+    return app
+
+
+def create_ledger_app() -> Flask:
+    """Bare app on an empty in-memory database, for item ledger workloads"""
+    app = Flask(__name__)
+    app.config['SQLALCHEMY_DATABASE_URI'] = 'sqlite://'
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    db.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+
+    return app
+
+
+def seed_database():
+    rng = make_rng()
+    user = User(username='benchmark', email='benchmark@example.com')
+    db.session.add(user)
+    db.session.flush()
+
+    for index in range(SEEDED_SCANS):
+        scan = DigitalFootprintScan(
+            user_id=user.id,
+            platform=PLATFORMS[index % len(PLATFORMS)],
+            username=f'benchmark_{index}',
+            status='completed',
+            risk_score=round(rng.uniform(0, 100), 1)
+        )
+        raw_data = make_platform_data(scan.platform, rng, items=5)
+        scan.set_raw_data(raw_data)
+        scan.set_analysis_results(analyzer.analyze_platform_data(scan.platform, raw_data))
+        db.session.add(scan)
+
+    db.session.flush()
+    risk_rollups.rebuild(db.session.connection())
+    risk_summaries.rebuild(db.session.connection())
+    db.session.commit()
+
+
+def endpoint_cases() -> List[Case]:
+    app = create_app()
+    client = app.test_client()
+    rng = make_rng()
+
+    with app.app_context():
+        urls = {
+            'demo_scan': url_for('scan.demo_scan'),
+            'scans': url_for('scan.get_scans', user_id=1),
+            'batch': url_for('analysis.analyze_batch'),
+            'summary': url_for('reports.get_analysis_summary'),
+            'risk_trend': url_for('scan.get_risk_trend', user_id=1, period='day', buckets=90),
+            'user_risk': url_for('scan.get_user_risk', user_id=1)
+        }
+
+    batch_body = {'texts': make_texts(rng, 100, 280), 'platform': 'twitter'}
+    summary_body = {'platforms': [{'platform': platform, 'username': 'benchmark'} for platform in PLATFORMS]}
+
+    def request(method, url, **kwargs):
+        response = client.open(url, method=method, **kwargs)
+        if response.status_code >= 400:
+            raise RuntimeError(f'{method} {url} returned {response.status_code}')
+        return response.data
+
+    return [
+        Case(
+            'endpoint.demo_scan',
+            lambda: request('POST', urls['demo_scan'], json={'platform': 'twitter', 'username': 'benchmark'}),
+            iterations=100, setup=reset_caches
+        ),
+        Case(
+            'endpoint.scans',
+            lambda: request('GET', urls['scans']),
+            iterations=50
+        ),
+        Case(
+            'endpoint.analyze_batch[100]',
+            lambda: request('POST', urls['batch'], json=batch_body),
+            iterations=30, setup=reset_analysis_caches, items=100
+        ),
+        Case(
+            'endpoint.reports_summary',
+            lambda: request('POST', urls['summary'], json=summary_body),
+            iterations=50, setup=reset_analysis_caches
+        ),
+        Case(
+            'endpoint.reports_summary[stored]',
+            lambda: request('POST', urls['summary'], json={'user_id': 1}),
+            iterations=50
+        ),
+        Case(
+            'endpoint.risk_trend',
+            lambda: request('GET', urls['risk_trend']),
+            iterations=200
+        ),
+        Case(
+            'endpoint.user_risk',
+            lambda: request('GET', urls['user_risk']),
+            iterations=200
+        )
+    ]
+
+
+def client_cases() -> List[Case]:
+    """Platform collection over HTTP against the local stub API, pooled vs a new connection per call"""
+    from src.services.platform_client import PlatformClient, make_adapters
+    from src.services.rate_limiter import RateLimiter
+    from src.services.single_flight import SingleFlight
+    from .stub_api import start_stub_server
+
+    server = start_stub_server(items=PLATFORM_ITEMS)
+    # Limits high enough never to wait, so only the limiter's bookkeeping is measured
+    limiter = RateLimiter(rate=1_000_000, burst=1_000_000)
+    pooled = PlatformClient(base_url=server.url, limiter=limiter)
+
+    def unpooled_call(endpoint, query, parse=None):
+        # What building a client per scan costs: a fresh connection for every call
+        client = PlatformClient(base_url=server.url, limiter=limiter)
+        try:
+            return client.call_api(endpoint, query, parse=parse)
+        finally:
+            client.close()
+
+    cases = []
+    for name, call in (('pooled', pooled.call_api), ('unpooled', unpooled_call)):
+        adapters = make_adapters(call)
+        for platform in ('twitter', 'youtube'):
+            cases.append(Case(
+                f'platform_client.collect[{platform}].{name}',
+                lambda adapter=adapters[platform]: adapter.collect('benchmark'),
+                iterations=50
+            ))
+
+    # Several scans of one handle at once, against an upstream with realistic latency
+    slow_server = start_stub_server(items=PLATFORM_ITEMS, latency=SLOW_API_LATENCY)
+    slow_client = PlatformClient(base_url=slow_server.url, limiter=limiter)
+    adapter = make_adapters(slow_client.call_api)['twitter']
+    flights = SingleFlight('benchmark')
+    executor = ThreadPoolExecutor(max_workers=CONCURRENT_SCANS)
+
+    def concurrent_scans(collect):
+        futures = [executor.submit(collect) for _ in range(CONCURRENT_SCANS)]
+        for future in futures:
+            future.result()
+
+    for name, collect in (
+        ('coalesced', lambda: flights.do('benchmark', lambda: adapter.collect('benchmark'))),
+        ('independent', lambda: adapter.collect('benchmark'))
+    ):
+        cases.append(Case(
+            f'platform_client.concurrent_scans[twitter,{CONCURRENT_SCANS}].{name}',
+            lambda collect=collect: concurrent_scans(collect),
+            iterations=20,
+            items=CONCURRENT_SCANS
+        ))
+    return cases
+
+
+SUITES = {
+    'analyzer': analyzer_cases,
+    'reports': report_cases,
+    'endpoints': endpoint_cases,
+    'client': client_cases
+}
@@ -0,0 +1,189 @@
+"""
+Benchmark Corpora for Argus Digital Sentinel
+Builds deterministic, scalable inputs from the DataCollector mock generators
+"""
+
+import copy
+import json
+import random
+from datetime import datetime, timedelta
+from typing import Any, Dict, List
+
+from src.services.ai_analyzer import analyzer
+from src.services.data_collector import collector
+
+PLATFORMS = ['twitter', 'linkedin', 'youtube', 'tiktok', 'reddit']
+
+# Filler vocabulary mixed with the analyzer's own lexicon so texts carry realistic hit rates
+FILLER_WORDS = [
+    'the', 'and', 'today', 'really', 'excited', 'about', 'future', 'technology', 'amazing',
+    'launch', 'thanks', 'everyone', 'weekend', 'coffee', 'reading', 'release', 'update',
+    'working', 'on', 'new', 'ideas', 'with', 'great', 'people', 'at', 'conference'
+]
+
+
+def make_rng(seed: int = 1337) -> random.Random:
+    return random.Random(seed)
+
+
+def make_text(rng: random.Random, size: int, keyword_rate: float = 0.05) -> str:
+    """Text of roughly ``size`` characters with about ``keyword_rate`` of words from the lexicon"""
+    keywords = analyzer.matcher.keywords
+    words = []
+    length = 0
+    while length < size:
+        word = rng.choice(keywords) if rng.random() < keyword_rate else rng.choice(FILLER_WORDS)
+        words.append(word)
+        length += len(word) + 1
+    return ' '.join(words)[:size]
+
+
+def make_texts(rng: random.Random, count: int, size: int) -> List[str]:
+    return [make_text(rng, size) for _ in range(count)]
+
+
+def make_platform_data(platform: str, rng: random.Random, items: int = 200) -> Dict[str, Any]:
+    """Mock platform payload scaled up to ``items`` tweets, videos or posts"""
+    data = getattr(collector, f'_get_mock_{platform}_data')('benchmark_user')
+
+    if platform == 'twitter':
+        instruction = data['tweets']['result']['timeline']['instructions'][0]
+        template = instruction['entries'][0]
+        entries = []
+        for index in range(items):
+            entry = copy.deepcopy(template)
+            entry['entryId'] = f'tweet-{index}'
+            tweet = entry['content']['itemContent']['tweet_results']['result']
+            tweet['rest_id'] = str(10 ** 12 + index)
+            tweet['legacy']['full_text'] = make_text(rng, 200)
+            entries.append(entry)
+        instruction['entries'] = entries
+
+    elif platform == 'youtube':
+        template = data['videos']['contents'][0]
+        contents = []
+        for index in range(items):
+            content = copy.deepcopy(template)
+            content['video']['videoId'] = f'video{index:06d}'
+            content['video']['title'] = make_text(rng, 80)
+            contents.append(content)
+        data['videos']['contents'] = contents
+
+    elif platform == 'reddit':
+        template = data['posts']['posts'][0]
+        posts = []
+        for index in range(items):
+            post = copy.deepcopy(template)
+            post['data']['id'] = f't3_{index}'
+            post['data']['title'] = make_text(rng, 80)
+            post['data']['selftext'] = make_text(rng, 400)
+            posts.append(post)
+        data['posts']['posts'] = posts
+
+    elif platform == 'linkedin':
+        template = data['profile']['position'][0]
+        positions = []
+        for index in range(min(items, 20)):
+            position = copy.deepcopy(template)
+            position['description'] = make_text(rng, 300)
+            positions.append(position)
+        data['profile']['position'] = positions
+
+    return data
+
+
+def make_timeline_response(rng: random.Random, items: int = 200) -> bytes:
+    """Raw get_user_tweets body with the markup a real timeline carries around each tweet
+
+    Each tweet comes with its author, entities and counters, and the page
+    mixes in a module of suggested accounts, as the live API does; the mock
+    payload keeps only the fields Argus reads.
+    """
+    author = {
+        'rest_id': '44196397',
+        'legacy': {
+            'screen_name': 'benchmark_user', 'name': 'Benchmark User',
+            'description': make_text(rng, 160), 'location': 'Earth',
+            'followers_count': 1234, 'friends_count': 567, 'statuses_count': 8910,
+            'profile_image_url_https': 'https://pbs.twimg.com/profile_images/0/benchmark_normal.jpg',
+            'profile_banner_url': 'https://pbs.twimg.com/profile_banners/0/1',
+            'created_at': 'Tue Jun 02 20:12:29 +0000 2009', 'verified': False
+        },
+        'is_blue_verified': True,
+        'professional': {'professional_type': 'Creator', 'category': [{'id': 958, 'name': 'Entrepreneur'}]}
+    }
+    entries = []
+    for index in range(items):
+        text = make_text(rng, 200)
+        tweet = {
+            '__typename': 'Tweet',
+            'rest_id': str(10 ** 12 + index),
+            'core': {'user_results': {'result': copy.deepcopy(author)}},
+            'views': {'count': str(rng.randrange(10 ** 6)), 'state': 'EnabledWithCount'},
+            'source': '<a href="https://mobile.twitter.com" rel="nofollow">Twitter Web App</a>',
+            'edit_control': {'edit_tweet_ids': [str(10 ** 12 + index)], 'editable_until_msecs': '1700000000000',
+                             'is_edit_eligible': True, 'edits_remaining': '5'},
+            'legacy': {
+                'full_text': text,
+                'created_at': 'Wed Oct 10 20:19:24 +0000 2018',
+                'conversation_id_str': str(10 ** 12 + index),
+                'display_text_range': [0, len(text)],
+                'entities': {
+                    'hashtags': [{'indices': [0, 8], 'text': 'launch'}],
+                    'urls': [{'display_url': 'example.com/post', 'expanded_url': 'https://example.com/post',
+                              'url': 'https://t.co/abcdefghij', 'indices': [100, 123]}],
+                    'user_mentions': [{'id_str': '783214', 'name': 'Twitter', 'screen_name': 'twitter',
+                                       'indices': [10, 18]}],
+                    'symbols': []
+                },
+                'favorite_count': rng.randrange(1000), 'retweet_count': rng.randrange(100),
+                'reply_count': rng.randrange(50), 'quote_count': rng.randrange(10), 'bookmark_count': 0,
+                'favorited': False, 'retweeted': False, 'lang': 'en', 'user_id_str': '44196397'
+            }
+        }
+        entries.append({
+            'entryId': f'tweet-{10 ** 12 + index}',
+            'sortIndex': str(10 ** 12 - index),
+            'content': {
+                'entryType': 'TimelineTimelineItem',
+                'itemContent': {'itemType': 'TimelineTweet', '__typename': 'TimelineTweet',
+                                'tweet_results': {'result': tweet}, 'tweetDisplayType': 'Tweet'}
+            }
+        })
+    entries.append({
+        'entryId': 'who-to-follow-1',
+        'content': {'entryType': 'TimelineTimelineModule', 'items': [
+            {'entryId': f'who-to-follow-1-user-{index}',
+             'item': {'itemContent': {'user_results': {'result': copy.deepcopy(author)}}}}
+            for index in range(3)
+        ]}
+    })
+    entries.append({'entryId': 'cursor-bottom-0',
+                    'content': {'entryType': 'TimelineTimelineCursor', 'cursorType': 'Bottom', 'value': 'next'}})
+
+    response = {'result': {'timeline': {'instructions': [
+        {'type': 'TimelineClearCache'},
+        {'type': 'TimelineAddEntries', 'entries': entries}
+    ]}}}
+    return json.dumps(response).encode('utf-8')
+
+
+def make_platform_analyses(rng: random.Random) -> List[Dict[str, Any]]:
+    """One analysis result per supported platform"""
+    return [
+        analyzer.analyze_platform_data(platform, make_platform_data(platform, rng, items=50))
+        for platform in PLATFORMS
+    ]
+
+
+def make_scan_history(rng: random.Random, count: int = 120) -> List[Dict[str, Any]]:
+    """Completed scans spread over the last few months, as the risk trend chart expects"""
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            'platform': rng.choice(PLATFORMS),
+            'risk_score': round(rng.uniform(0, 100), 1),
+            'completed_at': (start + timedelta(hours=index * 18)).isoformat()
+        }
+        for index in range(count)
+    ]
@@ -0,0 +1,117 @@
+"""
+Import Budget Check for Argus Digital Sentinel
+Fails when booting the app's modules pulls in the plotting/data stack or costs
+much more than importing Flask and its extensions alone
+
+Each run imports the Flask floor in a fresh interpreter and then times the app
+modules on top of it, so the overhead is measured directly rather than as the
+difference of two separately timed batches. The fastest run is kept: slower
+ones only add scheduling noise.
+
+Usage (from the repository root):
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --budget-ms 100 --runs 11
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+from typing import Any, Dict, List
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# What a worker imports on boot (everything main.py registers)
+APP_MODULES = (
+    'src.routes.user',
+    'src.routes.scan',
+    'src.routes.reports',
+    'src.routes.analysis',
+    'src.routes.export',
+    'src.routes.metrics'
+)
+
+# The floor: Flask and the extensions main.py cannot start without
+FLOOR_MODULES = ('flask', 'flask_sqlalchemy', 'flask_cors')
+
+# Must only load when a chart, CSV export or PDF is actually produced
+LAZY_MODULES = ('matplotlib', 'seaborn', 'pandas', 'numpy', 'fpdf')
+
+# Allowed import time on top of the Flask floor
+DEFAULT_BUDGET_MS = float(os.environ.get('ARGUS_IMPORT_BUDGET_MS', 150))
+
+PROBE = """
+import json, sys, time
+
+def timed(modules):
+    started = time.perf_counter()
+    for name in modules:
+        __import__(name)
+    return (time.perf_counter() - started) * 1000
+
+floor_ms = timed({floor!r})
+app_ms = timed({modules!r})
+print(json.dumps({{
+    'floor_ms': floor_ms,
+    'app_ms': app_ms,
+    'loaded': [name for name in {lazy!r} if name in sys.modules]
+}}))
+"""
+
+
+def probe(runs: int) -> Dict[str, Any]:
+    """Fastest Flask floor and app-on-top-of-it import times over fresh interpreters, and any lazy
+    modules the app loaded"""
+    code = PROBE.format(floor=FLOOR_MODULES, modules=APP_MODULES, lazy=LAZY_MODULES)
+    floor_ms = []
+    app_ms = []
+    loaded = set()
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, '-c', code], cwd=REPO_ROOT, capture_output=True,
+                                text=True, check=True).stdout
+        # Modules may print warnings on import; the result is the last line
+        result = json.loads(output.strip().splitlines()[-1])
+        floor_ms.append(result['floor_ms'])
+        app_ms.append(result['app_ms'])
+        loaded.update(result['loaded'])
+    return {'floor_ms': min(floor_ms), 'overhead_ms': min(app_ms), 'loaded': sorted(loaded)}
+
+
+def check(budget_ms: float, runs: int) -> List[str]:
+    result = probe(runs)
+    overhead = result['overhead_ms']
+
+    print(f"{'flask floor':<20} {result['floor_ms']:>8.1f} ms")
+    print(f"{'app modules':<20} {overhead:>+8.1f} ms  (budget {budget_ms:.0f} ms)")
+
+    failures = []
+    if result['loaded']:
+        failures.append(f"imported eagerly at boot: {', '.join(result['loaded'])}")
+    if overhead > budget_ms:
+        failures.append(f"app import costs {overhead:.1f} ms over the Flask floor (budget {budget_ms:.0f} ms)")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Check the Argus Digital Sentinel import-time budget')
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help='allowed import time over the Flask floor (default %(default)s)')
+    parser.add_argument('--runs', type=int, default=7, help='fresh interpreters to run; the fastest is kept')
+    args = parser.parse_args(argv)
+
+    failures = check(args.budget_ms, args.runs)
+    if failures:
+        print('\n' + '!' * 72)
+        print('IMPORT BUDGET EXCEEDED')
+        for failure in failures:
+            print(f"  {failure}")
+        print('!' * 72)
+        return 1
+
+    print('\nImport budget met')
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,193 @@
+"""
+Benchmark Runner for Argus Digital Sentinel
+Runs the benchmark suites and fails when results regress against the stored baseline
+
+Usage (from the repository root):
+    python -m benchmarks.run                      # run and compare to benchmarks/baseline.json
+    python -m benchmarks.run --suite analyzer     # run one suite
+    python -m benchmarks.run --update-baseline    # record the current results as the baseline
+
+A case that looks regressed is measured again (--rechecks times) before the
+run fails, so one noisy measurement on a busy machine does not fail the gate.
+A baseline is recorded over several full passes (--baseline-passes), keeping
+each metric's median, so it reflects the machine's typical speed rather than
+its fastest moment.
+"""
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+from datetime import datetime
+from typing import Any, Dict, List
+
+from .cases import SUITES
+from .timing import Case, measure
+
+BASELINE_PATH = os.path.join(os.path.dirname(__file__), 'baseline.json')
+
+# Allowed slowdown (fraction) before a metric counts as a regression
+DEFAULT_TOLERANCE = float(os.environ.get('ARGUS_BENCH_TOLERANCE', 0.4))
+DEFAULT_MEMORY_TOLERANCE = float(os.environ.get('ARGUS_BENCH_MEMORY_TOLERANCE', 0.25))
+
+# Tail latency is noisier than the median, so p99 gets this multiple of the tolerance
+P99_TOLERANCE_FACTOR = 2.0
+
+# Absolute slack: a timing within this many milliseconds of the baseline never counts as a regression,
+# since on millisecond-scale cases scheduler noise alone exceeds any relative tolerance
+MIN_SLACK_MS = float(os.environ.get('ARGUS_BENCH_MIN_SLACK_MS', 1.0))
+
+# Times a regressed case is measured again before the run fails
+DEFAULT_RECHECKS = int(os.environ.get('ARGUS_BENCH_RECHECKS', 2))
+
+# Full passes a baseline is recorded over
+DEFAULT_BASELINE_PASSES = int(os.environ.get('ARGUS_BENCH_BASELINE_PASSES', 3))
+
+
+def collect_cases(names: List[str], pattern: str = None) -> Dict[str, Case]:
+    cases = {}
+    for name in names:
+        for case in SUITES[name]():
+            if not pattern or pattern in case.name:
+                cases[case.name] = case
+    return cases
+
+
+def run_cases(cases: List[Case], scale: float, rounds: int) -> Dict[str, Dict[str, Any]]:
+    results = {}
+    for case in cases:
+        result = measure(case, scale, rounds)
+        results[case.name] = result
+        print(f"{case.name:<42} p50 {result['p50_ms']:>10.3f} ms  p99 {result['p99_ms']:>10.3f} ms  "
+              f"{result['throughput_per_s']:>12.1f}/s  peak {result['peak_memory_kb']:>10.1f} KiB")
+    return results
+
+
+def combine_passes(passes: List[Dict[str, Dict[str, Any]]]) -> Dict[str, Dict[str, Any]]:
+    """Per-case median of every metric over several passes, and the largest peak memory"""
+    combined = {}
+    for name, first in passes[0].items():
+        runs = [results[name] for results in passes]
+        combined[name] = {metric: statistics.median(run[metric] for run in runs) for metric in first}
+        combined[name]['peak_memory_kb'] = max(run['peak_memory_kb'] for run in runs)
+    return combined
+
+
+def compare(results: Dict[str, Dict[str, Any]], baseline: Dict[str, Dict[str, Any]],
+            tolerance: float, memory_tolerance: float) -> Dict[str, List[str]]:
+    """Describe every metric that got worse than the baseline allows, by case"""
+    regressions = {}
+    for name, result in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+
+        problems = []
+        for metric, allowed in (('p50_ms', tolerance), ('p99_ms', tolerance * P99_TOLERANCE_FACTOR)):
+            limit = max(expected[metric] * (1 + allowed), expected[metric] + MIN_SLACK_MS)
+            if result[metric] > limit:
+                problems.append(f"{name}: {metric} {result[metric]:.3f} > {expected[metric]:.3f} "
+                                f"(+{(result[metric] / expected[metric] - 1) * 100:.0f}%)")
+
+        limit = expected['peak_memory_kb'] * (1 + memory_tolerance)
+        if result['peak_memory_kb'] > limit:
+            problems.append(f"{name}: peak_memory_kb {result['peak_memory_kb']:.1f} > "
+                            f"{expected['peak_memory_kb']:.1f}")
+
+        if problems:
+            regressions[name] = problems
+
+    return regressions
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description='Run the Argus Digital Sentinel benchmarks')
+    parser.add_argument('--suite', action='append', choices=sorted(SUITES),
+                        help='suite to run (repeatable, default: all)')
+    parser.add_argument('-k', dest='pattern', help='only run cases whose name contains this string')
+    parser.add_argument('--scale', type=float, default=1.0, help='multiply every case\'s iteration count')
+    parser.add_argument('--rounds', type=int, default=3, help='timing rounds per case; the fastest is kept')
+    parser.add_argument('--baseline', default=BASELINE_PATH, help='baseline JSON file')
+    parser.add_argument('--update-baseline', action='store_true', help='write results to the baseline file')
+    parser.add_argument('--output', help='also write results to this JSON file')
+    parser.add_argument('--tolerance', type=float, default=DEFAULT_TOLERANCE,
+                        help='allowed latency regression as a fraction (default %(default)s)')
+    parser.add_argument('--memory-tolerance', type=float, default=DEFAULT_MEMORY_TOLERANCE,
+                        help='allowed peak memory regression as a fraction (default %(default)s)')
+    parser.add_argument('--rechecks', type=int, default=DEFAULT_RECHECKS,
+                        help='times a regressed case is measured again before failing (default %(default)s)')
+    parser.add_argument('--baseline-passes', type=int, default=DEFAULT_BASELINE_PASSES,
+                        help='full passes a baseline is recorded over (default %(default)s)')
+    args = parser.parse_args(argv)
+
+    cases = collect_cases(args.suite or list(SUITES), args.pattern)
+    results = run_cases(list(cases.values()), args.scale, args.rounds)
+    if args.update_baseline and args.baseline_passes > 1:
+        passes = [results]
+        for index in range(1, args.baseline_passes):
+            print(f"\nBaseline pass {index + 1} of {args.baseline_passes}")
+            passes.append(run_cases(list(cases.values()), args.scale, args.rounds))
+        results = combine_passes(passes)
+    report = {
+        'recorded_at': datetime.utcnow().isoformat(),
+        'python': platform.python_version(),
+        'machine': platform.machine(),
+        'results': results
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2, sort_keys=True)
+
+    if args.update_baseline:
+        baseline = load_baseline(args.baseline)
+        baseline.update({key: value for key, value in report.items() if key != 'results'})
+        baseline['results'] = {**baseline.get('results', {}), **results}
+        with open(args.baseline, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline updated: {args.baseline}")
+        return 0
+
+    baseline = load_baseline(args.baseline).get('results', {})
+    if not baseline:
+        print(f"\nNo baseline at {args.baseline}; run with --update-baseline to record one")
+        return 0
+
+    missing = sorted(set(results) - set(baseline))
+    if missing:
+        print(f"\nNot in baseline (skipped): {', '.join(missing)}")
+
+    regressions = compare(results, baseline, args.tolerance, args.memory_tolerance)
+    for _ in range(args.rechecks):
+        if not regressions:
+            break
+        # A case only counts as regressed if every measurement of it is
+        print(f"\nMeasuring {len(regressions)} flagged case(s) again")
+        rerun = run_cases([cases[name] for name in regressions], args.scale, args.rounds)
+        regressions = compare(rerun, baseline, args.tolerance, args.memory_tolerance)
+
+    if regressions:
+        problems = [problem for case_problems in regressions.values() for problem in case_problems]
+        print('\n' + '!' * 72)
+        print(f"PERFORMANCE REGRESSION: {len(problems)} metric(s) beyond tolerance")
+        for problem in problems:
+            print(f"  {problem}")
+        print('!' * 72)
+        return 1
+
+    print(f"\nNo regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,196 @@
+"""
+Stub Platform API for Argus Digital Sentinel
+Local HTTP server that answers the platform client's endpoints with generated payloads
+
+Usage (from the repository root):
+    python -m benchmarks.stub_api --port 8765 --items 200 --latency-ms 20
+    ARGUS_API_BASE_URL=http://127.0.0.1:8765 python main.py
+"""
+
+import argparse
+import gzip
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from .corpus import make_platform_data, make_rng
+
+# Paginated endpoint -> query parameter carrying the cursor
+CURSOR_PARAMS = {
+    'Twitter/get_user_tweets': 'cursor',
+    'Youtube/get_channel_videos': 'cursor',
+    'Reddit/AccessAPI': 'after'
+}
+
+# Endpoint -> (platform, section of the generated payload it returns)
+ENDPOINTS = {
+    'Twitter/get_user_profile_by_username': ('twitter', 'profile'),
+    'Twitter/get_user_tweets': ('twitter', 'tweets'),
+    'LinkedIn/get_user_profile_by_username': ('linkedin', 'profile'),
+    'Youtube/get_channel_details': ('youtube', 'channel'),
+    'Youtube/get_channel_videos': ('youtube', 'videos'),
+    'Tiktok/get_user_info': ('tiktok', 'user'),
+    'Reddit/AccessAPI': ('reddit', 'posts')
+}
+
+
+class StubApiServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address: Tuple[str, int], items: int = 20, latency: float = 0.0, quota: int = 0,
+                 pages: int = 1):
+        super().__init__(address, StubApiHandler)
+        self.latency = latency
+        self.quota = quota
+        self.pages = pages
+        self.connections = 0
+        self.requests = 0
+        self.throttled = 0
+        self._window = (0, 0)
+        self._lock = threading.Lock()
+
+        # Generated once: every handle gets the same payload
+        rng = make_rng()
+        self.payloads = {
+            platform: make_platform_data(platform, rng, items=items)
+            for platform in {platform for platform, _ in ENDPOINTS.values()}
+        }
+
+    def response_for(self, endpoint: str) -> Optional[Any]:
+        if endpoint not in ENDPOINTS:
+            return None
+        platform, section = ENDPOINTS[endpoint]
+        return self.payloads[platform][section]
+
+    def with_cursor(self, endpoint: str, payload: Any, cursor: Optional[str]) -> Any:
+        """The same page of items again, pointing at the next page until ``pages`` have been served"""
+        page = int(cursor) if cursor and cursor.isdigit() else 0
+        next_cursor = str(page + 1) if page + 1 < self.pages else None
+        if next_cursor is None:
+            return payload
+
+        if endpoint == 'Twitter/get_user_tweets':
+            instructions = payload['result']['timeline']['instructions']
+            cursor_entry = {'entryId': f'cursor-bottom-{next_cursor}',
+                            'content': {'entryType': 'TimelineTimelineCursor', 'cursorType': 'Bottom',
+                                        'value': next_cursor}}
+            instructions = [{**instructions[0], 'entries': instructions[0]['entries'] + [cursor_entry]}]
+            return {'result': {'timeline': {'instructions': instructions}}}
+        if endpoint == 'Youtube/get_channel_videos':
+            return {**payload, 'cursorNext': next_cursor}
+        return {**payload, 'after': next_cursor}
+
+    def over_quota(self) -> bool:
+        """Whether this request exceeds ``quota`` requests per second (0 means unlimited)"""
+        if not self.quota:
+            return False
+        second = int(time.time())
+        with self._lock:
+            window, used = self._window
+            used = used + 1 if window == second else 1
+            self._window = (second, used)
+            if used > self.quota:
+                self.throttled += 1
+                return True
+        return False
+
+    def count(self, connections: int = 0, requests: int = 0):
+        with self._lock:
+            self.connections += connections
+            self.requests += requests
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f'http://{host}:{port}'
+
+
+class StubApiHandler(BaseHTTPRequestHandler):
+    # Keep-alive, so clients can reuse connections
+    protocol_version = 'HTTP/1.1'
+    # Headers and body go out as separate writes; without this, delayed ACKs stall every reused connection
+    disable_nagle_algorithm = True
+
+    def setup(self):
+        super().setup()
+        self.server.count(connections=1)
+
+    def do_GET(self):
+        self.server.count(requests=1)
+        url = urlsplit(self.path)
+        endpoint = url.path.lstrip('/')
+        payload = self.server.response_for(endpoint)
+
+        if self.server.latency:
+            time.sleep(self.server.latency)
+
+        if payload is None:
+            self._send(404, {'error': f'Unknown endpoint: {endpoint}'})
+            return
+        if self.server.over_quota():
+            self._send(429, {'error': 'Rate limit exceeded'}, {'Retry-After': '1'})
+            return
+
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        # Echo the requested handle where the real APIs would
+        if endpoint == 'Youtube/get_channel_details':
+            payload = {**payload, 'channelId': f"UC{query.get('id', '')}"}
+        if endpoint in CURSOR_PARAMS and self.server.pages > 1:
+            payload = self.server.with_cursor(endpoint, payload, query.get(CURSOR_PARAMS[endpoint]))
+        self._send(200, payload)
+
+    def _send(self, status: int, payload: Dict[str, Any], headers: Optional[Dict[str, str]] = None):
+        body = json.dumps(payload).encode('utf-8')
+        gzipped = 'gzip' in self.headers.get('Accept-Encoding', '')
+        if gzipped:
+            body = gzip.compress(body, compresslevel=5)
+
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        if gzipped:
+            self.send_header('Content-Encoding', 'gzip')
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def start_stub_server(port: int = 0, items: int = 20, latency: float = 0.0, quota: int = 0,
+                      pages: int = 1) -> StubApiServer:
+    """Serve on a background thread; port 0 picks a free port (see ``server.url``)"""
+    server = StubApiServer(('127.0.0.1', port), items=items, latency=latency, quota=quota, pages=pages)
+    threading.Thread(target=server.serve_forever, name='argus-stub-api', daemon=True).start()
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve stub platform API responses')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--items', type=int, default=20, help='tweets, videos or posts per response')
+    parser.add_argument('--latency-ms', type=float, default=0.0, help='delay added to every response')
+    parser.add_argument('--quota', type=int, default=0,
+                        help='requests per second before answering 429 with Retry-After (0: unlimited)')
+    parser.add_argument('--pages', type=int, default=1,
+                        help='pages served by paginated endpoints before the cursor runs out')
+    args = parser.parse_args(argv)
+
+    server = StubApiServer(('127.0.0.1', args.port), items=args.items, latency=args.latency_ms / 1000,
+                           quota=args.quota, pages=args.pages)
+    print(f"Stub platform API on {server.url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
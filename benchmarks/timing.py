@@ -0,0 +1,98 @@
+"""
+Benchmark Timing for Argus Digital Sentinel
+Measures throughput, latency percentiles and peak memory for a benchmark case
+"""
+
+import contextlib
+import gc
+import io
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional
+
+
+class Case:
+    """A named callable to benchmark
+
+    ``setup`` runs before every timed call and is excluded from the timing; it
+    is used to reset caches so each call measures cold work. ``items`` is how
+    many units (texts, platforms, requests) one call processes, and is what
+    throughput is reported in.
+    """
+
+    def __init__(self, name: str, func: Callable[[], Any], iterations: int = 50,
+                 setup: Optional[Callable[[], Any]] = None, items: int = 1, warmup: int = 2):
+        self.name = name
+        self.func = func
+        self.iterations = iterations
+        self.setup = setup
+        self.items = items
+        self.warmup = warmup
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an unsorted sample list"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, int(round(fraction * len(ordered) + 0.5)) - 1))
+    return ordered[index]
+
+
+def time_round(case: Case, iterations: int) -> List[float]:
+    samples = []
+    gc.collect()
+    gc_was_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        for _ in range(iterations):
+            if case.setup:
+                case.setup()
+            started = time.perf_counter()
+            case.func()
+            samples.append(time.perf_counter() - started)
+    finally:
+        if gc_was_enabled:
+            gc.enable()
+    return samples
+
+
+def measure(case: Case, scale: float = 1.0, rounds: int = 3) -> Dict[str, Any]:
+    """Run a case and return its latency, throughput and peak memory figures
+
+    The case is timed in several rounds and the round with the lowest median is
+    reported, which filters out slowdowns caused by other load on the machine.
+    """
+    iterations = max(1, int(case.iterations * scale))
+
+    # The code under test prints progress; keep benchmark output readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        for _ in range(case.warmup):
+            if case.setup:
+                case.setup()
+            case.func()
+
+        samples = min((time_round(case, iterations) for _ in range(max(1, rounds))),
+                      key=lambda round_samples: percentile(round_samples, 0.50))
+
+        # Memory is traced on a separate call since tracemalloc skews timings
+        if case.setup:
+            case.setup()
+        gc.collect()
+        tracemalloc.start()
+        try:
+            case.func()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+    total = sum(samples)
+    return {
+        'iterations': iterations,
+        'items_per_call': case.items,
+        'mean_ms': round(total / iterations * 1000, 4),
+        'p50_ms': round(percentile(samples, 0.50) * 1000, 4),
+        'p99_ms': round(percentile(samples, 0.99) * 1000, 4),
+        'throughput_per_s': round(case.items * iterations / total, 2) if total else 0.0,
+        'peak_memory_kb': round(peak / 1024, 1)
+    }
@@ -9,56 +9,113 @@ from src.models.user import db, User
 from src.models.scan import DigitalFootprintScan, PlatformConfig, RiskAlert
 from src.routes.user import user_bp
 
-app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
-app.config['SECRET_KEY'] = 'argus-digital-sentinel-secret-key-2025'
-
-# Enable CORS for all routes
-CORS(app, origins="*")
-
-# Register blueprints
-app.register_blueprint(user_bp, url_prefix='/api')
-
-# Import and register scan blueprint
-from src.routes.scan import scan_bp
-app.register_blueprint(scan_bp, url_prefix='/api')
-
-# Import and register reports blueprint
-from src.routes.reports import reports_bp
-app.register_blueprint(reports_bp, url_prefix='/api')
-
-# Database configuration
-app.config['SQLALCHEMY_DATABASE_URI'] = f"sqlite:///{os.path.join(os.path.dirname(__file__), 'database', 'app.db')}"
-app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
-db.init_app(app)
-
-# Create all database tables
-with app.app_context():
-    db.create_all()
-
-@app.route('/', defaults={'path': ''})
-@app.route('/<path:path>')
-def serve(path):
-    static_folder_path = app.static_folder
-    if static_folder_path is None:
-            return "Static folder not configured", 404
-
-    if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
-        return send_from_directory(static_folder_path, path)
-    else:
-        index_path = os.path.join(static_folder_path, 'index.html')
-        if os.path.exists(index_path):
-            return send_from_directory(static_folder_path, 'index.html')
+def create_app():
+    """Build and start the Argus app
+
+    Kept out of module scope so processes that import this module, such as
+    chart rendering workers started with spawn or forkserver, do not set up a
+    second app with its own workers and scheduler. WSGI servers load it as
+    ``main:create_app()``.
+    """
+    app = Flask(__name__, static_folder=os.path.join(os.path.dirname(__file__), 'static'))
+    app.config['SECRET_KEY'] = 'argus-digital-sentinel-secret-key-2025'
+
+    # Enable CORS for all routes
+    CORS(app, origins="*")
+
+    # Register blueprints
+    app.register_blueprint(user_bp, url_prefix='/api')
+
+    # Import and register scan blueprint
+    from src.routes.scan import scan_bp
+    app.register_blueprint(scan_bp, url_prefix='/api')
+
+    # Import and register reports blueprint
+    from src.routes.reports import reports_bp
+    app.register_blueprint(reports_bp, url_prefix='/api')
+
+    # Import and register analysis blueprint
+    from src.routes.analysis import analysis_bp
+    app.register_blueprint(analysis_bp, url_prefix='/api')
+
+    # Import and register export blueprint
+    from src.routes.export import export_bp
+    app.register_blueprint(export_bp, url_prefix='/api')
+
+    # Import and register metrics blueprint
+    from src.routes.metrics import metrics_bp, health_details
+    app.register_blueprint(metrics_bp, url_prefix='/api')
+
+    # Database configuration
+    from src.services.database import configure_database, install_sqlite_pragmas
+    configure_database(app, os.path.join(os.path.dirname(__file__), 'database', 'app.db'))
+    app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
+    app.config['SCAN_WORKERS'] = int(os.environ.get('ARGUS_SCAN_WORKERS', 4))
+    app.config['SCAN_MAX_BACKLOG_QUEUED'] = int(os.environ.get('ARGUS_SCAN_MAX_BACKLOG_QUEUED', 0))
+    app.config['SCHEDULER_ENABLED'] = os.environ.get('ARGUS_SCHEDULER_ENABLED', '1') == '1'
+    app.config['SCHEDULER_MAX_CONCURRENT'] = int(os.environ.get('ARGUS_SCHEDULER_MAX_CONCURRENT', 4))
+    app.config['SCHEDULER_JITTER_SECONDS'] = float(os.environ.get('ARGUS_SCHEDULER_JITTER_SECONDS', 300))
+    app.config['SCHEDULER_RESYNC_SECONDS'] = float(os.environ.get('ARGUS_SCHEDULER_RESYNC_SECONDS', 300))
+    app.config['BLOB_CODEC'] = os.environ.get('ARGUS_BLOB_CODEC', 'auto')
+    app.config['BLOB_RETENTION_DAYS'] = int(os.environ.get('ARGUS_RAW_DATA_RETENTION_DAYS', 90))
+    app.config['BLOB_MAINTENANCE_HOURS'] = float(os.environ.get('ARGUS_BLOB_MAINTENANCE_HOURS', 24))
+    app.config['BLOB_VACUUM'] = os.environ.get('ARGUS_BLOB_VACUUM', '0') == '1'
+    app.config['BLOB_GC_GRACE_MINUTES'] = float(os.environ.get('ARGUS_BLOB_GC_GRACE_MINUTES', 60))
+    db.init_app(app)
+    install_sqlite_pragmas(app, db)
+
+    # Time every database commit
+    from src.services.metrics import metrics
+    metrics.instrument_db(db)
+
+    # Create all database tables, then bring older databases up to the current schema
+    from src.services.migrations import migrator
+    with app.app_context():
+        db.create_all()
+    migrator.init_app(app)
+
+    # Start background scan workers and pick up scans left unfinished by a previous run
+    from src.services.scan_queue import scan_queue
+    from src.routes.scan import execute_scan, queue_scheduled_scan, is_scan_running
+    scan_queue.init_app(app, execute_scan)
+
+    # Expire old scan payloads and compact the blob store periodically
+    from src.services.blob_store import blob_store
+    blob_store.init_app(app)
+
+    # Rescan enabled platform configs as their scan_frequency comes due
+    if app.config['SCHEDULER_ENABLED']:
+        from src.services.scheduler import scan_scheduler
+        scan_scheduler.init_app(app, queue_scheduled_scan, is_scan_running)
+
+    @app.route('/', defaults={'path': ''})
+    @app.route('/<path:path>')
+    def serve(path):
+        static_folder_path = app.static_folder
+        if static_folder_path is None:
+                return "Static folder not configured", 404
+
+        if path != "" and os.path.exists(os.path.join(static_folder_path, path)):
+            return send_from_directory(static_folder_path, path)
         else:
-            return "index.html not found", 404
+            index_path = os.path.join(static_folder_path, 'index.html')
+            if os.path.exists(index_path):
+                return send_from_directory(static_folder_path, 'index.html')
+            else:
+                return "index.html not found", 404
+
+    @app.route('/api/health')
+    def health_check():
+        """Health check endpoint for Argus Digital Sentinel"""
+        return {
+            'status': 'healthy',
+            'service': 'Argus Digital Sentinel',
+            'description': 'Have you been pwnd? Preventing self-sabotage and career suicide from the get-go with MANUS AI',
+            **health_details()
+        }
 
-@app.route('/api/health')
-def health_check():
-    """Health check endpoint for Argus Digital Sentinel"""
-    return {
-        'status': 'healthy',
-        'service': 'Argus Digital Sentinel',
-        'description': 'Have you been pwnd? Preventing self-sabotage and career suicide from the get-go with MANUS AI'
-    }
+    return app
 
 if __name__ == '__main__':
+    app = create_app()
     app.run(host='0.0.0.0', port=5000, debug=True)
@@ -1,21 +1,36 @@
-from flask_sqlalchemy import SQLAlchemy
 from datetime import datetime
 import json
 
-db = SQLAlchemy()
+from .user import db
 
 class DigitalFootprintScan(db.Model):
     __tablename__ = 'digital_footprint_scans'
+    __table_args__ = (
+        # Newest-first scan listing per user, keyset-paginated on (scan_date, id)
+        db.Index('ix_digital_footprint_scans_user_scan_date', 'user_id', 'scan_date', 'id'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     platform = db.Column(db.String(50), nullable=False)  # twitter, linkedin, youtube, etc.
     username = db.Column(db.String(100), nullable=False)
-    scan_date = db.Column(db.DateTime, default=datetime.utcnow)
-    status = db.Column(db.String(20), default='pending')  # pending, completed, failed
-    raw_data = db.Column(db.Text)  # JSON string of scraped data
+    scan_date = db.Column(db.DateTime, default=datetime.utcnow)  # when the scan was queued
+    status = db.Column(db.String(20), default='pending')  # pending, running, completed, failed
+    raw_data = db.Column(db.Text)  # JSON string of scraped data (legacy rows; new scans use raw_data_hash)
+    raw_data_hash = db.Column(db.String(64), index=True)  # SHA-256 key of the payload in raw_blobs
     analysis_results = db.Column(db.Text)  # JSON string of AI analysis
     risk_score = db.Column(db.Float, default=0.0)  # 0-100 risk score
+    depth = db.Column(db.String(10), default='recent')  # recent (latest page) or history (every page)
+    claimed_by = db.Column(db.String(100))  # host:pid of the worker running the scan
+    heartbeat_at = db.Column(db.DateTime)  # refreshed while that worker is alive
+    completed_date = db.Column(db.DateTime)  # when the scan finished; trend buckets are keyed on it
+    
+    SCAN_DEPTHS = ('recent', 'history')
+    
+    # Columns returned by list views unless a projection asks for more
+    SUMMARY_FIELDS = ('id', 'user_id', 'platform', 'username', 'scan_date', 'status', 'risk_score')
+    # Large JSON columns, only loaded when explicitly requested
+    BLOB_FIELDS = ('raw_data', 'analysis_results')
     
     def __repr__(self):
         return f'<DigitalFootprintScan {self.platform}:{self.username}>'
@@ -28,14 +43,50 @@ class DigitalFootprintScan(db.Model):
             'username': self.username,
             'scan_date': self.scan_date.isoformat() if self.scan_date else None,
             'status': self.status,
-            'raw_data': json.loads(self.raw_data) if self.raw_data else None,
+            'raw_data': self.get_raw_data(),
             'analysis_results': json.loads(self.analysis_results) if self.analysis_results else None,
-            'risk_score': self.risk_score
+            'risk_score': self.risk_score,
+            'depth': self.depth or 'recent'
         }
     
+    @staticmethod
+    def columns_for(field):
+        """Columns a projection must select to serialize ``field``"""
+        return ('raw_data', 'raw_data_hash') if field == 'raw_data' else (field,)
+    
+    @classmethod
+    def project(cls, row, fields):
+        """Serialize a row loaded with only the columns ``fields`` need"""
+        result = {}
+        for field in fields:
+            if field == 'raw_data':
+                value = cls.load_raw_data(row.raw_data, row.raw_data_hash)
+            else:
+                value = getattr(row, field)
+                if field == 'scan_date':
+                    value = value.isoformat() if value else None
+                elif field in cls.BLOB_FIELDS:
+                    value = json.loads(value) if value else None
+            result[field] = value
+        return result
+    
+    @staticmethod
+    def load_raw_data(raw_data, raw_data_hash):
+        """Decode a payload held in the blob store or, for legacy rows, inline"""
+        if raw_data_hash:
+            from ..services.blob_store import blob_store
+            return blob_store.get(raw_data_hash)
+        return json.loads(raw_data) if raw_data else None
+    
+    def get_raw_data(self):
+        """Get raw data from the blob store"""
+        return self.load_raw_data(self.raw_data, self.raw_data_hash)
+    
     def set_raw_data(self, data):
-        """Set raw data as JSON string"""
-        self.raw_data = json.dumps(data) if data else None
+        """Store raw data in the blob store and keep its hash"""
+        from ..services.blob_store import blob_store
+        self.raw_data = None
+        self.raw_data_hash = blob_store.put(data) if data else None
     
     def set_analysis_results(self, results):
         """Set analysis results as JSON string"""
@@ -43,6 +94,9 @@ class DigitalFootprintScan(db.Model):
 
 class PlatformConfig(db.Model):
     __tablename__ = 'platform_configs'
+    __table_args__ = (
+        db.Index('ix_platform_configs_user_platform', 'user_id', 'platform'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
@@ -51,8 +105,12 @@ class PlatformConfig(db.Model):
     enabled = db.Column(db.Boolean, default=True)
     scan_frequency = db.Column(db.Integer, default=24)  # hours between scans
     last_scan = db.Column(db.DateTime)
+    next_run = db.Column(db.DateTime)  # when the scheduler next rescans; claimed atomically by one scheduler
     created_date = db.Column(db.DateTime, default=datetime.utcnow)
     
+    # Relationships
+    scanned_items = db.relationship('ScannedItem', backref='platform_config', lazy=True, cascade='all, delete-orphan')
+    
     def __repr__(self):
         return f'<PlatformConfig {self.platform}:{self.username}>'
     
@@ -68,11 +126,135 @@ class PlatformConfig(db.Model):
             'created_date': self.created_date.isoformat() if self.created_date else None
         }
 
+class ScannedItem(db.Model):
+    __tablename__ = 'scanned_items'
+    __table_args__ = (
+        db.UniqueConstraint('platform_config_id', 'section', 'item_id'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    platform_config_id = db.Column(db.Integer, db.ForeignKey('platform_configs.id'), nullable=False)
+    section = db.Column(db.String(20), nullable=False)  # tweets, videos, posts
+    item_id = db.Column(db.String(100), nullable=False)  # tweet id, video id, post id or content hash
+    content_hash = db.Column(db.String(64), nullable=False)  # SHA-256 of the analyzed text
+    features = db.Column(db.Text, nullable=False)  # JSON string of extracted text features
+    first_seen = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<ScannedItem {self.section}:{self.item_id}>'
+    
+    def get_features(self):
+        """Get extracted text features from JSON string"""
+        return json.loads(self.features)
+    
+    def set_features(self, features):
+        """Set extracted text features as JSON string"""
+        self.features = json.dumps(features)
+
+class RawBlob(db.Model):
+    """Compressed scan payload, stored once per distinct content"""
+    __tablename__ = 'raw_blobs'
+    
+    sha256 = db.Column(db.String(64), primary_key=True)  # SHA-256 of the canonical JSON
+    codec = db.Column(db.String(10), nullable=False)  # zlib or zstd
+    size = db.Column(db.Integer, nullable=False)  # uncompressed bytes
+    data = db.Column(db.LargeBinary, nullable=False)
+    created_date = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<RawBlob {self.sha256[:12]} {self.codec}>'
+
+class RiskRollup(db.Model):
+    """Running risk totals for one user, platform and day or week, updated as scans complete"""
+    __tablename__ = 'risk_rollups'
+    __table_args__ = (
+        # One row per bucket; also serves the per-user trend range scan on (period, bucket_start)
+        db.UniqueConstraint('user_id', 'period', 'bucket_start', 'platform', name='uq_risk_rollups_bucket'),
+    )
+    
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    platform = db.Column(db.String(50), nullable=False)
+    period = db.Column(db.String(10), nullable=False)  # day, week
+    bucket_start = db.Column(db.Date, nullable=False)  # the day, or the Monday starting the week
+    scan_count = db.Column(db.Integer, nullable=False, default=0)
+    risk_total = db.Column(db.Float, nullable=False, default=0.0)
+    risk_min = db.Column(db.Float)
+    risk_max = db.Column(db.Float)
+    updated_date = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<RiskRollup {self.period}:{self.bucket_start} {self.platform}>'
+    
+    @property
+    def risk_average(self):
+        return self.risk_total / self.scan_count if self.scan_count else 0.0
+
+class PlatformRiskScore(db.Model):
+    """Latest completed scan's risk for one user and platform"""
+    __tablename__ = 'platform_risk_scores'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    platform = db.Column(db.String(50), primary_key=True)
+    scan_id = db.Column(db.Integer, db.ForeignKey('digital_footprint_scans.id'))
+    risk_score = db.Column(db.Float, nullable=False, default=0.0)
+    weight = db.Column(db.Float, nullable=False, default=1.0)
+    weighted_risk = db.Column(db.Float, nullable=False, default=0.0)
+    factors = db.Column(db.Text)  # JSON list of the scan's top factors
+    scanned_date = db.Column(db.DateTime)
+    
+    def __repr__(self):
+        return f'<PlatformRiskScore {self.user_id}:{self.platform}>'
+    
+    def to_dict(self):
+        return {
+            'scan_id': self.scan_id,
+            'risk_score': self.risk_score,
+            'weight': self.weight,
+            'weighted_risk': self.weighted_risk,
+            'factors': json.loads(self.factors) if self.factors else [],
+            'scanned_date': self.scanned_date.isoformat() if self.scanned_date else None
+        }
+
+class UserRiskSummary(db.Model):
+    """Weighted overall risk and open alert counts per user, kept current as scans finish"""
+    __tablename__ = 'user_risk_summaries'
+    
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    overall_risk = db.Column(db.Float, nullable=False, default=0.0)
+    total_weight = db.Column(db.Float, nullable=False, default=0.0)
+    platform_breakdown = db.Column(db.Text)  # JSON of platform -> PlatformRiskScore.to_dict()
+    top_factors = db.Column(db.Text)  # JSON list of {'factor', 'count'}
+    open_alerts = db.Column(db.Integer, nullable=False, default=0)
+    open_alerts_by_severity = db.Column(db.Text)  # JSON of severity -> count
+    updated_date = db.Column(db.DateTime, default=datetime.utcnow)
+    
+    def __repr__(self):
+        return f'<UserRiskSummary {self.user_id}:{self.overall_risk}>'
+    
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'overall_risk': self.overall_risk,
+            'total_weight': self.total_weight,
+            'platform_breakdown': json.loads(self.platform_breakdown) if self.platform_breakdown else {},
+            'top_factors': json.loads(self.top_factors) if self.top_factors else [],
+            'open_alerts': self.open_alerts,
+            'open_alerts_by_severity': json.loads(self.open_alerts_by_severity) if self.open_alerts_by_severity else {},
+            'updated_date': self.updated_date.isoformat() if self.updated_date else None
+        }
+
 class RiskAlert(db.Model):
     __tablename__ = 'risk_alerts'
+    __table_args__ = (
+        # Alert listing per user, newest first, optionally filtered on acknowledged
+        db.Index('ix_risk_alerts_user_created', 'user_id', 'created_date'),
+        db.Index('ix_risk_alerts_user_acknowledged_created', 'user_id', 'acknowledged', 'created_date'),
+    )
     
     id = db.Column(db.Integer, primary_key=True)
-    scan_id = db.Column(db.Integer, db.ForeignKey('digital_footprint_scans.id'), nullable=False)
+    scan_id = db.Column(db.Integer, db.ForeignKey('digital_footprint_scans.id'), nullable=False, index=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)  # copied from the scan so listing skips the join
     alert_type = db.Column(db.String(50), nullable=False)  # content_risk, privacy_risk, professional_risk
     severity = db.Column(db.String(20), nullable=False)  # low, medium, high, critical
     title = db.Column(db.String(200), nullable=False)
@@ -88,6 +270,7 @@ class RiskAlert(db.Model):
         return {
             'id': self.id,
             'scan_id': self.scan_id,
+            'user_id': self.user_id,
             'alert_type': self.alert_type,
             'severity': self.severity,
             'title': self.title,
@@ -0,0 +1,47 @@
+"""
+Analysis Routes for Argus Digital Sentinel
+Handles direct content analysis endpoints
+"""
+
+from flask import Blueprint, request, jsonify
+import traceback
+
+from ..services.ai_analyzer import analyzer
+
+analysis_bp = Blueprint('analysis', __name__)
+
+# Upper bound on texts accepted by one batch request
+MAX_BATCH_TEXTS = 10000
+
+@analysis_bp.route('/analyze/batch', methods=['POST'])
+def analyze_batch():
+    """Score many texts in one call and return a verdict per text"""
+    try:
+        data = request.get_json() or {}
+        texts = data.get('texts')
+        platform = data.get('platform', 'generic')
+        include_factors = data.get('include_factors', True)
+        
+        if not isinstance(texts, list) or not all(isinstance(text, str) for text in texts):
+            return jsonify({'error': 'texts must be a list of strings'}), 400
+        
+        if len(texts) > MAX_BATCH_TEXTS:
+            return jsonify({'error': f'At most {MAX_BATCH_TEXTS} texts per batch'}), 400
+        
+        results = analyzer.analyze_batch(texts, platform, include_factors=bool(include_factors))
+        
+        return jsonify({
+            'success': True,
+            'platform': platform,
+            'lexicon_version': analyzer.lexicon_version,
+            'count': len(results),
+            'results': results
+        })
+        
+    except Exception as e:
+        print(f"Error in batch analysis: {str(e)}")
+        print(traceback.format_exc())
+        return jsonify({
+            'error': f'Batch analysis failed: {str(e)}',
+            'success': False
+        }), 500
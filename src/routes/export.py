@@ -0,0 +1,194 @@
+"""
+Export Routes for Argus Digital Sentinel
+Streams the full scan and alert history as CSV, NDJSON or Parquet
+"""
+
+from flask import Blueprint, Response, request, jsonify, stream_with_context
+from datetime import datetime
+from itertools import islice
+import csv
+import io
+import json
+
+from sqlalchemy import select
+
+from ..models.user import db
+from ..models.scan import DigitalFootprintScan, RiskAlert
+
+export_bp = Blueprint('export', __name__)
+
+# Rows fetched from the database cursor and written out per batch
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_FORMATS = {
+    'csv': ('text/csv', 'csv'),
+    'ndjson': ('application/x-ndjson', 'ndjson'),
+    'parquet': ('application/vnd.apache.parquet', 'parquet')
+}
+
+# Exportable columns and their Parquet types; raw_data stays in the blob store
+SCAN_EXPORT_COLUMNS = {
+    'id': 'int64',
+    'user_id': 'int64',
+    'platform': 'string',
+    'username': 'string',
+    'scan_date': 'timestamp',
+    'status': 'string',
+    'risk_score': 'float64',
+    'analysis_results': 'json'
+}
+ALERT_EXPORT_COLUMNS = {
+    'id': 'int64',
+    'scan_id': 'int64',
+    'user_id': 'int64',
+    'alert_type': 'string',
+    'severity': 'string',
+    'title': 'string',
+    'description': 'string',
+    'recommendation': 'string',
+    'acknowledged': 'bool',
+    'created_date': 'timestamp'
+}
+
+@export_bp.route('/export/scans', methods=['GET'])
+def export_scans():
+    """Stream every scan (optionally one user's) ordered by id"""
+    default_fields = list(DigitalFootprintScan.SUMMARY_FIELDS)
+    return export_table(DigitalFootprintScan, SCAN_EXPORT_COLUMNS, default_fields, 'scans')
+
+@export_bp.route('/export/alerts', methods=['GET'])
+def export_alerts():
+    """Stream every risk alert (optionally one user's) ordered by id"""
+    return export_table(RiskAlert, ALERT_EXPORT_COLUMNS, list(ALERT_EXPORT_COLUMNS), 'alerts')
+
+def export_table(model, columns, default_fields, name):
+    fmt = request.args.get('format', 'csv').lower()
+    if fmt not in EXPORT_FORMATS:
+        return jsonify({'error': f"Unsupported format; choose from {', '.join(EXPORT_FORMATS)}"}), 400
+
+    fields_arg = request.args.get('fields')
+    fields = [field.strip() for field in fields_arg.split(',') if field.strip()] if fields_arg else default_fields
+    if not fields or any(field not in columns for field in fields):
+        return jsonify({'error': f"Unknown field; choose from {', '.join(columns)}"}), 400
+
+    if fmt == 'parquet':
+        try:
+            import pyarrow
+        except ImportError:
+            return jsonify({'error': 'Parquet export requires the pyarrow package'}), 501
+
+    statement = select(*[getattr(model, field) for field in fields]).order_by(model.id)
+    user_id = request.args.get('user_id', type=int)
+    if user_id is not None:
+        statement = statement.where(model.user_id == user_id)
+
+    rows = stream_rows(statement)
+    if fmt == 'csv':
+        body = csv_chunks(rows, fields, columns)
+    elif fmt == 'ndjson':
+        body = ndjson_chunks(rows, fields, columns)
+    else:
+        body = parquet_chunks(rows, fields, columns)
+
+    mimetype, extension = EXPORT_FORMATS[fmt]
+    filename = f"argus_{name}_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.{extension}"
+    return Response(stream_with_context(body), mimetype=mimetype,
+                    headers={'Content-Disposition': f'attachment; filename={filename}',
+                             'X-Accel-Buffering': 'no'})
+
+def stream_rows(statement):
+    """Yield result rows while holding only one batch in memory"""
+    result = db.session.execute(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+    for partition in result.partitions():
+        yield from partition
+
+def batches(rows):
+    while True:
+        batch = list(islice(rows, EXPORT_BATCH_SIZE))
+        if not batch:
+            return
+        yield batch
+
+def text_value(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+def csv_chunks(rows, fields, columns):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(fields)
+
+    for batch in batches(rows):
+        writer.writerows([text_value(value) for value in row] for row in batch)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+
+    # Header only, for an empty history
+    if buffer.tell():
+        yield buffer.getvalue()
+
+def ndjson_chunks(rows, fields, columns):
+    json_fields = {index for index, field in enumerate(fields) if columns[field] == 'json'}
+
+    for batch in batches(rows):
+        lines = []
+        for row in batch:
+            record = {}
+            for index, (field, value) in enumerate(zip(fields, row)):
+                if index in json_fields:
+                    value = json.loads(value) if value else None
+                record[field] = text_value(value)
+            lines.append(json.dumps(record) + '\n')
+        yield ''.join(lines)
+
+class _ChunkSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._chunks.append(bytes(data))
+        self._position += len(data)
+        return len(data)
+
+    def tell(self):
+        return self._position
+
+    def drain(self):
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+def parquet_chunks(rows, fields, columns):
+    """One Parquet row group per batch, flushed to the client as it is written"""
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    arrow_types = {
+        'int64': pa.int64(),
+        'float64': pa.float64(),
+        'bool': pa.bool_(),
+        'string': pa.string(),
+        'json': pa.string(),
+        'timestamp': pa.timestamp('us')
+    }
+    schema = pa.schema([(field, arrow_types[columns[field]]) for field in fields])
+
+    sink = _ChunkSink()
+    writer = pq.ParquetWriter(sink, schema, compression='snappy')
+    try:
+        for batch in batches(rows):
+            arrays = [pa.array(values, type=schema.field(index).type)
+                      for index, values in enumerate(zip(*batch))]
+            writer.write_table(pa.Table.from_arrays(arrays, schema=schema))
+            yield sink.drain()
+    finally:
+        writer.close()
+    yield sink.drain()
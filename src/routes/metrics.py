@@ -0,0 +1,78 @@
+"""
+Metrics Routes for Argus Digital Sentinel
+Exposes operational metrics for Prometheus scraping and health checks
+"""
+
+from flask import Blueprint, Response
+from typing import Any, Dict, Tuple
+
+from ..services.metrics import metrics
+from ..services.scan_queue import scan_queue
+from ..services.scheduler import scan_scheduler
+from ..services.response_cache import response_cache
+from ..services.ai_analyzer import analyzer
+from ..services.platform_client import platform_client
+from ..services.rate_limiter import CIRCUIT_STATE_VALUES
+
+metrics_bp = Blueprint('metrics', __name__)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+@metrics_bp.route('/metrics', methods=['GET'])
+def get_metrics():
+    """Prometheus text exposition of timers, counters and runtime gauges"""
+    return Response(metrics.render(runtime_gauges()), mimetype=PROMETHEUS_CONTENT_TYPE)
+
+def runtime_gauges() -> Dict[str, Tuple[str, float]]:
+    """Point-in-time queue and cache figures, read at scrape time"""
+    cache_stats = response_cache.stats()
+    item_stats = analyzer.item_cache_stats()
+    scheduler_stats = scan_scheduler.stats()
+    limiter_stats = platform_client.limiter.stats()
+    endpoints = limiter_stats['endpoints'].items()
+
+    return {
+        'argus_scan_queue_depth': ('Scans waiting for a worker', scan_queue.depth()),
+        'argus_scheduler_scheduled': ('Platform configs waiting in the rescan heap', scheduler_stats['scheduled']),
+        'argus_scheduler_in_flight': ('Scheduled scans not yet finished', scheduler_stats['in_flight']),
+        'argus_response_cache_hits': ('Platform API responses served from cache', cache_stats['hits']),
+        'argus_response_cache_misses': ('Platform API responses fetched upstream', cache_stats['misses']),
+        'argus_response_cache_hit_ratio': ('Response cache hit ratio', cache_stats['hit_rate']),
+        'argus_response_cache_entries': ('Responses held in the cache', cache_stats['entries']),
+        'argus_response_cache_bytes': ('Bytes held in the response cache', cache_stats['bytes']),
+        'argus_item_cache_hits': ('Per-item analyses served from cache', item_stats['hits']),
+        'argus_item_cache_misses': ('Per-item analyses computed', item_stats['misses']),
+        'argus_item_cache_hit_ratio': ('Per-item analysis cache hit ratio', item_stats['hit_rate']),
+        'argus_platform_circuit_state': (
+            'Platform circuit breaker state (0 closed, 1 half-open, 2 open)',
+            [({'platform': platform}, CIRCUIT_STATE_VALUES[circuit['state']])
+             for platform, circuit in limiter_stats['circuits'].items()]
+        ),
+        'argus_platform_api_rate': (
+            'Requests per second the rate limiter currently allows per endpoint',
+            [({'endpoint': endpoint}, bucket['rate']) for endpoint, bucket in endpoints]
+        ),
+        'argus_platform_api_tokens': (
+            'Requests each endpoint may make right now without waiting',
+            [({'endpoint': endpoint}, bucket['tokens']) for endpoint, bucket in endpoints]
+        )
+    }
+
+def health_details() -> Dict[str, Any]:
+    """Queue depth, cache hit rates and recent p99 latencies for /api/health"""
+    cache_stats = response_cache.stats()
+    item_stats = analyzer.item_cache_stats()
+
+    return {
+        'scan_queue_depth': scan_queue.depth(),
+        'cache_hit_rates': {
+            'platform_responses': cache_stats['hit_rate'],
+            'item_analysis': item_stats['hit_rate']
+        },
+        'platform_circuits': {
+            platform: circuit['state']
+            for platform, circuit in platform_client.limiter.stats()['circuits'].items()
+        },
+        'p99_ms': metrics.summary(0.99),
+        'metrics_enabled': metrics.enabled
+    }
@@ -4,17 +4,88 @@ Handles report generation and data export endpoints
 """
 
 from flask import Blueprint, request, jsonify, send_file
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime
 import json
 import os
+import time
 import traceback
 
 from ..services.report_generator import report_generator
+from ..services.chart_renderer import ChartRenderer
+from ..services.risk_rollup import risk_rollups
+from ..models.user import db
+from ..models.scan import DigitalFootprintScan
 from ..services.ai_analyzer import analyzer
 from ..services.data_collector import collector
+from ..services.rate_limiter import retry_after_header, throttled_cause, work_deadline
 
 reports_bp = Blueprint('reports', __name__)
 
+# Shared, bounded pool so concurrent report requests cannot spawn unbounded threads
+REPORT_WORKERS = int(os.environ.get('ARGUS_REPORT_WORKERS', 8))
+report_executor = ThreadPoolExecutor(max_workers=REPORT_WORKERS, thread_name_prefix='argus-report')
+
+# Seconds each platform may take to collect and analyze before it is left out of the report
+DEFAULT_PLATFORM_TIMEOUT = float(os.environ.get('ARGUS_PLATFORM_TIMEOUT', 20))
+PLATFORM_TIMEOUTS = {
+    'twitter': DEFAULT_PLATFORM_TIMEOUT,
+    'linkedin': DEFAULT_PLATFORM_TIMEOUT,
+    'youtube': DEFAULT_PLATFORM_TIMEOUT,
+    'tiktok': DEFAULT_PLATFORM_TIMEOUT,
+    'reddit': DEFAULT_PLATFORM_TIMEOUT
+}
+
+def collect_and_analyze(platform, username, deadline=None):
+    """Collect and analyze a single platform, abandoning its platform calls at ``deadline``
+    
+    A report stops waiting for a platform at its deadline, so the calls stop then too
+    and the worker is freed for the next report instead of waiting out rate limits
+    nobody needs the result of. A job that only starts after its deadline times out
+    without calling the platform.
+    """
+    if deadline is not None and time.monotonic() >= deadline:
+        raise FutureTimeoutError()
+    
+    with work_deadline(deadline):
+        return analyzer.analyze_shared(platform, username,
+                                       lambda: collector.collect_platform_data(platform, username))
+
+def collect_platform_analyses(platforms_data):
+    """Collect and analyze all platforms concurrently, keeping whatever finishes in time
+    
+    Returns the analyses in request order plus a list of platforms that failed or timed out.
+    """
+    pending = []
+    
+    for platform_info in platforms_data:
+        platform = platform_info.get('platform')
+        username = platform_info.get('username')
+        
+        if platform and username:
+            deadline = time.monotonic() + PLATFORM_TIMEOUTS.get(platform, DEFAULT_PLATFORM_TIMEOUT)
+            future = report_executor.submit(collect_and_analyze, platform, username, deadline)
+            pending.append((platform, username, deadline, future))
+    
+    platform_analyses = []
+    failed_platforms = []
+    
+    for platform, username, deadline, future in pending:
+        try:
+            platform_analyses.append(future.result(timeout=max(0.0, deadline - time.monotonic())))
+        except FutureTimeoutError:
+            future.cancel()
+            failed_platforms.append({'platform': platform, 'username': username, 'error': 'Timed out'})
+        except Exception as e:
+            print(f"Error collecting {platform} data for report: {str(e)}")
+            failed = {'platform': platform, 'username': username, 'error': str(e)}
+            throttled = throttled_cause(e)
+            if throttled is not None:
+                failed['retry_after'] = throttled.retry_after
+            failed_platforms.append(failed)
+    
+    return platform_analyses, failed_platforms
+
 @reports_bp.route('/api/reports/generate', methods=['POST'])
 def generate_report():
     """Generate a comprehensive digital footprint report"""
@@ -26,23 +97,40 @@ def generate_report():
         if not platforms_data:
             return jsonify({'error': 'Platforms data is required'}), 400
         
-        # Collect and analyze data for all platforms
-        platform_analyses = []
+        # Reject a bad trend request before collecting anything
+        risk_trend = []
+        if report_type == 'dashboard':
+            try:
+                risk_trend = stored_risk_trend(data)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
         
-        for platform_info in platforms_data:
-            platform = platform_info.get('platform')
-            username = platform_info.get('username')
-            
-            if platform and username:
-                # Collect data
-                platform_data = collector.collect_platform_data(platform, username)
-                
-                # Analyze data
-                analysis_result = analyzer.analyze_platform_data(platform, platform_data)
-                platform_analyses.append(analysis_result)
+        # Collect and analyze data for all platforms concurrently
+        platform_analyses, failed_platforms = collect_platform_analyses(platforms_data)
         
         if not platform_analyses:
-            return jsonify({'error': 'No valid platform data to analyze'}), 400
+            throttled = [failed['retry_after'] for failed in failed_platforms if 'retry_after' in failed]
+            if throttled and len(throttled) == len(failed_platforms):
+                # Every platform pushed back on quota: worth retrying once the first one lets calls through
+                retry_after = min(throttled)
+                response = jsonify({
+                    'error': 'Every platform is throttled',
+                    'retry_after': retry_after,
+                    'failed_platforms': failed_platforms
+                })
+                response.headers['Retry-After'] = retry_after_header(retry_after)
+                return response, 503
+            
+            return jsonify({
+                'error': 'No valid platform data to analyze',
+                'failed_platforms': failed_platforms
+            }), 400
+        
+        # Platforms that failed or timed out are reported rather than failing the whole report
+        partial_result = {
+            'partial': bool(failed_platforms),
+            'failed_platforms': failed_platforms
+        }
         
         # Generate report based on type
         if report_type == 'comprehensive':
@@ -52,7 +140,8 @@ def generate_report():
                 'success': True,
                 'report_path': report_path,
                 'report_type': 'markdown',
-                'download_url': f'/api/reports/download/{os.path.basename(report_path)}'
+                'download_url': f'/api/reports/download/{os.path.basename(report_path)}',
+                **partial_result
             })
         
         elif report_type == 'csv':
@@ -64,15 +153,17 @@ def generate_report():
                 'success': True,
                 'report_path': csv_path,
                 'report_type': 'csv',
-                'download_url': f'/api/reports/download/{os.path.basename(csv_path)}'
+                'download_url': f'/api/reports/download/{os.path.basename(csv_path)}',
+                **partial_result
             })
         
         elif report_type == 'dashboard':
-            dashboard_data = report_generator.generate_dashboard_data(platform_analyses)
+            dashboard_data = report_generator.generate_dashboard_data(platform_analyses, risk_trend)
             
             return jsonify({
                 'success': True,
-                'dashboard_data': dashboard_data
+                'dashboard_data': dashboard_data,
+                **partial_result
             })
         
         else:
@@ -100,6 +191,15 @@ def download_report(filename):
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
+def chart_options(data):
+    """Output format and resolution from a chart request: format=png|svg, dpi, preview"""
+    preview = str(data.get('preview', '')).lower() in ('1', 'true', 'yes')
+    try:
+        dpi = int(data['dpi']) if data.get('dpi') is not None else None
+    except (TypeError, ValueError):
+        raise ValueError('dpi must be an integer')
+    return ChartRenderer.resolve_options(data.get('format'), dpi, preview)
+
 @reports_bp.route('/api/reports/charts/risk-trend', methods=['POST'])
 def generate_risk_trend_chart():
     """Generate risk trend chart"""
@@ -107,15 +207,20 @@ def generate_risk_trend_chart():
         data = request.get_json()
         scan_history = data.get('scan_history', [])
         
-        chart_path = os.path.join(report_generator.reports_dir, 
-                                f'risk_trend_{datetime.now().strftime("%Y%m%d_%H%M%S")}.png')
+        try:
+            fmt, dpi = chart_options(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        generated_path = report_generator.generate_risk_trend_chart(scan_history, chart_path)
+        # Identical input is served from the chart cache without re-rendering
+        generated_path = report_generator.generate_risk_trend_chart(scan_history, fmt=fmt, dpi=dpi)
         
         if generated_path:
             return jsonify({
                 'success': True,
                 'chart_path': generated_path,
+                'format': fmt,
+                'dpi': dpi,
                 'download_url': f'/api/reports/download/{os.path.basename(generated_path)}'
             })
         else:
@@ -132,15 +237,20 @@ def generate_platform_distribution_chart():
         data = request.get_json()
         platform_analyses = data.get('platform_analyses', [])
         
-        chart_path = os.path.join(report_generator.reports_dir, 
-                                f'platform_distribution_{datetime.now().strftime("%Y%m%d_%H%M%S")}.png')
+        try:
+            fmt, dpi = chart_options(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        generated_path = report_generator.generate_platform_distribution_chart(platform_analyses, chart_path)
+        # Identical input is served from the chart cache without re-rendering
+        generated_path = report_generator.generate_platform_distribution_chart(platform_analyses, fmt=fmt, dpi=dpi)
         
         if generated_path:
             return jsonify({
                 'success': True,
                 'chart_path': generated_path,
+                'format': fmt,
+                'dpi': dpi,
                 'download_url': f'/api/reports/download/{os.path.basename(generated_path)}'
             })
         else:
@@ -150,18 +260,53 @@ def generate_platform_distribution_chart():
         print(f"Error generating platform distribution chart: {str(e)}")
         return jsonify({'error': str(e)}), 500
 
+def stored_risk_trend(data):
+    """The requesting user's stored risk trend, or an empty one without a user_id; raises ValueError"""
+    user_id = data.get('user_id')
+    if user_id is None:
+        return []
+    try:
+        user_id = int(user_id)
+        buckets = int(data.get('trend_buckets', 30))
+    except (TypeError, ValueError):
+        raise ValueError('user_id and trend_buckets must be integers')
+    trend = risk_rollups.trend(user_id, period=data.get('trend_period', 'day'), buckets=buckets)
+    return trend['buckets']
+
+def latest_platform_analyses(user_id):
+    """Analysis results of each platform's most recent completed scan"""
+    latest = db.session.query(db.func.max(DigitalFootprintScan.id))\
+                       .filter(DigitalFootprintScan.user_id == int(user_id),
+                               DigitalFootprintScan.status == 'completed')\
+                       .group_by(DigitalFootprintScan.platform)
+    rows = DigitalFootprintScan.query.with_entities(DigitalFootprintScan.platform, DigitalFootprintScan.analysis_results)\
+                                     .filter(DigitalFootprintScan.id.in_(latest)).all()
+    
+    analyses = []
+    for platform, analysis_results in rows:
+        analysis = json.loads(analysis_results) if analysis_results else {}
+        analysis.setdefault('platform', platform)
+        analyses.append(analysis)
+    return analyses
+
 @reports_bp.route('/api/reports/summary', methods=['POST'])
 def get_analysis_summary():
     """Get a quick analysis summary for dashboard"""
     try:
         data = request.get_json()
         platforms_data = data.get('platforms', [])
+        user_id = data.get('user_id')
         
-        if not platforms_data:
-            return jsonify({'error': 'Platforms data is required'}), 400
+        if not platforms_data and user_id is None:
+            return jsonify({'error': 'Platforms data or user_id is required'}), 400
+        
+        try:
+            risk_trend = stored_risk_trend(data)
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
         
-        # Quick analysis for dashboard
-        platform_analyses = []
+        # A user's dashboard reads their latest stored analyses instead of re-analyzing
+        platform_analyses = latest_platform_analyses(user_id) if not platforms_data else []
         
         for platform_info in platforms_data:
             platform = platform_info.get('platform')
@@ -189,7 +334,7 @@ def get_analysis_summary():
         overall_analysis = analyzer.calculate_overall_risk(platform_analyses)
         
         # Generate dashboard data
-        dashboard_data = report_generator.generate_dashboard_data(platform_analyses)
+        dashboard_data = report_generator.generate_dashboard_data(platform_analyses, risk_trend)
         
         return jsonify({
             'success': True,
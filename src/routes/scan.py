@@ -1,16 +1,41 @@
-from flask import Blueprint, request, jsonify
+from flask import Blueprint, Response, request, jsonify, stream_with_context
 from datetime import datetime
-import sys
+from sqlalchemy import and_, insert, or_, tuple_
+import base64
+import binascii
+import csv
+import json
 import os
-
-# Add the API client path for Manus APIs
-sys.path.append('/opt/.manus/.sandbox-runtime')
+import time
 
 from ..models.user import db, User
 from ..models.scan import DigitalFootprintScan, PlatformConfig, RiskAlert
+from ..services.scan_queue import scan_queue, TERMINAL_STATUSES
+from ..services.scheduler import scan_scheduler, from_epoch
+from ..services.single_flight import SingleFlight
+from ..services.item_ledger import ItemLedger
+from ..services.bulk_import import detect_format, normalize_record, read_records
+from ..services.risk_rollup import risk_rollups
+from ..services.risk_summary import risk_summaries
+from ..services.ai_analyzer import AIAnalyzer
+from ..services.data_collector import collector
+from ..services.platform_content import PAGED_SECTIONS
+from ..services.rate_limiter import retry_after_header, throttled_cause
 
 scan_bp = Blueprint('scan', __name__)
 
+# Largest page GET /scans will return
+MAX_SCAN_PAGE_SIZE = 200
+SCAN_FIELDS = DigitalFootprintScan.SUMMARY_FIELDS + DigitalFootprintScan.BLOB_FIELDS
+
+# Bulk scan requests: rows per bulk insert and commit, row cap, and completion poll interval
+BULK_CHUNK_SIZE = 1000
+MAX_BULK_ROWS = int(os.environ.get('ARGUS_BULK_MAX_ROWS', 100000))
+BULK_POLL_SECONDS = 2
+
+# Overlapping scans of one platform config would analyze and record the same items twice
+ledger_scans = SingleFlight('ledger_scan')
+
 @scan_bp.route('/platforms', methods=['GET'])
 def get_platforms():
     """Get all configured platforms for a user"""
@@ -37,6 +62,8 @@ def add_platform():
     db.session.add(platform_config)
     db.session.commit()
     
+    scan_scheduler.schedule(platform_config)
+    
     return jsonify({
         'success': True,
         'platform': platform_config.to_dict()
@@ -51,9 +78,14 @@ def update_platform(platform_id):
     platform.username = data.get('username', platform.username)
     platform.enabled = data.get('enabled', platform.enabled)
     platform.scan_frequency = data.get('scan_frequency', platform.scan_frequency)
+    if 'scan_frequency' in data or 'enabled' in data:
+        # Recomputed from last_scan under the new settings
+        platform.next_run = None
     
     db.session.commit()
     
+    scan_scheduler.schedule(platform)
+    
     return jsonify({
         'success': True,
         'platform': platform.to_dict()
@@ -64,74 +96,204 @@ def delete_platform(platform_id):
     """Delete platform configuration"""
     platform = PlatformConfig.query.get_or_404(platform_id)
     db.session.delete(platform)
+    db.session.flush()
+    
+    # The handle's score no longer counts towards the user's overall risk
+    risk_summaries.remove_platform(platform.user_id, platform.platform, platform.username)
     db.session.commit()
     
+    scan_scheduler.unschedule(platform_id)
+    
     return jsonify({'success': True})
 
 @scan_bp.route('/scan', methods=['POST'])
 def start_scan():
-    """Start a digital footprint scan for a platform"""
+    """Queue a digital footprint scan for a platform"""
     data = request.get_json()
     platform = data.get('platform')
     username = data.get('username')
     user_id = data.get('user_id', 1)
+    depth = data.get('depth', 'recent')
     
-    # Create scan record
+    if depth not in DigitalFootprintScan.SCAN_DEPTHS:
+        return jsonify({'error': f"Unknown depth; choose from {', '.join(DigitalFootprintScan.SCAN_DEPTHS)}"}), 400
+    
+    scan = queue_scan(user_id, platform, username, depth)
+    
+    return jsonify({
+        'success': True,
+        'scan': scan.to_dict(),
+        'status_url': f'/api/scans/{scan.id}/status',
+        'events_url': f'/api/scans/{scan.id}/events'
+    }), 202
+
+def queue_scan(user_id, platform, username, depth='recent'):
+    """Create a pending scan record and hand it to the background workers"""
     scan = DigitalFootprintScan(
         user_id=user_id,
         platform=platform,
         username=username,
-        status='pending'
+        status='pending',
+        depth=depth
     )
     
     db.session.add(scan)
     db.session.commit()
     
+    scan_queue.submit(scan.id)
+    return scan
+
+def queue_scheduled_scan(config):
+    """Scheduler dispatch hook: queue a rescan of a platform config"""
+    return queue_scan(config.user_id, config.platform, config.username).id
+
+def is_scan_running(scan_id):
+    """Whether a queued scan has yet to finish"""
+    progress = scan_queue.get_progress(scan_id)
+    return progress is not None and progress.get('status') not in TERMINAL_STATUSES
+
+def execute_scan(scan_id):
+    """Run a queued scan to completion on a background worker"""
+    # Claim the scan so it is never run twice
+    if not scan_queue.claim(scan_id):
+        return
+    
+    scan = DigitalFootprintScan.query.get(scan_id)
+    scan_queue.update(scan_id, status='running', stage='collecting', progress=10)
+    
     # Perform the actual scan based on platform
     try:
-        scan_result = perform_platform_scan(platform, username)
+        # AI analysis reuses results for items earlier scans already analyzed
+        config = PlatformConfig.query.filter_by(user_id=scan.user_id, platform=scan.platform,
+                                                username=scan.username).first()
+        if config is None:
+            scan_result, analysis_result = run_scan(scan)
+        else:
+            # Scans of the config running at once share one collection and ledger pass
+            scan_result, analysis_result = ledger_scans.do(
+                (config.id, scan.depth), lambda: run_scan(scan, ItemLedger(config.id)))
+        
+        # Only record the result while this worker still holds the claim; the update also locks
+        # the row until the commit, so the scan cannot be requeued in between
+        if not scan_queue.finish(scan_id, 'completed'):
+            db.session.rollback()
+            return
         
         # Update scan with results
         scan.set_raw_data(scan_result)
-        scan.status = 'completed'
-        
-        # Perform AI analysis
-        analysis_result = analyze_content(scan_result, platform)
         scan.set_analysis_results(analysis_result)
         scan.risk_score = analysis_result.get('risk_score', 0.0)
         
         # Create risk alerts if needed
         create_risk_alerts(scan, analysis_result)
         
+        scan.status = 'completed'
+        scan.completed_date = datetime.utcnow()
+        
+        # Fold the score into the user's daily and weekly trend and current risk summary
+        # in the same transaction
+        risk_rollups.record_scan(scan)
+        risk_summaries.record_scan(scan, analysis_result)
+        
+        # Record the scan against any matching platform config
+        PlatformConfig.query.filter_by(user_id=scan.user_id, platform=scan.platform, username=scan.username)\
+                            .update({'last_scan': datetime.utcnow()})
+        
         db.session.commit()
         
-        return jsonify({
-            'success': True,
-            'scan': scan.to_dict()
-        })
+        scan_queue.update(scan_id, status='completed', stage='completed', progress=100,
+                          risk_score=scan.risk_score)
         
     except Exception as e:
+        db.session.rollback()
+        if not scan_queue.finish(scan_id, 'failed'):
+            db.session.rollback()
+            return
         scan.status = 'failed'
         db.session.commit()
         
-        return jsonify({
-            'success': False,
-            'error': str(e),
-            'scan': scan.to_dict()
-        }), 500
+        scan_queue.update(scan_id, status='failed', stage='failed', error=str(e))
 
 @scan_bp.route('/scans', methods=['GET'])
 def get_scans():
-    """Get all scans for a user"""
+    """Get a page of scans for a user, newest first
+    
+    Pages are keyed on (scan_date, id): pass the returned ``next_cursor`` back as
+    ``cursor`` for the following page. ``fields`` selects columns; the raw_data
+    and analysis_results blobs are left out unless named.
+    """
     user_id = request.args.get('user_id', 1)
-    limit = request.args.get('limit', 50, type=int)
+    limit = min(max(request.args.get('limit', 50, type=int), 1), MAX_SCAN_PAGE_SIZE)
+    
+    fields = parse_scan_fields(request.args.get('fields'))
+    if fields is None:
+        return jsonify({'error': f"Unknown field; choose from {', '.join(SCAN_FIELDS)}"}), 400
+    
+    # The keyset columns are always loaded so the next cursor can be built
+    columns = list(dict.fromkeys(
+        [column for field in fields for column in DigitalFootprintScan.columns_for(field)] + ['scan_date', 'id']
+    ))
+    query = DigitalFootprintScan.query.with_entities(
+        *[getattr(DigitalFootprintScan, column) for column in columns]
+    ).filter_by(user_id=user_id)
+    
+    cursor = request.args.get('cursor')
+    if cursor:
+        try:
+            cursor_date, cursor_id = decode_cursor(cursor)
+        except ValueError:
+            return jsonify({'error': 'Invalid cursor'}), 400
+        query = query.filter(or_(
+            DigitalFootprintScan.scan_date < cursor_date,
+            and_(DigitalFootprintScan.scan_date == cursor_date, DigitalFootprintScan.id < cursor_id)
+        ))
+    
+    rows = query.order_by(DigitalFootprintScan.scan_date.desc(), DigitalFootprintScan.id.desc())\
+                .limit(limit + 1).all()
+    
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        next_cursor = encode_cursor(rows[-1].scan_date, rows[-1].id)
+    
+    return jsonify({
+        'scans': [DigitalFootprintScan.project(row, fields) for row in rows],
+        'next_cursor': next_cursor
+    })
+
+def parse_scan_fields(fields_arg):
+    """Requested scan columns, the summary columns by default, or None if any is unknown"""
+    if not fields_arg:
+        return list(DigitalFootprintScan.SUMMARY_FIELDS)
     
-    scans = DigitalFootprintScan.query.filter_by(user_id=user_id)\
-                                     .order_by(DigitalFootprintScan.scan_date.desc())\
-                                     .limit(limit).all()
+    fields = list(dict.fromkeys(field.strip() for field in fields_arg.split(',') if field.strip()))
+    if not fields or any(field not in SCAN_FIELDS for field in fields):
+        return None
+    return fields
+
+def encode_cursor(scan_date, scan_id):
+    """Opaque page cursor for the row a page ended on"""
+    value = json.dumps([scan_date.isoformat() if scan_date else None, scan_id])
+    return base64.urlsafe_b64encode(value.encode('utf-8')).decode('ascii')
+
+def decode_cursor(cursor):
+    """Inverse of encode_cursor; raises ValueError on anything malformed"""
+    try:
+        scan_date, scan_id = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+        return datetime.fromisoformat(scan_date), int(scan_id)
+    except (TypeError, ValueError, UnicodeError, binascii.Error) as e:
+        raise ValueError(f'Invalid cursor: {cursor}') from e
+
+@scan_bp.route('/scans/<int:scan_id>/raw', methods=['GET'])
+def get_scan_raw_data(scan_id):
+    """Get the scraped platform payload of a single scan"""
+    scan = DigitalFootprintScan.query.with_entities(
+        DigitalFootprintScan.id, DigitalFootprintScan.raw_data, DigitalFootprintScan.raw_data_hash
+    ).filter_by(id=scan_id).first_or_404()
     
     return jsonify({
-        'scans': [scan.to_dict() for scan in scans]
+        'scan_id': scan.id,
+        'raw_data': DigitalFootprintScan.load_raw_data(scan.raw_data, scan.raw_data_hash)
     })
 
 @scan_bp.route('/scans/<int:scan_id>', methods=['GET'])
@@ -147,15 +309,292 @@ def get_scan_details(scan_id):
         'alerts': [alert.to_dict() for alert in alerts]
     })
 
+@scan_bp.route('/scans/<int:scan_id>/status', methods=['GET'])
+def get_scan_status(scan_id):
+    """Poll the progress of a queued scan"""
+    return jsonify({
+        'success': True,
+        'scan': scan_status(scan_id)
+    })
+
+@scan_bp.route('/scans/<int:scan_id>/events', methods=['GET'])
+def stream_scan_events(scan_id):
+    """Follow the progress of a queued scan as server-sent events"""
+    status = scan_status(scan_id)
+    
+    def generate():
+        state = status
+        yield f"data: {json.dumps(state)}\n\n"
+        
+        while state['status'] not in TERMINAL_STATUSES:
+            updated = scan_queue.wait_for_update(scan_id, state.get('version', 0), timeout=15)
+            
+            if updated is None or updated.get('version') == state.get('version'):
+                # Nothing new from this process's workers; the database is authoritative
+                latest = scan_status(scan_id)
+                if latest['status'] == state['status']:
+                    yield ": keep-alive\n\n"
+                    continue
+                state = latest
+            else:
+                state = updated
+            
+            yield f"data: {json.dumps(state)}\n\n"
+    
+    return Response(stream_with_context(generate()), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def scan_status(scan_id):
+    """Combine the stored scan status with any live progress from the queue"""
+    scan = DigitalFootprintScan.query.with_entities(
+        DigitalFootprintScan.id, DigitalFootprintScan.status, DigitalFootprintScan.risk_score
+    ).filter_by(id=scan_id).first_or_404()
+    
+    status = {
+        'scan_id': scan.id,
+        'status': scan.status,
+        'stage': scan.status,
+        'progress': 100 if scan.status in TERMINAL_STATUSES else 0,
+        'risk_score': scan.risk_score
+    }
+    
+    progress = scan_queue.get_progress(scan_id)
+    if progress:
+        status.update(progress)
+        # The stored row wins once the scan has finished
+        if scan.status in TERMINAL_STATUSES:
+            status['status'] = scan.status
+    
+    return status
+
+@scan_bp.route('/scans/bulk', methods=['POST'])
+def bulk_scan():
+    """Register and scan many (user, platform, username) handles at once
+    
+    Accepts a CSV (header: user_id or user, platform, username) or JSONL body,
+    or either as a multipart ``file`` upload. Streams one NDJSON line per input
+    row as rows are registered, then a summary line. With ``wait=1`` the stream
+    stays open and reports each scan as it finishes; blank lines are keep-alives.
+    """
+    upload = request.files.get('file')
+    if upload:
+        fmt = request.args.get('format') or detect_format(upload.content_type, upload.filename)
+        stream = upload.stream
+    else:
+        fmt = request.args.get('format') or detect_format(request.content_type)
+        stream = request.stream
+    
+    if fmt not in ('csv', 'jsonl'):
+        return jsonify({'error': 'Send CSV (text/csv) or JSONL (application/x-ndjson) data'}), 400
+    
+    # Read the whole upload before streaming the response back
+    records = []
+    try:
+        for row_number, record in read_records(stream, fmt):
+            if len(records) >= MAX_BULK_ROWS:
+                return jsonify({'error': f'At most {MAX_BULK_ROWS} rows per request'}), 413
+            records.append((row_number, record))
+    except (UnicodeDecodeError, csv.Error) as e:
+        return jsonify({'error': f'Unreadable {fmt.upper()} data: {str(e)}'}), 400
+    
+    wait = request.args.get('wait', '0').lower() in ('1', 'true')
+    
+    def generate():
+        totals = {'rows': len(records), 'queued': 0, 'duplicates': 0, 'errors': 0}
+        queued_keys = {}  # (user_id, platform, username) -> scan id, across the whole request
+        pending = {}  # scan id -> row number
+        
+        for start in range(0, len(records), BULK_CHUNK_SIZE):
+            results = register_bulk_rows(records[start:start + BULK_CHUNK_SIZE], queued_keys)
+            for result in results:
+                if result['status'] == 'queued':
+                    totals['queued'] += 1
+                    pending[result['scan_id']] = result['row']
+                elif result['status'] == 'duplicate':
+                    totals['duplicates'] += 1
+                else:
+                    totals['errors'] += 1
+                yield json.dumps(result) + '\n'
+        
+        yield json.dumps({'summary': totals}) + '\n'
+        
+        if not wait:
+            return
+        
+        finished = {status: 0 for status in TERMINAL_STATUSES}
+        while pending:
+            # End the read transaction so the next poll sees workers' commits
+            db.session.rollback()
+            done = finished_scans(list(pending))
+            for scan_id, status, risk_score in done:
+                finished[status] += 1
+                yield json.dumps({
+                    'row': pending.pop(scan_id),
+                    'scan_id': scan_id,
+                    'status': status,
+                    'risk_score': risk_score
+                }) + '\n'
+            
+            if pending:
+                if not done:
+                    yield '\n'
+                time.sleep(BULK_POLL_SECONDS)
+        
+        yield json.dumps({'summary': {**totals, **finished}}) + '\n'
+    
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+def register_bulk_rows(chunk, queued_keys):
+    """Validate a chunk of rows, bulk-insert its configs and scans and queue the scans"""
+    results = []
+    valid = []
+    for row_number, record in chunk:
+        try:
+            valid.append((row_number, normalize_record(record)))
+        except ValueError as e:
+            results.append({'row': row_number, 'status': 'error', 'error': str(e)})
+    
+    known_ids, user_ids = resolve_bulk_users({row['user_id'] for _, row in valid if row['user_id'] is not None},
+                                             {row['user'] for _, row in valid if row['user_id'] is None})
+    
+    new_keys = {}  # key -> first row number needing a scan
+    duplicates = []
+    for row_number, row in valid:
+        if row['user_id'] is not None:
+            user_id = row['user_id'] if row['user_id'] in known_ids else None
+        else:
+            user_id = user_ids.get(row['user'])
+        if user_id is None:
+            results.append({'row': row_number, 'status': 'error',
+                            'error': f"Unknown user: {row['user'] if row['user_id'] is None else row['user_id']}"})
+            continue
+        
+        key = (user_id, row['platform'], row['username'])
+        if key in queued_keys or key in new_keys:
+            duplicates.append((key, {'row': row_number, 'status': 'duplicate', 'user_id': user_id,
+                                     'platform': row['platform'], 'username': row['username']}))
+            continue
+        new_keys[key] = row_number
+    
+    if new_keys:
+        insert_bulk_scans(new_keys, queued_keys, results)
+    
+    # Repeated handles share the scan queued for their first occurrence
+    for key, result in duplicates:
+        result['scan_id'] = queued_keys[key]
+        results.append(result)
+    
+    return sorted(results, key=lambda result: result['row'])
+
+def insert_bulk_scans(new_keys, queued_keys, results):
+    """Bulk-insert missing platform configs and one pending scan per key, then queue the scans"""
+    key_columns = (PlatformConfig.user_id, PlatformConfig.platform, PlatformConfig.username)
+    config_ids = {
+        (user_id, platform, username): config_id
+        for config_id, user_id, platform, username in PlatformConfig.query.with_entities(
+            PlatformConfig.id, *key_columns
+        ).filter(tuple_(*key_columns).in_(list(new_keys))).all()
+    }
+    
+    created_keys = [key for key in new_keys if key not in config_ids]
+    if created_keys:
+        # This scan counts as the first run; the scheduler picks up the next one a full interval out
+        now = datetime.utcnow()
+        created = db.session.execute(
+            insert(PlatformConfig).returning(PlatformConfig.id, *key_columns),
+            [{'user_id': user_id, 'platform': platform, 'username': username, 'enabled': True, 'scan_frequency': 24,
+              'next_run': from_epoch(scan_scheduler.next_due(now, 24))}
+             for user_id, platform, username in created_keys]
+        ).all()
+        config_ids.update({(user_id, platform, username): config_id
+                           for config_id, user_id, platform, username in created})
+    
+    scans = db.session.execute(
+        insert(DigitalFootprintScan).returning(DigitalFootprintScan.id, DigitalFootprintScan.user_id,
+                                               DigitalFootprintScan.platform, DigitalFootprintScan.username),
+        [{'user_id': user_id, 'platform': platform, 'username': username, 'status': 'pending'}
+         for user_id, platform, username in new_keys]
+    ).all()
+    db.session.commit()
+    
+    created_set = set(created_keys)
+    scan_ids = []
+    for scan_id, user_id, platform, username in scans:
+        key = (user_id, platform, username)
+        queued_keys[key] = scan_id
+        scan_ids.append(scan_id)
+        results.append({
+            'row': new_keys[key],
+            'status': 'queued',
+            'user_id': user_id,
+            'platform': platform,
+            'username': username,
+            'platform_config_id': config_ids[key],
+            'created_config': key in created_set,
+            'scan_id': scan_id
+        })
+    
+    scan_queue.submit_backlog(sorted(scan_ids))
+
+def resolve_bulk_users(ids, names):
+    """The given user ids that exist, and a map of the given usernames to user ids"""
+    known_ids = set()
+    if ids:
+        known_ids = {user_id for (user_id,) in User.query.with_entities(User.id).filter(User.id.in_(list(ids)))}
+    
+    user_ids = {}
+    if names:
+        user_ids = dict(User.query.with_entities(User.username, User.id).filter(User.username.in_(list(names))).all())
+    return known_ids, user_ids
+
+def finished_scans(scan_ids):
+    """(id, status, risk_score) of the given scans that have reached a terminal status"""
+    finished = []
+    for start in range(0, len(scan_ids), BULK_CHUNK_SIZE):
+        finished.extend(DigitalFootprintScan.query.with_entities(
+            DigitalFootprintScan.id, DigitalFootprintScan.status, DigitalFootprintScan.risk_score
+        ).filter(
+            DigitalFootprintScan.id.in_(scan_ids[start:start + BULK_CHUNK_SIZE]),
+            DigitalFootprintScan.status.in_(TERMINAL_STATUSES)
+        ).all())
+    return finished
+
+@scan_bp.route('/users/<int:user_id>/risk', methods=['GET'])
+def get_user_risk(user_id):
+    """Current weighted overall risk, per-platform scores and open alerts from the stored summary"""
+    summary = risk_summaries.get(user_id)
+    if summary is None:
+        # No completed scans or alerts yet
+        User.query.get_or_404(user_id)
+        summary = {'user_id': user_id, 'overall_risk': 0.0, 'total_weight': 0.0, 'platform_breakdown': {},
+                   'top_factors': [], 'open_alerts': 0, 'open_alerts_by_severity': {}, 'updated_date': None}
+    
+    return jsonify({
+        **summary,
+        'recommendations': AIAnalyzer.overall_recommendations(summary['overall_risk'])
+    })
+
+@scan_bp.route('/users/<int:user_id>/risk/trend', methods=['GET'])
+def get_risk_trend(user_id):
+    """Average risk per day or week from the stored rollups"""
+    try:
+        trend = risk_rollups.trend(user_id,
+                                   period=request.args.get('period', 'day'),
+                                   buckets=request.args.get('buckets', 30, type=int),
+                                   platform=request.args.get('platform'))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'user_id': user_id, **trend})
+
 @scan_bp.route('/alerts', methods=['GET'])
 def get_alerts():
     """Get all risk alerts for a user"""
     user_id = request.args.get('user_id', 1)
     acknowledged = request.args.get('acknowledged', type=bool)
     
-    # Join with scans to filter by user
-    query = db.session.query(RiskAlert).join(DigitalFootprintScan)\
-                     .filter(DigitalFootprintScan.user_id == user_id)
+    query = RiskAlert.query.filter(RiskAlert.user_id == user_id)
     
     if acknowledged is not None:
         query = query.filter(RiskAlert.acknowledged == acknowledged)
@@ -171,6 +610,7 @@ def acknowledge_alert(alert_id):
     """Acknowledge a risk alert"""
     alert = RiskAlert.query.get_or_404(alert_id)
     alert.acknowledged = True
+    risk_summaries.refresh_alerts(alert.user_id)
     db.session.commit()
     
     return jsonify({
@@ -178,68 +618,65 @@ def acknowledge_alert(alert_id):
         'alert': alert.to_dict()
     })
 
+def run_scan(scan, ledger=None):
+    """Collect a scan's data and analyze it, returning (scan_result, analysis_result)"""
+    if scan.depth == 'history':
+        scan_result, analysis_result = perform_history_scan(scan, ledger)
+    else:
+        scan_result = perform_platform_scan(scan.platform, scan.username)
+        scan_queue.update(scan.id, stage='analyzing', progress=60)
+        analysis_result = analyze_content(scan_result, scan.platform, ledger)
+    
+    if ledger:
+        analysis_result['delta'] = ledger.stats()
+    return scan_result, analysis_result
+
 def perform_platform_scan(platform, username):
     """Perform scan for specific platform"""
     try:
-        from data_api import ApiClient
-        client = ApiClient()
-        
-        if platform == 'twitter':
-            # Get Twitter profile
-            profile_result = client.call_api('Twitter/get_user_profile_by_username', 
-                                           query={'username': username})
-            
-            # Get user tweets if profile exists
-            if profile_result and 'result' in profile_result:
-                user_data = profile_result['result']['data']['user']['result']
-                user_id = user_data.get('rest_id')
-                
-                if user_id:
-                    tweets_result = client.call_api('Twitter/get_user_tweets',
-                                                  query={'user': user_id, 'count': '20'})
-                    return {
-                        'profile': profile_result,
-                        'tweets': tweets_result
-                    }
-            
-            return {'profile': profile_result}
-            
-        elif platform == 'linkedin':
-            # Get LinkedIn profile
-            profile_result = client.call_api('LinkedIn/get_user_profile_by_username',
-                                           query={'username': username})
-            return {'profile': profile_result}
-            
-        elif platform == 'youtube':
-            # Get YouTube channel details
-            channel_result = client.call_api('Youtube/get_channel_details',
-                                           query={'id': username, 'hl': 'en'})
-            return {'channel': channel_result}
-            
-        elif platform == 'tiktok':
-            # Get TikTok user info
-            user_result = client.call_api('Tiktok/get_user_info',
-                                        query={'uniqueId': username})
-            return {'user': user_result}
-            
-        elif platform == 'reddit':
-            # Get Reddit posts (assuming username is subreddit)
-            posts_result = client.call_api('Reddit/AccessAPI',
-                                         query={'subreddit': username, 'limit': '25'})
-            return {'posts': posts_result}
-            
-        else:
-            raise ValueError(f"Unsupported platform: {platform}")
+        # Scans of the same handle running at once share one upstream fetch
+        return collector.fetch_platform_data(platform, username)
             
     except Exception as e:
         raise Exception(f"Failed to scan {platform}: {str(e)}")
 
-def analyze_content(scan_data, platform):
+def perform_history_scan(scan, ledger=None):
+    """Stream a handle's full history through the analyzer as its pages arrive
+    
+    Returns what the scan stores, the profile responses plus page and item
+    counts rather than every page, and the analysis.
+    """
+    from src.services.ai_analyzer import analyzer
+    
+    paged_section = PAGED_SECTIONS.get(scan.platform, (None, None))[0]
+    profile = {}
+    
+    def sections():
+        pages = 0
+        for section, response in collector.iter_platform_history(scan.platform, scan.username):
+            if section == paged_section:
+                pages += 1
+                scan_queue.update(scan.id, stage='collecting', progress=min(55, 10 + pages), pages=pages)
+            else:
+                profile[section] = response
+            yield section, response
+    
+    try:
+        analysis_result = analyzer.analyze_history(scan.platform, sections(), ledger)
+    except Exception as e:
+        raise Exception(f"Failed to scan {scan.platform}: {str(e)}")
+    
+    analysis_result['analysis_date'] = datetime.utcnow().isoformat()
+    if 'history' in analysis_result:
+        profile['history'] = analysis_result['history']
+    return profile, analysis_result
+
+def analyze_content(scan_data, platform, ledger=None):
     """Analyze scanned content for risks using local AI"""
     from src.services.ai_analyzer import analyzer
     
     try:
-        analysis_result = analyzer.analyze_platform_data(platform, scan_data)
+        analysis_result = analyzer.analyze_platform_data(platform, scan_data, ledger)
         analysis_result['analysis_date'] = datetime.utcnow().isoformat()
         return analysis_result
     except Exception as e:
@@ -265,6 +702,7 @@ def create_risk_alerts(scan, analysis_result):
     if risk_score > 20:  # Only create alerts for meaningful risks
         alert = RiskAlert(
             scan_id=scan.id,
+            user_id=scan.user_id,
             alert_type='content_risk',
             severity=severity,
             title=f'Potential risk detected on {scan.platform}',
@@ -284,11 +722,10 @@ def demo_scan():
         username = data.get('username', 'demo_user')
         
         # Simulate scan process with mock data
-        from ..services.data_collector import collector
         from ..services.ai_analyzer import analyzer
         
-        platform_data = collector.collect_platform_data(platform, username)
-        analysis_result = analyzer.analyze_platform_data(platform, platform_data)
+        analysis_result = analyzer.analyze_shared(
+            platform, username, lambda: collector.collect_platform_data(platform, username))
         
         # Create demo scan result
         scan_result = {
@@ -308,6 +745,17 @@ def demo_scan():
         })
         
     except Exception as e:
+        # Quota pushback from the platform, not a failure: tell the client when to come back
+        throttled = throttled_cause(e)
+        if throttled is not None:
+            response = jsonify({
+                'error': f'Platform is throttled: {str(throttled)}',
+                'retry_after': throttled.retry_after,
+                'success': False
+            })
+            response.headers['Retry-After'] = retry_after_header(throttled.retry_after)
+            return response, 503
+        
         print(f"Error in demo_scan: {str(e)}")
         import traceback
         print(traceback.format_exc())
@@ -1,5 +1,7 @@
 from flask import Blueprint, jsonify, request
 from src.models.user import User, db
+from src.services.risk_rollup import risk_rollups
+from src.services.risk_summary import risk_summaries
 
 user_bp = Blueprint('user', __name__)
 
@@ -35,5 +37,9 @@ def update_user(user_id):
 def delete_user(user_id):
     user = User.query.get_or_404(user_id)
     db.session.delete(user)
+    
+    # Materialized risk is keyed by user id, so clear it with the user
+    risk_summaries.remove_user(user_id)
+    risk_rollups.remove_user(user_id)
     db.session.commit()
     return '', 204
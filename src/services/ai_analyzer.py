@@ -5,8 +5,86 @@ Provides content analysis and risk assessment using local AI models
 
 import re
 import json
+import hashlib
+import functools
+import os
+import threading
+from collections import OrderedDict
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Callable, Dict, Iterable, List, Any, Optional, Tuple
+
+from .keyword_matcher import KeywordMatcher
+from .metrics import metrics
+from .single_flight import SingleFlight
+from .platform_content import PAGED_SECTIONS, post_items, tweet_items, video_items
+
+# Weight platforms by professional importance
+PLATFORM_WEIGHTS = {
+    'linkedin': 1.5,  # Most important for career
+    'twitter': 1.2,   # High visibility
+    'youtube': 1.0,   # Moderate impact
+    'tiktok': 0.8,    # Less professional impact
+    'reddit': 0.9     # Community-based
+}
+
+# Layout of extracted features; bumped when it changes, so features stored in an older layout are re-extracted
+FEATURES_FORMAT = 2
+
+class FeatureAggregate:
+    """Running merge of per-text features, as if every text added so far were joined with spaces
+    
+    Holds only the distinct keyword hits (bounded by the lexicon), a few
+    counters and the joined text's first and last few characters, so any
+    number of items can be folded in at constant memory. Keywords spanning
+    the space between two texts are found from those boundary characters.
+    """
+    
+    def __init__(self, matcher: KeywordMatcher, lexicon_version: str):
+        self.matcher = matcher
+        self.lexicon_version = lexicon_version
+        self.count = 0
+        self.keywords = set()
+        self.length = 0
+        self.exclamations = 0
+        self.questions = 0
+        self.any_upper = False
+        self.all_upper_or_uncased = True
+        self.cased = False
+        self.head = ''
+        self.tail = ''
+    
+    def add(self, features: Dict[str, Any]):
+        edge = self.matcher.edge_length
+        if self.count:
+            self.keywords.update(self.matcher.find_across(self.tail, features['head']))
+            if len(self.head) < edge:
+                self.head = f"{self.head} {features['head']}"[:edge]
+            self.tail = f"{self.tail} {features['tail']}"[-edge:] if edge else ''
+        else:
+            self.head, self.tail = features['head'], features['tail']
+        
+        self.count += 1
+        self.keywords.update(features['keywords'])
+        self.length += features['length']
+        self.exclamations += features['exclamations']
+        self.questions += features['questions']
+        self.any_upper = self.any_upper or features['upper']
+        self.all_upper_or_uncased = self.all_upper_or_uncased and (features['upper'] or not features['cased'])
+        self.cased = self.cased or features['cased']
+    
+    def features(self) -> Dict[str, Any]:
+        return {
+            'lexicon_version': self.lexicon_version,
+            'keywords': sorted(self.keywords),
+            'length': self.length + max(0, self.count - 1),
+            'exclamations': self.exclamations,
+            'questions': self.questions,
+            # Joined text is all caps when every text containing letters is
+            'upper': self.any_upper and self.all_upper_or_uncased,
+            'cased': self.cased,
+            'head': self.head,
+            'tail': self.tail
+        }
 
 class AIAnalyzer:
     """AI-powered content analyzer for digital footprint risk assessment"""
@@ -49,79 +127,192 @@ class AIAnalyzer:
             'children', 'personal email', 'ssn', 'social security',
             'bank', 'credit card', 'password', 'private'
         ]
+        
+        # Personal content indicators checked on professional platforms
+        self.personal_indicators = ['personal', 'private', 'family', 'relationship', 'dating']
+        
+        # Per-item features memoized by content hash and lexicon version
+        self.item_cache_size = int(os.environ.get('ARGUS_ITEM_CACHE_SIZE', 10000))
+        self.item_cache = OrderedDict()
+        self.item_cache_hits = 0
+        self.item_cache_misses = 0
+        self._item_cache_lock = threading.Lock()
+        
+        # Concurrent analyses of the same handle share one run
+        self.flights = SingleFlight('analysis')
+        
+        self.compile_lexicon()
+    
+    def compile_lexicon(self):
+        """Compile every keyword list into one matcher so each text is scanned once
+        
+        Call again after changing any keyword list; cached item features from the
+        previous lexicon version are dropped.
+        """
+        self.matcher = KeywordMatcher(
+            [word for words in self.risk_keywords.values() for word in words] +
+            [word for words in self.professional_keywords.values() for word in words] +
+            self.privacy_risk_indicators +
+            self.personal_indicators
+        )
+        self.lexicon_version = f'{self.matcher.version}-{FEATURES_FORMAT}'
+        
+        with self._item_cache_lock:
+            self.item_cache.clear()
+    
+    def item_features(self, text: str, cache: bool = True) -> Dict[str, Any]:
+        """Features of a single content item, served from the content-hash cache when possible
+        
+        With ``cache=False`` a miss is not added to the cache.
+        """
+        key = (self.lexicon_version, hashlib.sha256(text.encode('utf-8')).hexdigest())
+        
+        with self._item_cache_lock:
+            features = self.item_cache.get(key)
+            if features is not None:
+                self.item_cache.move_to_end(key)
+                self.item_cache_hits += 1
+                return features
+            self.item_cache_misses += 1
+        
+        features = self.extract_features(text)
+        if not cache:
+            return features
+        
+        with self._item_cache_lock:
+            self.item_cache[key] = features
+            while len(self.item_cache) > self.item_cache_size:
+                self.item_cache.popitem(last=False)
+        
+        return features
+    
+    def item_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for the per-item features cache"""
+        with self._item_cache_lock:
+            lookups = self.item_cache_hits + self.item_cache_misses
+            return {
+                'hits': self.item_cache_hits,
+                'misses': self.item_cache_misses,
+                'hit_rate': round(self.item_cache_hits / lookups, 4) if lookups else 0.0,
+                'entries': len(self.item_cache),
+                'lexicon_version': self.lexicon_version
+            }
     
     def analyze_text_content(self, text: str, platform: str) -> Dict[str, Any]:
         """Analyze text content for potential risks"""
         if not text:
             return {'risk_score': 0.0, 'factors': [], 'sentiment': 'neutral'}
         
+        return self.score_features(self.item_features(text), platform)
+    
+    def extract_features(self, text: str) -> Dict[str, Any]:
+        """Extract the keyword hits and text statistics that risk scoring depends on
+        
+        Features of several texts can be combined with merge_features and scored as
+        if the texts had been joined, so per-item results can be stored and reused.
+        """
         text_lower = text.lower()
+        edge = self.matcher.edge_length
+        return {
+            'lexicon_version': self.lexicon_version,
+            'keywords': sorted(self.matcher.find(text_lower)),
+            'length': len(text),
+            'exclamations': text.count('!'),
+            'questions': text.count('?'),
+            'upper': text.isupper(),
+            'cased': text_lower != text.upper(),
+            # Lowercased ends, for keywords that span this text and its neighbours once joined
+            'head': text_lower[:edge],
+            'tail': text_lower[-edge:] if edge else ''
+        }
+    
+    def merge_features(self, features_list: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Combine per-text features as if the texts were joined with spaces"""
+        aggregate = FeatureAggregate(self.matcher, self.lexicon_version)
+        for features in features_list:
+            aggregate.add(features)
+        return aggregate.features()
+    
+    def keyword_hits(self, features: Dict[str, Any]) -> Dict[str, List[str]]:
+        """Group a text's keyword hits by lexicon category, in lexicon order"""
+        found = set(features['keywords'])
+        return {
+            'high_risk': [word for word in self.risk_keywords['high_risk'] if word in found],
+            'medium_risk': [word for word in self.risk_keywords['medium_risk'] if word in found],
+            'low_risk': [word for word in self.risk_keywords['low_risk'] if word in found],
+            'privacy': [indicator for indicator in self.privacy_risk_indicators if indicator in found],
+            'positive': [word for word in self.professional_keywords['positive'] if word in found],
+            'negative': [word for word in self.professional_keywords['negative'] if word in found],
+            'personal': [word for word in self.personal_indicators if word in found]
+        }
+    
+    def describe_features(self, features: Dict[str, Any], hits: Dict[str, List[str]], platform: str) -> List[str]:
+        """Human-readable risk factors for a text's features"""
         risk_factors = []
+        
+        if hits['high_risk']:
+            risk_factors.append(f"High-risk keywords detected: {', '.join(hits['high_risk'])}")
+        if hits['medium_risk']:
+            risk_factors.append(f"Medium-risk keywords detected: {', '.join(hits['medium_risk'])}")
+        if hits['low_risk']:
+            risk_factors.append(f"Casual content detected: {', '.join(hits['low_risk'])}")
+        if hits['privacy']:
+            risk_factors.append(f"Privacy risks detected: {', '.join(hits['privacy'])}")
+        if hits['negative']:
+            risk_factors.append(f"Negative professional keywords: {', '.join(hits['negative'])}")
+        if hits['positive']:
+            risk_factors.append(f"Positive professional content: {', '.join(hits['positive'])}")
+        
+        if platform == 'linkedin' and hits['personal']:
+            risk_factors.append("Personal content on professional platform")
+        
+        if features['length'] > 1000:
+            risk_factors.append("Long-form content - higher visibility")
+        if features['upper'] and features['length'] > 20:
+            risk_factors.append("All caps content detected (aggressive tone)")
+        if features['exclamations'] > 3 or features['questions'] > 3:
+            risk_factors.append("Excessive punctuation detected")
+        
+        return risk_factors
+    
+    def score_features(self, features: Dict[str, Any], platform: str) -> Dict[str, Any]:
+        """Score extracted text features for potential risks"""
+        if not features['length']:
+            return {'risk_score': 0.0, 'factors': [], 'sentiment': 'neutral'}
+        
+        hits = self.keyword_hits(features)
         risk_score = 0.0
         
-        # Check for high-risk keywords
-        high_risk_found = [word for word in self.risk_keywords['high_risk'] if word in text_lower]
-        if high_risk_found:
-            risk_score += len(high_risk_found) * 25
-            risk_factors.append(f"High-risk keywords detected: {', '.join(high_risk_found)}")
-        
-        # Check for medium-risk keywords
-        medium_risk_found = [word for word in self.risk_keywords['medium_risk'] if word in text_lower]
-        if medium_risk_found:
-            risk_score += len(medium_risk_found) * 15
-            risk_factors.append(f"Medium-risk keywords detected: {', '.join(medium_risk_found)}")
-        
-        # Check for low-risk keywords
-        low_risk_found = [word for word in self.risk_keywords['low_risk'] if word in text_lower]
-        if low_risk_found:
-            risk_score += len(low_risk_found) * 3
-            risk_factors.append(f"Casual content detected: {', '.join(low_risk_found)}")
-        
-        # Privacy risk analysis
-        privacy_risks = [indicator for indicator in self.privacy_risk_indicators if indicator in text_lower]
-        if privacy_risks:
-            risk_score += len(privacy_risks) * 20
-            risk_factors.append(f"Privacy risks detected: {', '.join(privacy_risks)}")
-        
-        # Professional content analysis
-        positive_prof = [word for word in self.professional_keywords['positive'] if word in text_lower]
-        negative_prof = [word for word in self.professional_keywords['negative'] if word in text_lower]
-        
-        if negative_prof:
-            risk_score += len(negative_prof) * 30
-            risk_factors.append(f"Negative professional keywords: {', '.join(negative_prof)}")
-        
-        if positive_prof:
-            risk_score = max(0, risk_score - len(positive_prof) * 3)  # Reduce risk for positive content
-            risk_factors.append(f"Positive professional content: {', '.join(positive_prof)}")
+        # Keyword risk: high, medium and low risk, privacy and negative professional terms
+        risk_score += len(hits['high_risk']) * 25
+        risk_score += len(hits['medium_risk']) * 15
+        risk_score += len(hits['low_risk']) * 3
+        risk_score += len(hits['privacy']) * 20
+        risk_score += len(hits['negative']) * 30
+        
+        if hits['positive']:
+            risk_score = max(0, risk_score - len(hits['positive']) * 3)  # Reduce risk for positive content
         
         # Platform-specific adjustments
         if platform == 'linkedin':
             # LinkedIn is professional, so personal content is riskier
-            personal_indicators = ['personal', 'private', 'family', 'relationship', 'dating']
-            personal_found = [word for word in personal_indicators if word in text_lower]
-            if personal_found:
-                risk_score += len(personal_found) * 8
-                risk_factors.append("Personal content on professional platform")
+            risk_score += len(hits['personal']) * 8
         
         elif platform == 'twitter':
             # Twitter allows more casual content
             risk_score *= 0.8  # Reduce overall risk for Twitter
         
         # Content length analysis
-        if len(text) > 1000:
-            risk_factors.append("Long-form content - higher visibility")
+        if features['length'] > 1000:
             risk_score += 5
         
         # All caps detection (shouting)
-        if text.isupper() and len(text) > 20:
+        if features['upper'] and features['length'] > 20:
             risk_score += 10
-            risk_factors.append("All caps content detected (aggressive tone)")
         
         # Excessive punctuation
-        if text.count('!') > 3 or text.count('?') > 3:
+        if features['exclamations'] > 3 or features['questions'] > 3:
             risk_score += 5
-            risk_factors.append("Excessive punctuation detected")
         
         # Cap risk score at 100
         risk_score = min(100.0, risk_score)
@@ -132,20 +323,137 @@ class AIAnalyzer:
             sentiment = 'negative'
         elif risk_score > 30:
             sentiment = 'mixed'
-        elif positive_prof and risk_score < 15:
+        elif hits['positive'] and risk_score < 15:
             sentiment = 'positive'
         
+        return self._verdict(features, hits, platform, risk_score, sentiment)
+    
+    def _verdict(self, features: Dict[str, Any], hits: Dict[str, List[str]], platform: str,
+                 risk_score: float, sentiment: str) -> Dict[str, Any]:
         return {
             'risk_score': risk_score,
-            'factors': risk_factors,
+            'factors': self.describe_features(features, hits, platform),
             'sentiment': sentiment,
-            'positive_indicators': positive_prof,
-            'negative_indicators': negative_prof + high_risk_found + medium_risk_found,
-            'privacy_risks': privacy_risks
+            'positive_indicators': hits['positive'],
+            'negative_indicators': hits['negative'] + hits['high_risk'] + hits['medium_risk'],
+            'privacy_risks': hits['privacy']
         }
     
-    def analyze_twitter_data(self, twitter_data: Dict[str, Any]) -> Dict[str, Any]:
+    def analyze_batch(self, texts: List[str], platform: str, include_factors: bool = True) -> List[Dict[str, Any]]:
+        """Analyze many texts in one call, returning one verdict per text
+        
+        Keyword hits are laid out as a document-term matrix over the compiled
+        lexicon and all texts are scored with vectorized NumPy operations. Each
+        verdict matches what analyze_text_content returns for that text; with
+        include_factors=False only risk_score and sentiment are returned, which
+        skips building factor text for every item.
+        """
+        import numpy as np
+        
+        if not texts:
+            return []
+        
+        # Extract each distinct text once; batch texts bypass the per-item cache
+        extracted = {}
+        for text in texts:
+            if text and text not in extracted:
+                extracted[text] = self.extract_features(text)
+        features_list = [extracted.get(text) for text in texts]
+        
+        # Document-term matrix of keyword hits over the compiled lexicon
+        term_index = {word: index for index, word in enumerate(self.matcher.keywords)}
+        rows, columns = [], []
+        stats = np.zeros((len(texts), 4), dtype=np.int64)
+        for row, features in enumerate(features_list):
+            if features:
+                for word in features['keywords']:
+                    rows.append(row)
+                    columns.append(term_index[word])
+                stats[row] = (features['length'], features['exclamations'],
+                              features['questions'], features['upper'])
+        
+        doc_term = np.zeros((len(texts), len(term_index)), dtype=np.int32)
+        doc_term[rows, columns] = 1
+        
+        # Term-category matrix, so one product counts hits per category for every text
+        categories = self.keyword_hits({'keywords': self.matcher.keywords})
+        term_category = np.zeros((len(term_index), len(categories)), dtype=np.int32)
+        for column, words in enumerate(categories.values()):
+            term_category[[term_index[word] for word in words], column] = 1
+        counts = dict(zip(categories, (doc_term @ term_category).T))
+        
+        length, exclamations, questions = stats[:, 0], stats[:, 1], stats[:, 2]
+        upper = stats[:, 3].astype(bool)
+        
+        # Same rules, applied in the same order, as score_features
+        risk_score = (counts['high_risk'] * 25 + counts['medium_risk'] * 15 + counts['low_risk'] * 3 +
+                      counts['privacy'] * 20 + counts['negative'] * 30).astype(np.float64)
+        risk_score = np.where(counts['positive'] > 0,
+                              np.maximum(0, risk_score - counts['positive'] * 3), risk_score)
+        
+        if platform == 'linkedin':
+            risk_score += counts['personal'] * 8
+        elif platform == 'twitter':
+            risk_score *= 0.8
+        
+        risk_score += np.where(length > 1000, 5, 0)
+        risk_score += np.where(upper & (length > 20), 10, 0)
+        risk_score += np.where((exclamations > 3) | (questions > 3), 5, 0)
+        risk_score = np.minimum(100.0, risk_score)
+        
+        sentiment = np.select(
+            [risk_score > 60, risk_score > 30, (counts['positive'] > 0) & (risk_score < 15)],
+            ['negative', 'mixed', 'positive'],
+            default='neutral'
+        ).tolist()
+        risk_score = risk_score.tolist()
+        
+        if not include_factors:
+            return [{'risk_score': score, 'sentiment': label} for score, label in zip(risk_score, sentiment)]
+        
+        verdicts = []
+        for row, features in enumerate(features_list):
+            if not features:
+                verdicts.append({'risk_score': 0.0, 'factors': [], 'sentiment': 'neutral'})
+                continue
+            
+            verdicts.append(self._verdict(features, self.keyword_hits(features), platform,
+                                          risk_score[row], sentiment[row]))
+        
+        return verdicts
+    
+    def analyze_items(self, section: str, items: List[Any], platform: str, ledger=None) -> Optional[Dict[str, Any]]:
+        """Analyze a list of (item_id, text) content items as one body of content
+        
+        Each item is scored from its cached features, so unchanged items cost a hash
+        lookup. With an item ledger, unchanged items reuse the features recorded by
+        earlier scans. Returns None when there is no content to analyze.
+        """
+        if ledger is None:
+            features_list = [self.item_features(text) for item_id, text in items]
+        else:
+            features_list = ledger.features_for_items(section, items, self.item_features, self.lexicon_version)
+        
+        if not features_list:
+            return None
+        
+        analysis = self.score_features(self.merge_features(features_list), platform)
+        analysis['item_count'] = len(features_list)
+        return analysis
+    
+    @metrics.timed('argus_analysis_seconds', platform='twitter')
+    def analyze_twitter_data(self, twitter_data: Dict[str, Any], ledger=None) -> Dict[str, Any]:
         """Analyze Twitter profile and tweets"""
+        content_analysis = None
+        if 'tweets' in twitter_data:
+            # Analyze all tweet content
+            content_analysis = self.analyze_items('tweets', list(tweet_items(twitter_data['tweets'])),
+                                                  'twitter', ledger)
+        
+        return self.twitter_result(twitter_data, content_analysis)
+    
+    def twitter_result(self, twitter_data: Dict[str, Any], content_analysis: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Analyze the Twitter profile and combine it with an analysis of the tweets"""
         analysis_results = {
             'platform': 'twitter',
             'risk_score': 0.0,
@@ -181,44 +489,15 @@ class AIAnalyzer:
                 analysis_results['risk_score'] += profile_analysis['risk_score'] * 0.3
                 analysis_results['factors'].extend([f"Profile: {factor}" for factor in profile_analysis['factors']])
         
-        # Analyze tweets
-        if 'tweets' in twitter_data:
-            tweets = twitter_data['tweets']
-            tweet_texts = []
-            tweet_count = 0
-            
-            # Extract tweet texts
-            if 'result' in tweets and 'timeline' in tweets['result']:
-                timeline = tweets['result']['timeline']
-                instructions = timeline.get('instructions', [])
-                
-                for instruction in instructions:
-                    if instruction.get('type') == 'TimelineAddEntries':
-                        entries = instruction.get('entries', [])
-                        for entry in entries:
-                            if entry.get('entryId', '').startswith('tweet-'):
-                                content = entry.get('content', {})
-                                if 'itemContent' in content:
-                                    tweet_results = content['itemContent'].get('tweet_results', {})
-                                    if 'result' in tweet_results:
-                                        tweet_data = tweet_results['result']
-                                        legacy = tweet_data.get('legacy', {})
-                                        tweet_text = legacy.get('full_text', '')
-                                        if tweet_text:
-                                            tweet_texts.append(tweet_text)
-                                            tweet_count += 1
-            
-            # Analyze all tweet content
-            if tweet_texts:
-                combined_text = ' '.join(tweet_texts)
-                content_analysis = self.analyze_text_content(combined_text, 'twitter')
-                analysis_results['content_analysis'] = content_analysis
-                analysis_results['risk_score'] += content_analysis['risk_score'] * 0.7
-                analysis_results['factors'].extend([f"Tweets: {factor}" for factor in content_analysis['factors']])
-                analysis_results['factors'].append(f"Analyzed {tweet_count} recent tweets")
+        if content_analysis:
+            analysis_results['content_analysis'] = content_analysis
+            analysis_results['risk_score'] += content_analysis['risk_score'] * 0.7
+            analysis_results['factors'].extend([f"Tweets: {factor}" for factor in content_analysis['factors']])
+            analysis_results['factors'].append(f"Analyzed {content_analysis['item_count']} recent tweets")
         
         return analysis_results
     
+    @metrics.timed('argus_analysis_seconds', platform='linkedin')
     def analyze_linkedin_data(self, linkedin_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze LinkedIn profile data"""
         analysis_results = {
@@ -259,8 +538,19 @@ class AIAnalyzer:
         
         return analysis_results
     
-    def analyze_youtube_data(self, youtube_data: Dict[str, Any]) -> Dict[str, Any]:
+    @metrics.timed('argus_analysis_seconds', platform='youtube')
+    def analyze_youtube_data(self, youtube_data: Dict[str, Any], ledger=None) -> Dict[str, Any]:
         """Analyze YouTube channel data"""
+        content_analysis = None
+        if 'videos' in youtube_data:
+            # Analyze video titles
+            content_analysis = self.analyze_items('videos', list(video_items(youtube_data['videos'])),
+                                                  'youtube', ledger)
+        
+        return self.youtube_result(youtube_data, content_analysis)
+    
+    def youtube_result(self, youtube_data: Dict[str, Any], content_analysis: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Analyze the channel description and combine it with an analysis of the video titles"""
         analysis_results = {
             'platform': 'youtube',
             'risk_score': 0.0,
@@ -280,29 +570,15 @@ class AIAnalyzer:
                 analysis_results['risk_score'] += channel_analysis['risk_score'] * 0.4
                 analysis_results['factors'].extend([f"Channel: {factor}" for factor in channel_analysis['factors']])
         
-        # Analyze video titles
-        if 'videos' in youtube_data:
-            videos = youtube_data['videos']
-            video_titles = []
-            
-            contents = videos.get('contents', [])
-            for content in contents:
-                if content.get('type') == 'video':
-                    video = content.get('video', {})
-                    title = video.get('title', '')
-                    if title:
-                        video_titles.append(title)
-            
-            if video_titles:
-                combined_titles = ' '.join(video_titles)
-                content_analysis = self.analyze_text_content(combined_titles, 'youtube')
-                analysis_results['content_analysis'] = content_analysis
-                analysis_results['risk_score'] += content_analysis['risk_score'] * 0.6
-                analysis_results['factors'].extend([f"Videos: {factor}" for factor in content_analysis['factors']])
-                analysis_results['factors'].append(f"Analyzed {len(video_titles)} video titles")
+        if content_analysis:
+            analysis_results['content_analysis'] = content_analysis
+            analysis_results['risk_score'] += content_analysis['risk_score'] * 0.6
+            analysis_results['factors'].extend([f"Videos: {factor}" for factor in content_analysis['factors']])
+            analysis_results['factors'].append(f"Analyzed {content_analysis['item_count']} video titles")
         
         return analysis_results
     
+    @metrics.timed('argus_analysis_seconds', platform='tiktok')
     def analyze_tiktok_data(self, tiktok_data: Dict[str, Any]) -> Dict[str, Any]:
         """Analyze TikTok user data"""
         analysis_results = {
@@ -331,8 +607,18 @@ class AIAnalyzer:
         
         return analysis_results
     
-    def analyze_reddit_data(self, reddit_data: Dict[str, Any]) -> Dict[str, Any]:
+    @metrics.timed('argus_analysis_seconds', platform='reddit')
+    def analyze_reddit_data(self, reddit_data: Dict[str, Any], ledger=None) -> Dict[str, Any]:
         """Analyze Reddit posts data"""
+        content_analysis = None
+        if 'posts' in reddit_data:
+            content_analysis = self.analyze_items('posts', list(post_items(reddit_data['posts'])),
+                                                  'reddit', ledger)
+        
+        return self.reddit_result(reddit_data, content_analysis)
+    
+    def reddit_result(self, reddit_data: Dict[str, Any], content_analysis: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Reddit analysis from an analysis of the posts"""
         analysis_results = {
             'platform': 'reddit',
             'risk_score': 0.0,
@@ -340,28 +626,11 @@ class AIAnalyzer:
             'content_analysis': {}
         }
         
-        if 'posts' in reddit_data:
-            posts = reddit_data['posts']
-            post_texts = []
-            
-            posts_list = posts.get('posts', [])
-            for post_wrapper in posts_list:
-                post = post_wrapper.get('data', {})
-                title = post.get('title', '')
-                selftext = post.get('selftext', '')
-                
-                if title:
-                    post_texts.append(title)
-                if selftext:
-                    post_texts.append(selftext)
-            
-            if post_texts:
-                combined_text = ' '.join(post_texts)
-                content_analysis = self.analyze_text_content(combined_text, 'reddit')
-                analysis_results['content_analysis'] = content_analysis
-                analysis_results['risk_score'] = content_analysis['risk_score']
-                analysis_results['factors'] = content_analysis['factors']
-                analysis_results['factors'].append(f"Analyzed {len(post_texts)} posts/comments")
+        if content_analysis:
+            analysis_results['content_analysis'] = content_analysis
+            analysis_results['risk_score'] = content_analysis['risk_score']
+            analysis_results['factors'] = content_analysis['factors']
+            analysis_results['factors'].append(f"Analyzed {content_analysis['item_count']} posts/comments")
         
         return analysis_results
     
@@ -414,21 +683,12 @@ class AIAnalyzer:
         platform_breakdown = {}
         all_factors = []
         
-        # Weight platforms by professional importance
-        platform_weights = {
-            'linkedin': 1.5,  # Most important for career
-            'twitter': 1.2,   # High visibility
-            'youtube': 1.0,   # Moderate impact
-            'tiktok': 0.8,    # Less professional impact
-            'reddit': 0.9     # Community-based
-        }
-        
         total_weight = 0.0
         
         for analysis in platform_analyses:
             platform = analysis.get('platform', '')
             risk_score = analysis.get('risk_score', 0.0)
-            weight = platform_weights.get(platform, 1.0)
+            weight = PLATFORM_WEIGHTS.get(platform, 1.0)
             
             weighted_risk = risk_score * weight
             total_risk += weighted_risk
@@ -444,34 +704,38 @@ class AIAnalyzer:
         
         overall_risk = total_risk / total_weight if total_weight > 0 else 0.0
         
-        # Generate overall recommendations
-        overall_recommendations = []
-        if overall_risk > 50:
-            overall_recommendations.append("🚨 HIGH RISK: Immediate action required across multiple platforms")
-        elif overall_risk > 25:
-            overall_recommendations.append("⚠️ MEDIUM RISK: Review and improve content across platforms")
-        else:
-            overall_recommendations.append("✅ LOW RISK: Your digital footprint is generally healthy")
-        
         return {
             'overall_risk': round(overall_risk, 1),
             'platform_breakdown': platform_breakdown,
             'all_factors': all_factors,
-            'recommendations': overall_recommendations
+            'recommendations': self.overall_recommendations(overall_risk)
         }
     
-    def analyze_platform_data(self, platform: str, data: Dict[str, Any]) -> Dict[str, Any]:
-        """Main entry point for platform-specific analysis"""
+    @staticmethod
+    def overall_recommendations(overall_risk: float) -> List[str]:
+        """Headline recommendation for an overall risk score"""
+        if overall_risk > 50:
+            return ["🚨 HIGH RISK: Immediate action required across multiple platforms"]
+        elif overall_risk > 25:
+            return ["⚠️ MEDIUM RISK: Review and improve content across platforms"]
+        else:
+            return ["✅ LOW RISK: Your digital footprint is generally healthy"]
+    
+    def analyze_platform_data(self, platform: str, data: Dict[str, Any], ledger=None) -> Dict[str, Any]:
+        """Main entry point for platform-specific analysis
+        
+        Pass an item ledger to analyze tweets, videos and posts incrementally.
+        """
         if platform == 'twitter':
-            return self.analyze_twitter_data(data)
+            return self.analyze_twitter_data(data, ledger)
         elif platform == 'linkedin':
             return self.analyze_linkedin_data(data)
         elif platform == 'youtube':
-            return self.analyze_youtube_data(data)
+            return self.analyze_youtube_data(data, ledger)
         elif platform == 'tiktok':
             return self.analyze_tiktok_data(data)
         elif platform == 'reddit':
-            return self.analyze_reddit_data(data)
+            return self.analyze_reddit_data(data, ledger)
         else:
             # Generic analysis for unsupported platforms
             return {
@@ -480,6 +744,65 @@ class AIAnalyzer:
                 'factors': [f'Analysis for {platform} not yet implemented'],
                 'analysis_date': datetime.utcnow().isoformat()
             }
+    
+    def analyze_history(self, platform: str, sections: Iterable[Tuple[str, Any]], ledger=None) -> Dict[str, Any]:
+        """Analyze a platform's full history as it streams in, one page at a time
+        
+        ``sections`` yields (section, response) pairs such as the collector's
+        ``iter_platform_history``: profile or channel responses, then every page
+        of tweets, videos or posts. Each page's items are folded into running
+        aggregates and the page is dropped, so memory stays flat however long
+        the history is. The result matches analyze_platform_data on the same
+        items joined into one response, plus a ``history`` entry with page and
+        item counts. With an item ledger, each page's items are looked up and
+        recorded as the page arrives. Items missing from the per-item cache are
+        not added to it: a deep history would fill it with items seen once and
+        push out the recent ones that rescans hit.
+        """
+        section_name, extract = PAGED_SECTIONS.get(platform, (None, None))
+        if section_name is None:
+            return self.analyze_platform_data(platform, dict(sections), ledger)
+        
+        with metrics.timer('argus_analysis_seconds', platform=platform, depth='history'):
+            head = {}
+            aggregate = FeatureAggregate(self.matcher, self.lexicon_version)
+            extract_features = functools.partial(self.item_features, cache=False)
+            pages = 0
+            items = 0
+            
+            for section, response in sections:
+                if section != section_name:
+                    head[section] = response
+                    continue
+                
+                pages += 1
+                if ledger is None:
+                    for item_id, text in extract(response):
+                        items += 1
+                        aggregate.add(extract_features(text))
+                else:
+                    for features in ledger.features_for_items(section_name, extract(response),
+                                                              extract_features, self.lexicon_version):
+                        items += 1
+                        aggregate.add(features)
+            
+            content_analysis = None
+            if aggregate.count:
+                content_analysis = self.score_features(aggregate.features(), platform)
+                content_analysis['item_count'] = aggregate.count
+            
+            analysis_results = getattr(self, f'{platform}_result')(head, content_analysis)
+            analysis_results['history'] = {'pages': pages, 'items': items}
+            return analysis_results
+    
+    def analyze_shared(self, platform: str, username: str, collect: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """Collect and analyze a handle, sharing one run with concurrent requests for the same handle
+        
+        Only for analyses without an item ledger: a ledger records items
+        against one platform config, so those analyses cannot be shared.
+        """
+        return self.flights.do((self.lexicon_version, platform, username),
+                               lambda: self.analyze_platform_data(platform, collect()))
 
 # Global analyzer instance
 analyzer = AIAnalyzer()
@@ -0,0 +1,224 @@
+"""
+Blob Store Service for Argus Digital Sentinel
+Keeps scan payloads compressed and deduplicated, keyed by their SHA-256
+"""
+
+import hashlib
+import json
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # zstd is optional; zlib is always available
+    zstandard = None
+
+from ..models.user import db
+from ..models.scan import DigitalFootprintScan, RawBlob
+
+# Legacy inline payloads moved into the store per compaction batch
+COMPACTION_BATCH_SIZE = 500
+
+
+class BlobStore:
+    """Content-addressed payload store backed by the raw_blobs table
+
+    Payloads are serialized as canonical JSON, hashed and compressed. Writing
+    the same payload twice stores it once; scans keep only the hash. Blobs are
+    written in the caller's session, so a blob and the scan that references it
+    commit together. Garbage collection leaves blobs written within the last
+    ``gc_grace_minutes`` alone, since a scan that has just been pointed at one
+    may not have committed yet.
+    """
+
+    def __init__(self, codec: str = 'auto', level: Optional[int] = None,
+                 retention_days: int = 90, maintenance_hours: float = 24, vacuum: bool = False,
+                 gc_grace_minutes: float = 60):
+        self.codec = self._resolve_codec(codec)
+        self.level = level
+        self.retention_days = retention_days
+        self.maintenance_hours = maintenance_hours
+        self.vacuum = vacuum
+        self.gc_grace_minutes = gc_grace_minutes
+        self.app = None
+        self._thread = None
+
+    @staticmethod
+    def _resolve_codec(codec: str) -> str:
+        if codec == 'auto':
+            return 'zstd' if zstandard else 'zlib'
+        if codec == 'zstd' and zstandard is None:
+            print("Warning: zstandard not installed. Compressing blobs with zlib.")
+            return 'zlib'
+        return codec
+
+    def init_app(self, app):
+        """Apply app config and start the periodic retention and compaction job"""
+        self.app = app
+        self.codec = self._resolve_codec(app.config.get('BLOB_CODEC', self.codec))
+        self.retention_days = app.config.get('BLOB_RETENTION_DAYS', self.retention_days)
+        self.maintenance_hours = app.config.get('BLOB_MAINTENANCE_HOURS', self.maintenance_hours)
+        self.vacuum = app.config.get('BLOB_VACUUM', self.vacuum)
+        self.gc_grace_minutes = app.config.get('BLOB_GC_GRACE_MINUTES', self.gc_grace_minutes)
+
+        if self.maintenance_hours > 0:
+            self._thread = threading.Thread(target=self._run, name='argus-blob-maintenance', daemon=True)
+            self._thread.start()
+
+    @staticmethod
+    def canonical_json(data: Any) -> bytes:
+        """Serialization whose hash is stable for equal payloads"""
+        return json.dumps(data, sort_keys=True, separators=(',', ':')).encode('utf-8')
+
+    def compress(self, payload: bytes) -> bytes:
+        if self.codec == 'zstd':
+            return zstandard.ZstdCompressor(level=self.level or 3).compress(payload)
+        return zlib.compress(payload, self.level or 6)
+
+    @staticmethod
+    def decompress(codec: str, data: bytes) -> bytes:
+        if codec == 'zstd':
+            if zstandard is None:
+                raise RuntimeError('Blob is zstd-compressed but zstandard is not installed')
+            return zstandard.ZstdDecompressor().decompress(data)
+        return zlib.decompress(data)
+
+    def put(self, data: Any) -> str:
+        """Add a payload to the current session and return its hash"""
+        payload = self.canonical_json(data)
+        digest = hashlib.sha256(payload).hexdigest()
+
+        values = {
+            'sha256': digest,
+            'codec': self.codec,
+            'size': len(payload),
+            'data': self.compress(payload),
+            'created_date': datetime.utcnow()
+        }
+
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            # Concurrent writers of the same payload must not collide on the key. Rewriting an
+            # existing payload refreshes its timestamp, so garbage collection spares it until
+            # the new reference has had time to commit
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            statement = insert(RawBlob).values(**values)
+            db.session.execute(statement.on_conflict_do_update(
+                index_elements=['sha256'],
+                set_={'created_date': statement.excluded.created_date}
+            ))
+        else:
+            blob = db.session.get(RawBlob, digest)
+            if blob is None:
+                db.session.add(RawBlob(**values))
+            else:
+                blob.created_date = values['created_date']
+
+        return digest
+
+    def get(self, digest: str) -> Optional[Any]:
+        """Decode a stored payload, or None if it has been removed"""
+        blob = RawBlob.query.with_entities(RawBlob.codec, RawBlob.data).filter_by(sha256=digest).first()
+        if blob is None:
+            return None
+        return json.loads(self.decompress(blob.codec, blob.data))
+
+    def stats(self) -> Dict[str, Any]:
+        """Blob count, stored and uncompressed sizes, and scan references"""
+        count, size, stored = db.session.query(
+            db.func.count(RawBlob.sha256),
+            db.func.coalesce(db.func.sum(RawBlob.size), 0),
+            db.func.coalesce(db.func.sum(db.func.length(RawBlob.data)), 0)
+        ).one()
+        references = DigitalFootprintScan.query.filter(DigitalFootprintScan.raw_data_hash.isnot(None)).count()
+
+        return {
+            'blobs': count,
+            'references': references,
+            'uncompressed_bytes': int(size),
+            'stored_bytes': int(stored),
+            'compression_ratio': round(size / stored, 2) if stored else 0.0,
+            'codec': self.codec
+        }
+
+    def apply_retention(self, retention_days: Optional[int] = None) -> int:
+        """Drop payload references from scans older than the retention window"""
+        retention_days = self.retention_days if retention_days is None else retention_days
+        if not retention_days or retention_days <= 0:
+            return 0
+
+        cutoff = datetime.utcnow() - timedelta(days=retention_days)
+        expired = DigitalFootprintScan.query.filter(
+            DigitalFootprintScan.scan_date < cutoff,
+            db.or_(DigitalFootprintScan.raw_data_hash.isnot(None), DigitalFootprintScan.raw_data.isnot(None))
+        ).update({'raw_data_hash': None, 'raw_data': None}, synchronize_session=False)
+        db.session.commit()
+        return expired
+
+    def compact_legacy_rows(self, batch_size: int = COMPACTION_BATCH_SIZE) -> int:
+        """Move payloads still stored inline on scan rows into the store"""
+        moved = 0
+        while True:
+            rows = DigitalFootprintScan.query.with_entities(DigitalFootprintScan.id, DigitalFootprintScan.raw_data)\
+                                             .filter(DigitalFootprintScan.raw_data.isnot(None))\
+                                             .order_by(DigitalFootprintScan.id).limit(batch_size).all()
+            if not rows:
+                return moved
+
+            for scan_id, raw_data in rows:
+                digest = self.put(json.loads(raw_data))
+                DigitalFootprintScan.query.filter_by(id=scan_id)\
+                                          .update({'raw_data_hash': digest, 'raw_data': None}, synchronize_session=False)
+            db.session.commit()
+            moved += len(rows)
+
+    def collect_garbage(self, grace_minutes: Optional[float] = None) -> int:
+        """Delete blobs no scan references any more, other than recently written ones"""
+        grace_minutes = self.gc_grace_minutes if grace_minutes is None else grace_minutes
+        cutoff = datetime.utcnow() - timedelta(minutes=grace_minutes)
+
+        referenced = db.session.query(DigitalFootprintScan.raw_data_hash)\
+                               .filter(DigitalFootprintScan.raw_data_hash.isnot(None))
+        removed = RawBlob.query.filter(~RawBlob.sha256.in_(referenced), RawBlob.created_date < cutoff)\
+                               .delete(synchronize_session=False)
+        db.session.commit()
+        return removed
+
+    def run_maintenance(self) -> Dict[str, Any]:
+        """Retention, legacy-row compaction and garbage collection in one pass"""
+        started = time.time()
+        result = {
+            'expired_scans': self.apply_retention(),
+            'compacted_scans': self.compact_legacy_rows(),
+            'removed_blobs': self.collect_garbage(),
+            'vacuumed': False
+        }
+
+        # SQLite only returns freed pages to the filesystem on VACUUM, which rewrites the whole
+        # file under an exclusive lock, so it is opt-in
+        changed = result['expired_scans'] or result['compacted_scans'] or result['removed_blobs']
+        if self.vacuum and changed and db.engine.dialect.name == 'sqlite':
+            with db.engine.connect() as connection:
+                connection.execution_options(isolation_level='AUTOCOMMIT').exec_driver_sql('VACUUM')
+            result['vacuumed'] = True
+
+        result['duration_seconds'] = round(time.time() - started, 3)
+        return result
+
+    def _run(self):
+        while True:
+            time.sleep(self.maintenance_hours * 3600)
+            try:
+                with self.app.app_context():
+                    self.run_maintenance()
+            except Exception as e:
+                print(f"Error running blob store maintenance: {str(e)}")
+
+# Global blob store instance
+blob_store = BlobStore()
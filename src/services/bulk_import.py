@@ -0,0 +1,82 @@
+"""
+Bulk Import Service for Argus Digital Sentinel
+Parses CSV and JSONL onboarding files into (user, platform, username) rows
+"""
+
+import csv
+import io
+import json
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+SUPPORTED_PLATFORMS = ('twitter', 'linkedin', 'youtube', 'tiktok', 'reddit')
+
+CSV_CONTENT_TYPES = ('text/csv', 'application/csv')
+JSONL_CONTENT_TYPES = ('application/x-ndjson', 'application/ndjson', 'application/jsonl',
+                       'application/x-jsonlines', 'application/json-lines')
+
+
+def detect_format(content_type: Optional[str], filename: Optional[str] = None) -> Optional[str]:
+    """'csv' or 'jsonl' from a content type or file extension"""
+    mimetype = (content_type or '').split(';', 1)[0].strip().lower()
+    if mimetype in CSV_CONTENT_TYPES:
+        return 'csv'
+    if mimetype in JSONL_CONTENT_TYPES:
+        return 'jsonl'
+
+    extension = (filename or '').rsplit('.', 1)[-1].lower()
+    if extension == 'csv':
+        return 'csv'
+    if extension in ('jsonl', 'ndjson'):
+        return 'jsonl'
+    return None
+
+
+def read_records(stream, fmt: str) -> Iterator[Tuple[int, Any]]:
+    """Yield (row number, raw record) pairs; unparseable JSONL lines yield a ValueError"""
+    text = io.TextIOWrapper(stream, encoding='utf-8-sig', newline='')
+
+    if fmt == 'csv':
+        # Row numbers count the header as line 1, like a spreadsheet
+        for row_number, record in enumerate(csv.DictReader(text), start=2):
+            yield row_number, record
+        return
+
+    for row_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row_number, json.loads(line)
+        except ValueError as e:
+            yield row_number, ValueError(f'Invalid JSON: {str(e)}')
+
+
+def normalize_record(record: Any) -> Dict[str, Any]:
+    """Validate one record into {'user_id', 'user', 'platform', 'username'}; raises ValueError
+
+    The account is named by ``user_id`` (a numeric id) or ``user`` (a username),
+    never guessed from the value, so all-digit usernames stay usernames.
+    """
+    if isinstance(record, ValueError):
+        raise record
+    if not isinstance(record, dict):
+        raise ValueError('Each row must be an object with user or user_id, platform and username')
+
+    user_id = str(record.get('user_id') or '').strip()
+    user = str(record.get('user') or '').strip()
+    platform = str(record.get('platform') or '').strip().lower()
+    username = str(record.get('username') or '').strip()
+
+    if user_id:
+        if not user_id.isdigit():
+            raise ValueError(f'user_id must be a number: {user_id}')
+        user = None
+    elif not user:
+        raise ValueError('Missing user')
+    if platform not in SUPPORTED_PLATFORMS:
+        raise ValueError(f'Unsupported platform: {platform or "(empty)"}')
+    if not username:
+        raise ValueError('Missing username')
+    if len(username) > 100:
+        raise ValueError('Username longer than 100 characters')
+
+    return {'user_id': int(user_id) if user_id else None, 'user': user, 'platform': platform, 'username': username}
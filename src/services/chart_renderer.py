@@ -0,0 +1,342 @@
+"""
+Chart Rendering Service for Argus Digital Sentinel
+Renders report charts off the request thread and caches them by content hash
+"""
+
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .metrics import metrics
+
+CHART_FORMATS = {'png': 'image/png', 'svg': 'image/svg+xml'}
+
+DEFAULT_DPI = 300
+PREVIEW_DPI = 72
+MIN_DPI = 36
+
+# Bump when a drawer's output changes so stale cached files are not served
+CHART_STYLE_VERSION = 1
+
+CACHE_FILE_PREFIX = 'chart_'
+
+# Pool workers start from a clean process: forking the multi-threaded app can copy a lock
+# another thread holds into the child, which then deadlocks on it
+DEFAULT_START_METHOD = 'forkserver' if 'forkserver' in multiprocessing.get_all_start_methods() else 'spawn'
+
+# matplotlib and seaborn load once per rendering process, never at app boot
+_plotting_lock = threading.Lock()
+_seaborn = None
+
+def load_plotting():
+    """Import seaborn (and matplotlib with it) and apply the report style once per process"""
+    global _seaborn
+    if _seaborn is None:
+        with _plotting_lock:
+            if _seaborn is None:
+                import matplotlib
+                import seaborn as sns
+
+                # Set up matplotlib for better rendering
+                matplotlib.style.use('seaborn-v0_8')
+                sns.set_palette("husl")
+                _seaborn = sns
+    return _seaborn
+
+
+def risk_trend_data(scan_history: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Completed scans in date order plus each platform's average, or None if there are none"""
+    points = []
+    for scan in scan_history:
+        if scan.get('completed_at'):
+            date = datetime.fromisoformat(scan['completed_at'].replace('Z', '+00:00'))
+            points.append((date, scan.get('risk_score', 0), scan.get('platform', 'unknown')))
+
+    if not points:
+        return None
+
+    points.sort(key=lambda point: point[0])
+
+    totals = {}
+    for _, risk_score, platform in points:
+        total, count = totals.get(platform, (0, 0))
+        totals[platform] = (total + risk_score, count + 1)
+    averages = sorted(((platform, total / count) for platform, (total, count) in sorted(totals.items())),
+                      key=lambda item: item[1], reverse=True)
+
+    return {
+        'dates': [date.isoformat() for date, _, _ in points],
+        'risk_scores': [risk_score for _, risk_score, _ in points],
+        'platforms': [platform for platform, _ in averages],
+        'platform_averages': [average for _, average in averages]
+    }
+
+
+def platform_distribution_data(platform_analyses: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Each platform's risk score, or None if there are no analyses"""
+    platforms = []
+    risk_scores = []
+
+    for analysis in platform_analyses:
+        platforms.append(analysis.get('platform', 'unknown').title())
+        risk_scores.append(analysis.get('risk_score', 0))
+
+    if not platforms:
+        return None
+    return {'platforms': platforms, 'risk_scores': risk_scores}
+
+
+def risk_factors_data(analysis_results: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """The ten most frequent risk factor types, or None if no analysis lists any"""
+    factor_counts = {}
+
+    for analysis in analysis_results:
+        for factor in analysis.get('factors', []):
+            # Extract the main factor type
+            factor_type = factor.split(':')[0].strip() if ':' in factor else factor
+            factor_counts[factor_type] = factor_counts.get(factor_type, 0) + 1
+
+    if not factor_counts:
+        return None
+
+    top_factors = sorted(factor_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+    return {'factors': [factor for factor, _ in top_factors], 'counts': [count for _, count in top_factors]}
+
+
+def draw_risk_trend(figure, data: Dict[str, Any]):
+    sns = load_plotting()
+    dates = [datetime.fromisoformat(date) for date in data['dates']]
+
+    # Plot overall trend
+    trend = figure.add_subplot(1, 2, 1)
+    trend.plot(dates, data['risk_scores'], marker='o', linewidth=2, markersize=6)
+    trend.set_title('Risk Score Trend Over Time', fontsize=14, fontweight='bold')
+    trend.set_xlabel('Date')
+    trend.set_ylabel('Risk Score')
+    trend.grid(True, alpha=0.3)
+    trend.tick_params(axis='x', labelrotation=45)
+
+    # Platform breakdown
+    breakdown = figure.add_subplot(1, 2, 2)
+    colors = sns.color_palette("husl", len(data['platforms']))
+    bars = breakdown.bar(data['platforms'], data['platform_averages'], color=colors)
+    breakdown.set_title('Average Risk Score by Platform', fontsize=14, fontweight='bold')
+    breakdown.set_xlabel('Platform')
+    breakdown.set_ylabel('Average Risk Score')
+    breakdown.tick_params(axis='x', labelrotation=45)
+
+    # Add value labels on bars
+    for bar in bars:
+        height = bar.get_height()
+        breakdown.text(bar.get_x() + bar.get_width()/2., height + 0.5,
+                       f'{height:.1f}', ha='center', va='bottom')
+
+    figure.tight_layout()
+
+
+def draw_platform_distribution(figure, data: Dict[str, Any]):
+    # Define colors for platforms
+    platform_colors = {
+        'Twitter': '#1DA1F2',
+        'Linkedin': '#0077B5',
+        'Youtube': '#FF0000',
+        'Tiktok': '#000000',
+        'Reddit': '#FF4500'
+    }
+    colors = [platform_colors.get(platform, '#888888') for platform in data['platforms']]
+
+    axes = figure.add_subplot()
+    wedges, texts, autotexts = axes.pie(data['risk_scores'], labels=data['platforms'], colors=colors,
+                                        autopct='%1.1f%%', startangle=90)
+    axes.set_title('Risk Distribution by Platform', fontsize=16, fontweight='bold', pad=20)
+
+    # Enhance text appearance
+    for autotext in autotexts:
+        autotext.set_color('white')
+        autotext.set_fontweight('bold')
+
+    axes.axis('equal')
+
+
+def draw_risk_factors(figure, data: Dict[str, Any]):
+    sns = load_plotting()
+    factors, counts = data['factors'], data['counts']
+    y_pos = range(len(factors))
+
+    axes = figure.add_subplot()
+    axes.barh(y_pos, counts, color=sns.color_palette("viridis", len(factors)))
+    axes.set_yticks(y_pos, factors)
+    axes.set_xlabel('Frequency')
+    axes.set_title('Most Common Risk Factors', fontsize=16, fontweight='bold')
+    axes.grid(axis='x', alpha=0.3)
+
+    # Add value labels
+    for i, count in enumerate(counts):
+        axes.text(count + 0.1, i, str(count), va='center')
+
+    figure.tight_layout()
+
+
+# kind -> (figure size, drawer)
+CHART_KINDS: Dict[str, Tuple[Tuple[int, int], Callable]] = {
+    'risk_trend': ((12, 6), draw_risk_trend),
+    'platform_distribution': ((10, 8), draw_platform_distribution),
+    'risk_factors': ((12, 8), draw_risk_factors)
+}
+
+
+def render_chart(kind: str, data: Dict[str, Any], fmt: str = 'png', dpi: int = DEFAULT_DPI) -> bytes:
+    """Draw one chart on its own Figure and return the encoded image
+
+    Uses the object-oriented API only, so no pyplot global state is shared
+    between renders. Runs inside the pool's worker processes.
+    """
+    load_plotting()
+    from matplotlib.figure import Figure
+
+    figsize, draw = CHART_KINDS[kind]
+    figure = Figure(figsize=figsize)
+    draw(figure, data)
+
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format=fmt, dpi=dpi, bbox_inches='tight')
+    return buffer.getvalue()
+
+
+class ChartRenderer:
+    """Process-pool chart renderer with an on-disk cache keyed by input hash
+
+    Identical chart data, format and resolution map to the same file, so a
+    repeat render is a file lookup. Concurrent requests for a chart that is
+    still rendering wait on the same job rather than starting another.
+    """
+
+    def __init__(self, cache_dir: str, workers: int = 2, timeout: float = 60,
+                 max_cached: int = 500, start_method: str = DEFAULT_START_METHOD):
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.timeout = timeout
+        self.max_cached = max_cached
+        self.start_method = start_method
+
+        self._executor = None
+        self._inflight: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def cache_key(kind: str, data: Dict[str, Any], fmt: str, dpi: int) -> str:
+        payload = json.dumps({'kind': kind, 'data': data, 'format': fmt, 'dpi': dpi,
+                              'version': CHART_STYLE_VERSION}, sort_keys=True, separators=(',', ':'))
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def resolve_options(fmt: Optional[str] = None, dpi: Optional[int] = None,
+                        preview: bool = False) -> Tuple[str, int]:
+        """Validate the output format and pick the resolution; raises ValueError"""
+        fmt = (fmt or 'png').lower()
+        if fmt not in CHART_FORMATS:
+            raise ValueError(f"Unsupported chart format; choose from {', '.join(CHART_FORMATS)}")
+        if preview:
+            return fmt, PREVIEW_DPI
+        return fmt, min(DEFAULT_DPI, max(MIN_DPI, int(dpi or DEFAULT_DPI)))
+
+    def render(self, kind: str, data: Dict[str, Any], fmt: str = 'png', dpi: int = DEFAULT_DPI) -> Tuple[str, bool]:
+        """Path of the rendered chart and whether it came from the cache"""
+        key = self.cache_key(kind, data, fmt, dpi)
+        path = os.path.join(self.cache_dir, f'{CACHE_FILE_PREFIX}{kind}_{key[:24]}.{fmt}')
+
+        if os.path.exists(path):
+            # Touch so pruning drops the least recently served charts first
+            os.utime(path)
+            metrics.inc('argus_chart_cache_total', result='hit')
+            return path, True
+
+        metrics.inc('argus_chart_cache_total', result='miss')
+        with metrics.timer('argus_chart_render_seconds', kind=kind):
+            image = self._render(key, kind, data, fmt, dpi)
+
+        if not os.path.exists(path):
+            # Write then rename so a concurrent reader never sees a partial file
+            temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(image)
+            os.replace(temp_path, path)
+            self.prune()
+
+        return path, False
+
+    def _render(self, key: str, kind: str, data: Dict[str, Any], fmt: str, dpi: int) -> bytes:
+        if self.workers <= 0:
+            return render_chart(kind, data, fmt, dpi)
+
+        with self._lock:
+            future = self._inflight.get(key)
+            if future is None:
+                future = self._pool().submit(render_chart, kind, data, fmt, dpi)
+                self._inflight[key] = future
+                future.add_done_callback(lambda done: self._finish(key, done))
+
+        try:
+            return future.result(timeout=self.timeout)
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed); start a fresh pool for the next render
+            with self._lock:
+                if self._executor is not None:
+                    self._executor.shutdown(wait=False, cancel_futures=True)
+                    self._executor = None
+            raise
+
+    def _finish(self, key: str, future: Future):
+        with self._lock:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    def _pool(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context(self.start_method),
+                initializer=load_plotting
+            )
+        return self._executor
+
+    def prune(self) -> int:
+        """Remove the least recently used cached charts beyond ``max_cached``"""
+        if self.max_cached <= 0:
+            return 0
+
+        cached = []
+        for entry in self._cached_files():
+            try:
+                cached.append((entry.stat().st_mtime, entry.path))
+            except FileNotFoundError:
+                continue
+
+        removed = 0
+        if len(cached) > self.max_cached:
+            cached.sort()
+            for _, path in cached[:len(cached) - self.max_cached]:
+                try:
+                    os.remove(path)
+                    removed += 1
+                except FileNotFoundError:
+                    continue
+        return removed
+
+    def _cached_files(self):
+        for entry in os.scandir(self.cache_dir):
+            if entry.name.startswith(CACHE_FILE_PREFIX) and not entry.name.endswith('.tmp'):
+                yield entry
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            inflight = len(self._inflight)
+        cached = sum(1 for _ in self._cached_files())
+        return {'cached_charts': cached, 'rendering': inflight, 'workers': self.workers}
@@ -1,28 +1,49 @@
 """
 Data Collection Service for Argus Digital Sentinel
-Handles data collection from various social media platforms using Manus APIs
+Handles data collection from various social media platforms through the platform API client
 """
 
-import sys
 import json
+import os
 import time
 from datetime import datetime
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional, Tuple
 
-# Add the API client path for Manus APIs
-sys.path.append('/opt/.manus/.sandbox-runtime')
+from .response_cache import response_cache
+from .platform_client import ResponseParser, platform_client, make_adapters
+from .platform_content import tweet_items
+from .rate_limiter import PlatformThrottled
+from .single_flight import SingleFlight
+
+# Most tweets, videos or posts a full-history scan reads per handle
+HISTORY_MAX_ITEMS = int(os.environ.get('ARGUS_HISTORY_MAX_ITEMS', 20000))
 
 class DataCollector:
     """Handles data collection from various social media platforms"""
     
     def __init__(self):
-        try:
-            from data_api import ApiClient
-            self.client = ApiClient()
-            self.api_available = True
-        except ImportError:
-            print("Warning: Manus API client not available. Using mock data.")
-            self.api_available = False
+        self.cache = response_cache
+        self.client = platform_client
+        self.api_available = self.client.available
+        if not self.api_available:
+            print("Warning: No platform API URL configured (ARGUS_API_BASE_URL). Using mock data.")
+        
+        # Adapters call through the response cache, which holds only what analysis reads
+        self.adapters = make_adapters(self._call_api, compact=True)
+        # Scans always fetch fresh data, so theirs call the pooled client directly,
+        # and keep full responses for the stored raw data
+        self.scan_adapters = make_adapters(self.client.call_api)
+        
+        # Concurrent requests for the same handle share one collection
+        self.flights = SingleFlight('collect')
+    
+    def _call_api(self, endpoint: str, query: Dict[str, Any], parse: Optional[ResponseParser] = None) -> Any:
+        """Call a platform endpoint, serving repeat calls from the response cache"""
+        return self.cache.get_or_fetch(endpoint, query, lambda: self._fetch(endpoint, query, parse))
+    
+    def _fetch(self, endpoint: str, query: Dict[str, Any], parse: Optional[ResponseParser] = None) -> Any:
+        """Call the upstream API over the pooled client"""
+        return self.client.call_api(endpoint, query=query, parse=parse)
     
     def collect_twitter_data(self, username: str) -> Dict[str, Any]:
         """Collect Twitter profile and tweets data"""
@@ -30,24 +51,11 @@ class DataCollector:
             return self._get_mock_twitter_data(username)
         
         try:
-            # Get Twitter profile
-            profile_result = self.client.call_api('Twitter/get_user_profile_by_username', 
-                                                query={'username': username})
-            
-            data = {'profile': profile_result}
-            
-            # Get user tweets if profile exists
-            if profile_result and 'result' in profile_result:
-                user_data = profile_result['result']['data']['user']['result']
-                user_id = user_data.get('rest_id')
-                
-                if user_id:
-                    tweets_result = self.client.call_api('Twitter/get_user_tweets',
-                                                       query={'user': user_id, 'count': '20'})
-                    data['tweets'] = tweets_result
-            
-            return data
+            return self.adapters['twitter'].collect(username)
             
+        except PlatformThrottled:
+            # Mock data in place of a throttled platform would read as a real, clean result
+            raise
         except Exception as e:
             print(f"Error collecting Twitter data: {str(e)}")
             return self._get_mock_twitter_data(username)
@@ -58,10 +66,10 @@ class DataCollector:
             return self._get_mock_linkedin_data(username)
         
         try:
-            profile_result = self.client.call_api('LinkedIn/get_user_profile_by_username',
-                                                query={'username': username})
-            return {'profile': profile_result}
+            return self.adapters['linkedin'].collect(username)
             
+        except PlatformThrottled:
+            raise
         except Exception as e:
             print(f"Error collecting LinkedIn data: {str(e)}")
             return self._get_mock_linkedin_data(username)
@@ -72,20 +80,10 @@ class DataCollector:
             return self._get_mock_youtube_data(username)
         
         try:
-            # Get channel details
-            channel_result = self.client.call_api('Youtube/get_channel_details',
-                                                query={'id': username, 'hl': 'en'})
-            
-            data = {'channel': channel_result}
-            
-            # Get channel videos if channel exists
-            if channel_result and 'channelId' in channel_result:
-                videos_result = self.client.call_api('Youtube/get_channel_videos',
-                                                   query={'id': channel_result['channelId'], 'filter': 'videos_latest'})
-                data['videos'] = videos_result
-            
-            return data
+            return self.adapters['youtube'].collect(username)
             
+        except PlatformThrottled:
+            raise
         except Exception as e:
             print(f"Error collecting YouTube data: {str(e)}")
             return self._get_mock_youtube_data(username)
@@ -96,10 +94,10 @@ class DataCollector:
             return self._get_mock_tiktok_data(username)
         
         try:
-            user_result = self.client.call_api('Tiktok/get_user_info',
-                                             query={'uniqueId': username})
-            return {'user': user_result}
+            return self.adapters['tiktok'].collect(username)
             
+        except PlatformThrottled:
+            raise
         except Exception as e:
             print(f"Error collecting TikTok data: {str(e)}")
             return self._get_mock_tiktok_data(username)
@@ -110,16 +108,40 @@ class DataCollector:
             return self._get_mock_reddit_data(username)
         
         try:
-            posts_result = self.client.call_api('Reddit/AccessAPI',
-                                              query={'subreddit': username, 'limit': '25'})
-            return {'posts': posts_result}
+            return self.adapters['reddit'].collect(username)
             
+        except PlatformThrottled:
+            raise
         except Exception as e:
             print(f"Error collecting Reddit data: {str(e)}")
             return self._get_mock_reddit_data(username)
     
     def collect_platform_data(self, platform: str, username: str) -> Dict[str, Any]:
         """Main entry point for platform data collection"""
+        return self.flights.do(('collect', platform, username),
+                               lambda: self._collect_platform_data(platform, username))
+    
+    def fetch_platform_data(self, platform: str, username: str) -> Dict[str, Any]:
+        """Fetch fresh platform data for a scan, bypassing the cache and mock data; raises on failure"""
+        adapter = self.scan_adapters.get(platform)
+        if adapter is None:
+            raise ValueError(f"Unsupported platform: {platform}")
+        
+        return self.flights.do(('fetch', platform, username), lambda: adapter.collect(username))
+    
+    def iter_platform_history(self, platform: str, username: str,
+                              max_items: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+        """A handle's full history as (section, response) pairs, one page at a time, for streaming analysis
+        
+        Like fetch_platform_data this bypasses the cache and mock data and raises on failure.
+        """
+        adapter = self.scan_adapters.get(platform)
+        if adapter is None:
+            raise ValueError(f"Unsupported platform: {platform}")
+        
+        return adapter.iter_history(username, max_items or HISTORY_MAX_ITEMS)
+    
+    def _collect_platform_data(self, platform: str, username: str) -> Dict[str, Any]:
         print(f"Collecting data for {platform}: {username}")
         
         if platform == 'twitter':
@@ -152,25 +174,7 @@ class DataCollector:
             
             # Extract tweet texts
             if 'tweets' in data:
-                tweets = data['tweets']
-                if 'result' in tweets and 'timeline' in tweets['result']:
-                    timeline = tweets['result']['timeline']
-                    instructions = timeline.get('instructions', [])
-                    
-                    for instruction in instructions:
-                        if instruction.get('type') == 'TimelineAddEntries':
-                            entries = instruction.get('entries', [])
-                            for entry in entries:
-                                if entry.get('entryId', '').startswith('tweet-'):
-                                    content = entry.get('content', {})
-                                    if 'itemContent' in content:
-                                        tweet_results = content['itemContent'].get('tweet_results', {})
-                                        if 'result' in tweet_results:
-                                            tweet_data = tweet_results['result']
-                                            legacy = tweet_data.get('legacy', {})
-                                            tweet_text = legacy.get('full_text', '')
-                                            if tweet_text:
-                                                texts.append(tweet_text)
+                texts.extend(text for _, text in tweet_items(data['tweets']))
         
         elif platform == 'linkedin':
             if 'profile' in data:
@@ -0,0 +1,95 @@
+"""
+Database Profile Service for Argus Digital Sentinel
+Chooses the database URI and tunes the engine for concurrent workers and readers
+"""
+
+import os
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+# SQLite pragmas for the production profile, applied to every new connection
+SQLITE_PRODUCTION_PRAGMAS = {
+    'journal_mode': 'WAL',  # readers no longer block on the writer
+    'synchronous': 'NORMAL',  # durable under WAL, without an fsync per commit
+    'busy_timeout': int(os.environ.get('ARGUS_SQLITE_BUSY_TIMEOUT_MS', 5000)),
+    'mmap_size': int(os.environ.get('ARGUS_SQLITE_MMAP_SIZE', 256 * 1024 * 1024)),
+    'cache_size': -int(os.environ.get('ARGUS_SQLITE_CACHE_KB', 64 * 1024)),  # negative means KiB
+    'temp_store': 'MEMORY'
+}
+
+
+def database_uri(default_sqlite_path: str) -> str:
+    """ARGUS_DATABASE_URL (e.g. a Postgres URI for multi-node deployments), else the local SQLite file"""
+    uri = os.environ.get('ARGUS_DATABASE_URL')
+    if uri:
+        # Some hosts still hand out the pre-SQLAlchemy-1.4 scheme
+        return uri.replace('postgres://', 'postgresql://', 1) if uri.startswith('postgres://') else uri
+    return f"sqlite:///{default_sqlite_path}"
+
+
+def engine_options(uri: str, profile: str) -> Dict[str, Any]:
+    """SQLAlchemy engine options for a URI under the given profile"""
+    url = make_url(uri)
+    if profile != 'production':
+        return {}
+
+    pool_size = int(os.environ.get('ARGUS_DB_POOL_SIZE', 10))
+    max_overflow = int(os.environ.get('ARGUS_DB_MAX_OVERFLOW', 10))
+    pool_timeout = float(os.environ.get('ARGUS_DB_POOL_TIMEOUT', 30))
+
+    if url.get_backend_name() == 'sqlite':
+        # In-memory databases live in a single connection that Flask-SQLAlchemy pins itself
+        if not url.database or url.database == ':memory:':
+            return {}
+        return {
+            'pool_size': pool_size,
+            'max_overflow': max_overflow,
+            'pool_timeout': pool_timeout,
+            'connect_args': {
+                'timeout': SQLITE_PRODUCTION_PRAGMAS['busy_timeout'] / 1000,
+                # Pooled connections are handed between request and worker threads
+                'check_same_thread': False
+            }
+        }
+
+    return {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_timeout': pool_timeout,
+        'pool_recycle': int(os.environ.get('ARGUS_DB_POOL_RECYCLE', 1800)),
+        'pool_pre_ping': True
+    }
+
+
+def configure_database(app, default_sqlite_path: str):
+    """Set the database URI and engine options before ``db.init_app``"""
+    profile = os.environ.get('ARGUS_DB_PROFILE', 'production')
+    uri = database_uri(default_sqlite_path)
+
+    app.config['DB_PROFILE'] = profile
+    app.config['SQLALCHEMY_DATABASE_URI'] = uri
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = engine_options(uri, profile)
+
+
+def install_sqlite_pragmas(app, db):
+    """Apply the production pragmas on each new SQLite connection (call after ``db.init_app``)"""
+    if app.config.get('DB_PROFILE') != 'production':
+        return
+
+    with app.app_context():
+        engine = db.engine
+
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in SQLITE_PRODUCTION_PRAGMAS.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
@@ -0,0 +1,38 @@
+"""
+HTTP Pool Service for Argus Digital Sentinel
+Connection pool adapter for the platform client's requests session, imported when the session opens
+"""
+
+from typing import Optional
+
+from requests.adapters import HTTPAdapter
+
+
+class _BoundedWaitPool:
+    """Connection pool mixin that waits at most ``pool_timeout`` seconds for a free connection"""
+
+    pool_timeout: Optional[float] = None
+
+    def urlopen(self, *args, **kwargs):
+        kwargs.setdefault('pool_timeout', self.pool_timeout)
+        return super().urlopen(*args, **kwargs)
+
+
+class BoundedPoolAdapter(HTTPAdapter):
+    """HTTPAdapter whose blocking pools raise EmptyPoolError after ``pool_timeout`` seconds
+
+    requests never passes a pool timeout, so with ``pool_block`` a caller
+    would otherwise wait for a connection indefinitely.
+    """
+
+    def __init__(self, pool_timeout: Optional[float] = None, **kwargs):
+        self.pool_timeout = pool_timeout
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            scheme: type(f'Bounded{pool_class.__name__}', (_BoundedWaitPool, pool_class),
+                         {'pool_timeout': self.pool_timeout})
+            for scheme, pool_class in self.poolmanager.pool_classes_by_scheme.items()
+        }
@@ -0,0 +1,139 @@
+"""
+Item Ledger Service for Argus Digital Sentinel
+Remembers which tweets, videos and posts a platform config has already analyzed
+"""
+
+import hashlib
+import json
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from ..models.user import db
+from ..models.scan import ScannedItem
+
+# Item ids per lookup query, well under SQLite's bound parameter limit
+LOOKUP_CHUNK_SIZE = 500
+
+
+class ItemLedger:
+    """Per-platform-config record of analyzed content items
+
+    Items are keyed by section and platform item id and carry a hash of their
+    text. A later scan reuses the stored features of an item whose text and
+    keyword lexicon are unchanged, and extracts and records the rest. Each
+    batch of items is looked up and written on its own, so only the items a
+    scan fetches are loaded, and scores cover only those items.
+    """
+
+    def __init__(self, platform_config_id: int):
+        self.platform_config_id = platform_config_id
+        self.new_items = 0
+        self.changed_items = 0
+        self.reused_items = 0
+        self._seen = 0
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        """SHA-256 of an item's text"""
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def features_for_items(self, section: str, items: Iterable[Tuple[Optional[str], str]],
+                           extract: Callable[[str], Dict[str, Any]], lexicon_version: str) -> List[Dict[str, Any]]:
+        """Features of a batch of (item_id, text) items, in order
+
+        Stored features are returned for unchanged items; new and changed items
+        are extracted and recorded.
+        """
+        batch: List[Tuple[str, str, str]] = []
+        for item_id, text in items:
+            content_hash = self.content_hash(text)
+            # Items without a platform id are identified by their content
+            batch.append((str(item_id) if item_id else content_hash, content_hash, text))
+
+        stored = self._load(section, {key for key, _, _ in batch})
+        rows: Dict[str, Dict[str, Any]] = {}
+        features_list = []
+
+        for key, content_hash, text in batch:
+            if key in rows:
+                features_list.append(rows[key]['features'])
+                continue
+
+            previous = stored.get(key)
+            if previous is not None and previous[0] == content_hash:
+                features = previous[1]
+                if features.get('lexicon_version') == lexicon_version:
+                    self.reused_items += 1
+                    self._seen += 1
+                    features_list.append(features)
+                    continue
+
+            features = extract(text)
+            if previous is None:
+                self.new_items += 1
+            else:
+                self.changed_items += 1
+            self._seen += 1
+
+            rows[key] = {'item_id': key, 'content_hash': content_hash, 'features': features}
+            features_list.append(features)
+
+        self._save(section, list(rows.values()))
+        return features_list
+
+    def stats(self) -> Dict[str, int]:
+        """How many items this scan analyzed versus reused"""
+        return {
+            'new_items': self.new_items,
+            'changed_items': self.changed_items,
+            'reused_items': self.reused_items,
+            'total_items': self._seen
+        }
+
+    def _load(self, section: str, keys: Iterable[str]) -> Dict[str, Tuple[str, Dict[str, Any]]]:
+        """Stored content hash and features of the given items, by item id"""
+        keys = list(keys)
+        stored = {}
+        for start in range(0, len(keys), LOOKUP_CHUNK_SIZE):
+            # Plain rows rather than model instances, so nothing accumulates in the session
+            rows = db.session.query(ScannedItem.item_id, ScannedItem.content_hash, ScannedItem.features)\
+                             .filter(ScannedItem.platform_config_id == self.platform_config_id,
+                                     ScannedItem.section == section,
+                                     ScannedItem.item_id.in_(keys[start:start + LOOKUP_CHUNK_SIZE]))
+            for item_id, content_hash, features in rows:
+                stored[item_id] = (content_hash, json.loads(features))
+        return stored
+
+    def _save(self, section: str, rows: List[Dict[str, Any]]):
+        if not rows:
+            return
+
+        for row in rows:
+            row.update(platform_config_id=self.platform_config_id, section=section,
+                       features=json.dumps(row['features']))
+
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+
+            # Upserts, so concurrent scans of the same config recording the same item both succeed
+            statement = insert(ScannedItem)
+            db.session.execute(statement.on_conflict_do_update(
+                index_elements=['platform_config_id', 'section', 'item_id'],
+                set_={
+                    'content_hash': statement.excluded.content_hash,
+                    'features': statement.excluded.features
+                }
+            ), rows)
+            return
+
+        for row in rows:
+            item = ScannedItem.query.filter_by(platform_config_id=self.platform_config_id, section=section,
+                                               item_id=row['item_id']).with_for_update().first()
+            if item is None:
+                db.session.add(ScannedItem(**row))
+            else:
+                item.content_hash = row['content_hash']
+                item.features = row['features']
@@ -0,0 +1,86 @@
+"""
+Keyword Matching Service for Argus Digital Sentinel
+Finds every lexicon keyword in a text with one compiled scan
+"""
+
+import hashlib
+import re
+from typing import Any, Dict, Iterable, List, Set, Tuple
+
+
+class KeywordMatcher:
+    """Single-pass multi-pattern matcher over a fixed keyword lexicon
+
+    Hits follow the same substring semantics as ``word in text``, so keywords
+    that overlap or sit inside longer keywords (``professional`` inside
+    ``unprofessional``) are all reported.
+    """
+
+    def __init__(self, keywords: Iterable[str]):
+        self.keywords = sorted(set(word for word in keywords if word))
+        # Identifies this lexicon; results computed under another version are stale
+        self.version = hashlib.sha256('\n'.join(self.keywords).encode('utf-8')).hexdigest()[:16]
+        self.pattern = re.compile(self._build_trie_pattern(self.keywords)) if self.keywords else None
+
+        # Keywords with a space can also span two texts joined by one: (part before it, part after it, keyword)
+        self.splits: List[Tuple[str, str, str]] = [
+            (word[:index], word[index + 1:], word)
+            for word in self.keywords
+            for index, char in enumerate(word) if char == ' '
+        ]
+        self.split_heads = tuple(sorted({before for before, _, _ in self.splits}))
+        # Characters of each text's ends that find_across needs
+        self.edge_length = max((len(word) - 1 for _, _, word in self.splits), default=0)
+
+        # A hit on a keyword implies a hit on every keyword it contains
+        self.implied: Dict[str, Set[str]] = {
+            word: {other for other in self.keywords if other in word}
+            for word in self.keywords
+        }
+
+    @staticmethod
+    def _build_trie_pattern(keywords) -> str:
+        """Build a prefix-trie regex whose match at any position is the longest keyword starting there"""
+        trie: Dict[str, Any] = {}
+        for word in keywords:
+            node = trie
+            for char in word:
+                node = node.setdefault(char, {})
+            node[''] = {}
+
+        def build(node: Dict[str, Any]) -> str:
+            branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+            if not branches:
+                return ''
+            body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+            # Optional groups are greedy, so longer keywords win over their prefixes
+            return f'(?:{body})?' if '' in node else body
+
+        return build(trie)
+
+    def find(self, text_lower: str) -> Set[str]:
+        """Return the set of keywords occurring anywhere in already-lowercased text"""
+        found: Set[str] = set()
+        if self.pattern is None or not text_lower:
+            return found
+
+        search = self.pattern.search
+        match = search(text_lower)
+        while match:
+            found |= self.implied[match.group()]
+            # Resume one character on so keywords overlapping this hit are still seen
+            match = search(text_lower, match.start() + 1)
+
+        return found
+
+    def find_across(self, left_lower: str, right_lower: str) -> Set[str]:
+        """Keywords of ``left + ' ' + right`` that span the space, given the texts' last and first
+        ``edge_length`` characters"""
+        found: Set[str] = set()
+        if not left_lower.endswith(self.split_heads):
+            return found
+
+        for before, after, word in self.splits:
+            if left_lower.endswith(before) and right_lower.startswith(after):
+                found |= self.implied[word]
+        return found
@@ -0,0 +1,249 @@
+"""
+Metrics Service for Argus Digital Sentinel
+Lightweight timers, counters and histograms exported in Prometheus text format
+"""
+
+import functools
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+# Histogram bucket upper bounds in seconds
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Recent observations kept per series for percentile reporting
+RECENT_SAMPLES = 1024
+
+DESCRIPTIONS = {
+    'argus_platform_api_seconds': 'Upstream platform API call latency',
+    'argus_analysis_seconds': 'Platform data analysis latency',
+    'argus_db_commit_seconds': 'Database session commit latency',
+    'argus_report_seconds': 'Report and chart generation latency',
+    'argus_failures_total': 'Timed operations that raised an exception',
+    'argus_platform_api_retries_total': 'Platform API calls retried after a throttled, unavailable or failed attempt',
+    'argus_platform_api_throttled_total': 'Platform API calls refused locally by the rate limiter or an open circuit',
+    'argus_platform_circuit_transitions_total': 'Platform circuit breaker state changes',
+    'argus_single_flight_total': 'Coalesced calls by group, as the caller that ran it (leader) or one that shared it'
+}
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+class _NullTimer:
+    """Shared do-nothing context manager used while metrics are disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    def __init__(self, registry: 'Metrics', name: str, labels: LabelKey):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        self.registry._observe(self.name, self.labels, time.perf_counter() - self.started)
+        if exc_type is not None:
+            self.registry._increment('argus_failures_total', (('operation', self.name),) + self.labels, 1)
+        return False
+
+
+class _Histogram:
+    def __init__(self, buckets: Tuple[float, ...]):
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+        self.recent: Deque[float] = deque(maxlen=RECENT_SAMPLES)
+
+    def recent_percentile(self, fraction: float) -> Optional[float]:
+        if not self.recent:
+            return None
+        samples = sorted(self.recent)
+        return samples[min(len(samples) - 1, int(fraction * len(samples)))]
+
+
+class Metrics:
+    """Thread-safe in-process metrics registry
+
+    When disabled, ``timer`` hands back a shared no-op context manager and
+    ``timed`` returns the decorated function untouched, so instrumented code
+    pays nothing beyond an attribute check.
+    """
+
+    def __init__(self, enabled: bool = True, buckets: Tuple[float, ...] = DEFAULT_BUCKETS):
+        self.enabled = enabled
+        self.buckets = tuple(sorted(buckets))
+        self._histograms: Dict[str, Dict[LabelKey, _Histogram]] = {}
+        self._counters: Dict[str, Dict[LabelKey, float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _label_key(labels: Dict[str, Any]) -> LabelKey:
+        return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+    def timer(self, name: str, **labels):
+        """Context manager recording the duration of its block into a histogram"""
+        if not self.enabled:
+            return NULL_TIMER
+        return _Timer(self, name, self._label_key(labels))
+
+    def timed(self, name: str, **labels) -> Callable:
+        """Decorator form of ``timer``; a no-op when metrics are disabled at import time"""
+        def decorator(func):
+            if not self.enabled:
+                return func
+
+            label_key = self._label_key(labels)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with _Timer(self, name, label_key):
+                    return func(*args, **kwargs)
+
+            return wrapper
+        return decorator
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        """Increment a counter"""
+        if self.enabled:
+            self._increment(name, self._label_key(labels), amount)
+
+    def observe(self, name: str, seconds: float, **labels):
+        """Record one observation into a histogram"""
+        if self.enabled:
+            self._observe(name, self._label_key(labels), seconds)
+
+    def instrument_db(self, db):
+        """Time every commit made through a Flask-SQLAlchemy session"""
+        if not self.enabled:
+            return
+
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        def before_commit(session):
+            session.info['argus_commit_started'] = time.perf_counter()
+
+        def after_commit(session):
+            started = session.info.pop('argus_commit_started', None)
+            if started is not None:
+                self._observe('argus_db_commit_seconds', (), time.perf_counter() - started)
+
+        def after_rollback(session):
+            if session.info.pop('argus_commit_started', None) is not None:
+                self._increment('argus_failures_total', (('operation', 'argus_db_commit_seconds'),), 1)
+
+        event.listen(Session, 'before_commit', before_commit)
+        event.listen(Session, 'after_commit', after_commit)
+        event.listen(Session, 'after_rollback', after_rollback)
+
+    def percentile(self, name: str, fraction: float, **labels) -> Optional[float]:
+        """Percentile in seconds over recent observations of one series"""
+        with self._lock:
+            histogram = self._histograms.get(name, {}).get(self._label_key(labels))
+            return histogram.recent_percentile(fraction) if histogram else None
+
+    def summary(self, fraction: float = 0.99) -> Dict[str, Dict[str, float]]:
+        """Recent percentile in milliseconds for every histogram series"""
+        result: Dict[str, Dict[str, float]] = {}
+        with self._lock:
+            for name, series in self._histograms.items():
+                for labels, histogram in series.items():
+                    value = histogram.recent_percentile(fraction)
+                    if value is None:
+                        continue
+                    label_text = ','.join(f'{key}={label}' for key, label in labels) or 'all'
+                    result.setdefault(name, {})[label_text] = round(value * 1000, 3)
+        return result
+
+    def render(self, gauges: Optional[Dict[str, Tuple[str, Any]]] = None) -> str:
+        """Prometheus text exposition of every series, plus point-in-time gauges
+
+        A gauge's value is a number, or a list of ``(labels, number)`` pairs
+        for a labelled series.
+        """
+        lines: List[str] = []
+
+        with self._lock:
+            for name in sorted(self._histograms):
+                self._header(lines, name, 'histogram')
+                for labels, histogram in sorted(self._histograms[name].items()):
+                    cumulative = 0
+                    for bound, count in zip(self.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{self._format_labels(labels + (('le', repr(bound)),))} {cumulative}")
+                    lines.append(f"{name}_bucket{self._format_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{name}_sum{self._format_labels(labels)} {histogram.total}")
+                    lines.append(f"{name}_count{self._format_labels(labels)} {histogram.count}")
+
+            for name in sorted(self._counters):
+                self._header(lines, name, 'counter')
+                for labels, value in sorted(self._counters[name].items()):
+                    lines.append(f"{name}{self._format_labels(labels)} {value}")
+
+        for name, (description, value) in sorted((gauges or {}).items()):
+            lines.append(f"# HELP {name} {description}")
+            lines.append(f"# TYPE {name} gauge")
+            if isinstance(value, list):
+                for labels, sample in value:
+                    lines.append(f"{name}{self._format_labels(self._label_key(labels))} {sample}")
+            else:
+                lines.append(f"{name} {value}")
+
+        return '\n'.join(lines) + '\n'
+
+    def reset(self):
+        """Forget every recorded series"""
+        with self._lock:
+            self._histograms.clear()
+            self._counters.clear()
+
+    def _observe(self, name: str, labels: LabelKey, seconds: float):
+        with self._lock:
+            histogram = self._histograms.setdefault(name, {}).get(labels)
+            if histogram is None:
+                histogram = self._histograms[name][labels] = _Histogram(self.buckets)
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    histogram.counts[index] += 1
+                    break
+            histogram.total += seconds
+            histogram.count += 1
+            histogram.recent.append(seconds)
+
+    def _increment(self, name: str, labels: LabelKey, amount: float):
+        with self._lock:
+            series = self._counters.setdefault(name, {})
+            series[labels] = series.get(labels, 0) + amount
+
+    @staticmethod
+    def _header(lines: List[str], name: str, kind: str):
+        if name in DESCRIPTIONS:
+            lines.append(f"# HELP {name} {DESCRIPTIONS[name]}")
+        lines.append(f"# TYPE {name} {kind}")
+
+    @staticmethod
+    def _format_labels(labels: LabelKey) -> str:
+        if not labels:
+            return ''
+        escaped = (
+            (key, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for key, value in labels
+        )
+        return '{' + ','.join(f'{key}="{value}"' for key, value in escaped) + '}'
+
+# Global metrics instance
+metrics = Metrics(enabled=os.environ.get('ARGUS_METRICS_ENABLED', '1') == '1')
@@ -0,0 +1,197 @@
+"""
+Schema Migration Service for Argus Digital Sentinel
+Brings existing databases up to the current models with numbered, recorded steps
+"""
+
+from datetime import datetime
+from typing import Callable, List, NamedTuple, Sequence
+
+import sqlalchemy as sa
+
+from ..models.user import db
+from .risk_rollup import risk_rollups
+from .risk_summary import risk_summaries
+
+
+class Migration(NamedTuple):
+    version: int
+    description: str
+    upgrade: Callable[[sa.engine.Connection], None]
+
+
+def has_column(connection, table: str, column: str) -> bool:
+    inspector = sa.inspect(connection)
+    return inspector.has_table(table) and any(
+        existing['name'] == column for existing in inspector.get_columns(table)
+    )
+
+
+def add_column(connection, table: str, column: sa.Column):
+    """ALTER TABLE ... ADD COLUMN unless the column already exists"""
+    if has_column(connection, table, column.name):
+        return
+    quote = connection.dialect.identifier_preparer.quote
+    column_type = column.type.compile(dialect=connection.dialect)
+    connection.exec_driver_sql(f'ALTER TABLE {quote(table)} ADD COLUMN {quote(column.name)} {column_type}')
+
+
+def create_index(connection, name: str, table: str, columns: Sequence[str]):
+    quote = connection.dialect.identifier_preparer.quote
+    column_list = ', '.join(quote(column) for column in columns)
+    connection.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS {quote(name)} ON {quote(table)} ({column_list})')
+
+
+def add_user_profile_columns(connection):
+    for column in (
+        sa.Column('full_name', sa.String(200)),
+        sa.Column('created_date', sa.DateTime),
+        sa.Column('last_login', sa.DateTime),
+        sa.Column('notification_preferences', sa.Text)
+    ):
+        add_column(connection, 'user', column)
+
+
+def add_scan_raw_data_hash(connection):
+    add_column(connection, 'digital_footprint_scans', sa.Column('raw_data_hash', sa.String(64)))
+    create_index(connection, 'ix_digital_footprint_scans_raw_data_hash', 'digital_footprint_scans', ['raw_data_hash'])
+
+
+def add_access_path_indexes(connection):
+    create_index(connection, 'ix_digital_footprint_scans_user_scan_date', 'digital_footprint_scans',
+                 ['user_id', 'scan_date', 'id'])
+    create_index(connection, 'ix_platform_configs_user_platform', 'platform_configs', ['user_id', 'platform'])
+    create_index(connection, 'ix_risk_alerts_scan_id', 'risk_alerts', ['scan_id'])
+
+
+def add_risk_alert_user_id(connection):
+    add_column(connection, 'risk_alerts', sa.Column('user_id', sa.Integer))
+    connection.exec_driver_sql(
+        'UPDATE risk_alerts SET user_id = ('
+        'SELECT digital_footprint_scans.user_id FROM digital_footprint_scans '
+        'WHERE digital_footprint_scans.id = risk_alerts.scan_id'
+        ') WHERE user_id IS NULL'
+    )
+    create_index(connection, 'ix_risk_alerts_user_created', 'risk_alerts', ['user_id', 'created_date'])
+    create_index(connection, 'ix_risk_alerts_user_acknowledged_created', 'risk_alerts',
+                 ['user_id', 'acknowledged', 'created_date'])
+
+
+def backfill_risk_rollups(connection):
+    # create_all has already made the table; fill it from the scans completed so far
+    risk_rollups.rebuild(connection)
+
+
+def backfill_risk_summaries(connection):
+    risk_summaries.rebuild(connection)
+
+
+def add_scan_depth(connection):
+    add_column(connection, 'digital_footprint_scans', sa.Column('depth', sa.String(10)))
+
+
+def add_scan_claims(connection):
+    add_column(connection, 'digital_footprint_scans', sa.Column('claimed_by', sa.String(100)))
+    add_column(connection, 'digital_footprint_scans', sa.Column('heartbeat_at', sa.DateTime))
+
+
+def add_platform_config_next_run(connection):
+    add_column(connection, 'platform_configs', sa.Column('next_run', sa.DateTime))
+
+
+def add_scan_completed_date(connection):
+    # Scans completed before this step keep falling back to scan_date
+    add_column(connection, 'digital_footprint_scans', sa.Column('completed_date', sa.DateTime))
+
+
+# Append new steps with the next version number; never renumber or edit applied ones
+MIGRATIONS: List[Migration] = [
+    Migration(1, 'Add user profile columns missing from early databases', add_user_profile_columns),
+    Migration(2, 'Add raw_data_hash to scans for the blob store', add_scan_raw_data_hash),
+    Migration(3, 'Index scan, platform and alert access paths', add_access_path_indexes),
+    Migration(4, 'Denormalize user_id onto risk alerts', add_risk_alert_user_id),
+    Migration(5, 'Backfill daily and weekly risk rollups from completed scans', backfill_risk_rollups),
+    Migration(6, 'Materialize per-user risk summaries', backfill_risk_summaries),
+    Migration(7, 'Add depth to scans for full-history scans', add_scan_depth),
+    Migration(8, 'Record which worker runs a scan and its heartbeat', add_scan_claims),
+    Migration(9, 'Add next_run to platform configs so one scheduler claims each rescan', add_platform_config_next_run),
+    Migration(10, 'Record when scans complete so trends bucket by completion time', add_scan_completed_date)
+]
+
+
+class Migrator:
+    """Applies pending migrations in version order, recording each in schema_migrations
+
+    Runs after ``db.create_all()``: fresh databases already match the models, so
+    every step checks what exists before changing it and is safe to re-run.
+    Each step holds a database-wide lock and re-checks whether it has been
+    recorded, so processes starting together apply it once.
+    """
+
+    # pg_advisory_xact_lock key shared by every Argus process
+    LOCK_KEY = 0x41524755
+
+    def __init__(self, migrations: List[Migration]):
+        self.migrations = sorted(migrations, key=lambda migration: migration.version)
+        self.table = sa.Table(
+            'schema_migrations', sa.MetaData(),
+            sa.Column('version', sa.Integer, primary_key=True),
+            sa.Column('description', sa.String(200), nullable=False),
+            sa.Column('applied_at', sa.DateTime, nullable=False)
+        )
+
+    def init_app(self, app):
+        with app.app_context():
+            self.upgrade()
+
+    def current_version(self) -> int:
+        with db.engine.connect() as connection:
+            if not sa.inspect(connection).has_table(self.table.name):
+                return 0
+            return connection.execute(sa.select(sa.func.max(self.table.c.version))).scalar() or 0
+
+    def lock(self, connection):
+        """Serialize schema changes across processes until the connection's transaction ends"""
+        dialect = connection.dialect.name
+        if dialect == 'sqlite':
+            # Take the write lock up front rather than at the first write
+            connection.exec_driver_sql('BEGIN IMMEDIATE')
+        elif dialect == 'postgresql':
+            connection.execute(sa.text('SELECT pg_advisory_xact_lock(:key)'), {'key': self.LOCK_KEY})
+
+    def upgrade(self) -> List[int]:
+        """Apply every migration not yet recorded, each in its own transaction"""
+        with db.engine.begin() as connection:
+            self.lock(connection)
+            self.table.create(connection, checkfirst=True)
+
+        with db.engine.connect() as connection:
+            applied = set(connection.execute(sa.select(self.table.c.version)).scalars())
+
+        newly_applied = []
+        for migration in self.migrations:
+            if migration.version in applied:
+                continue
+
+            with db.engine.begin() as connection:
+                self.lock(connection)
+                # Another process may have applied it while this one waited for the lock
+                recorded = connection.execute(
+                    sa.select(self.table.c.version).where(self.table.c.version == migration.version)
+                ).first()
+                if recorded is not None:
+                    continue
+
+                migration.upgrade(connection)
+                connection.execute(self.table.insert().values(
+                    version=migration.version,
+                    description=migration.description,
+                    applied_at=datetime.utcnow()
+                ))
+
+            print(f"Applied migration {migration.version}: {migration.description}")
+            newly_applied.append(migration.version)
+
+        return newly_applied
+
+# Global migrator instance
+migrator = Migrator(MIGRATIONS)
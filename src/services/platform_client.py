@@ -0,0 +1,397 @@
+"""
+Platform Client Service for Argus Digital Sentinel
+Pooled keep-alive HTTP client and per-platform adapters for the social media data APIs
+"""
+
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+
+from .metrics import metrics
+from .rate_limiter import RateLimiter, PlatformThrottled, backoff_delay, parse_retry_after, platform_of
+from .platform_content import post_cursor, timeline_cursor, tweet_items, twitter_user_id, video_cursor, video_items
+from .timeline_parser import compact_timeline
+
+PLATFORMS = ('twitter', 'linkedin', 'youtube', 'tiktok', 'reddit')
+
+# Responses worth retrying: throttled, or the provider is briefly unavailable
+THROTTLED_STATUS = 429
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# (endpoint, query, parse=None) -> parsed JSON response
+ApiCall = Callable[..., Any]
+# Raw response body (a binary file) -> parsed response
+ResponseParser = Callable[[Any], Any]
+
+# Items requested per page when walking a full history, where the endpoint takes a page size
+HISTORY_PAGE_SIZE = 100
+
+
+class PlatformClient:
+    """Calls ``<base url>/<Platform>/<endpoint>?<query>`` over a shared keep-alive session
+
+    Endpoint names and queries match the data API the collector was written
+    against (``Twitter/get_user_tweets``, ``Reddit/AccessAPI``, ...). One
+    ``requests.Session`` is shared by every thread, so connections (and their
+    TLS handshakes) are reused across scans; each host gets at most
+    ``max_connections_per_host`` sockets, and a call waits at most
+    ``pool_timeout`` seconds for one to free up. Responses are requested gzipped.
+
+    Every call first takes a token from the endpoint's bucket in ``limiter``.
+    Throttled (429) and unavailable (5xx) responses and transport errors are
+    retried up to ``max_retries`` times with jittered exponential backoff,
+    never sooner than the provider's Retry-After.
+    """
+
+    def __init__(self, base_url: Optional[str] = None, api_key: Optional[str] = None,
+                 platform_urls: Optional[Dict[str, str]] = None, max_connections_per_host: int = 10,
+                 max_hosts: int = 10, connect_timeout: float = 3.05, read_timeout: float = 20,
+                 block_when_exhausted: bool = True, pool_timeout: float = 10, limiter: Optional[RateLimiter] = None,
+                 max_retries: int = 3, backoff_base: float = 0.5, backoff_max: float = 30):
+        self.base_url = base_url.rstrip('/') if base_url else None
+        self.platform_urls = {platform: url.rstrip('/') for platform, url in (platform_urls or {}).items() if url}
+        self.timeout = (connect_timeout, read_timeout)
+        self.pool_timeout = pool_timeout
+        self.limiter = limiter or RateLimiter()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.api_key = api_key
+        self.max_connections_per_host = max_connections_per_host
+        self.max_hosts = max_hosts
+        self.block_when_exhausted = block_when_exhausted
+
+        # requests and urllib3 take tens of milliseconds to import, so the session
+        # is opened on the first call rather than when the app boots
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    @property
+    def session(self):
+        """The shared keep-alive session, opened on first use"""
+        if self._session is None:
+            with self._session_lock:
+                if self._session is None:
+                    self._session = self._open_session()
+        return self._session
+
+    def _open_session(self):
+        import requests
+        from .http_pool import BoundedPoolAdapter
+
+        session = requests.Session()
+        # Waiting for a free pooled connection beats opening an unbounded number of sockets
+        adapter = BoundedPoolAdapter(pool_timeout=self.pool_timeout, pool_connections=self.max_hosts,
+                                     pool_maxsize=self.max_connections_per_host, pool_block=self.block_when_exhausted,
+                                     max_retries=0)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update({
+            'Accept': 'application/json',
+            'Accept-Encoding': 'gzip, deflate',
+            'User-Agent': 'argus-digital-sentinel'
+        })
+        if self.api_key:
+            session.headers['Authorization'] = f'Bearer {self.api_key}'
+        return session
+
+    @classmethod
+    def from_env(cls) -> 'PlatformClient':
+        """Configure from ARGUS_API_* variables; ARGUS_API_URL_<PLATFORM> overrides the base URL per platform"""
+        return cls(
+            base_url=os.environ.get('ARGUS_API_BASE_URL'),
+            api_key=os.environ.get('ARGUS_API_KEY'),
+            platform_urls={platform: os.environ.get(f'ARGUS_API_URL_{platform.upper()}') for platform in PLATFORMS},
+            max_connections_per_host=int(os.environ.get('ARGUS_API_MAX_CONNECTIONS_PER_HOST', 10)),
+            connect_timeout=float(os.environ.get('ARGUS_API_CONNECT_TIMEOUT', 3.05)),
+            read_timeout=float(os.environ.get('ARGUS_API_READ_TIMEOUT', 20)),
+            pool_timeout=float(os.environ.get('ARGUS_API_POOL_TIMEOUT', 10)),
+            limiter=RateLimiter.from_env(PLATFORMS),
+            max_retries=int(os.environ.get('ARGUS_API_MAX_RETRIES', 3)),
+            backoff_base=float(os.environ.get('ARGUS_API_BACKOFF_BASE_SECONDS', 0.5)),
+            backoff_max=float(os.environ.get('ARGUS_API_BACKOFF_MAX_SECONDS', 30))
+        )
+
+    @property
+    def available(self) -> bool:
+        """Whether any API endpoint is configured; without one the collector serves mock data"""
+        return bool(self.base_url or self.platform_urls)
+
+    def url_for(self, endpoint: str) -> str:
+        platform = platform_of(endpoint)
+        base_url = self.platform_urls.get(platform, self.base_url)
+        if not base_url:
+            raise RuntimeError(f'No API URL configured for {platform}')
+        return f'{base_url}/{endpoint}'
+
+    def call_api(self, endpoint: str, query: Optional[Dict[str, Any]] = None,
+                 parse: Optional[ResponseParser] = None) -> Any:
+        """GET an endpoint and return its JSON body
+
+        With ``parse``, the body is streamed into ``parse`` as it is read
+        instead of being loaded whole, and its result is returned.
+
+        Raises PlatformThrottled when the call cannot be made within the
+        limiter's wait budget or no pooled connection frees up within
+        ``pool_timeout``, and the last error once retries run out.
+        """
+        import requests
+        from urllib3.exceptions import EmptyPoolError
+
+        url = self.url_for(endpoint)
+        limiter = self.limiter
+        breaker = limiter.breaker(platform_of(endpoint))
+        bucket = limiter.bucket(endpoint)
+        deadline = limiter.deadline()
+
+        attempt = 0
+        while True:
+            limiter.acquire(endpoint, deadline)
+
+            retry_after = None
+            # A response is not waited for past the deadline either
+            connect_timeout, read_timeout = self.timeout
+            timeout = (connect_timeout, max(0.01, min(read_timeout, deadline - limiter.clock())))
+            try:
+                with metrics.timer('argus_platform_api_seconds', endpoint=endpoint):
+                    response = self.session.get(url, params=query, timeout=timeout,
+                                                stream=parse is not None)
+            except EmptyPoolError:
+                # Every connection to the host is busy with other calls; the provider is not at fault
+                breaker.release()
+                raise PlatformThrottled(f'No free connection for {endpoint} within {self.pool_timeout:.1f}s',
+                                        self.pool_timeout)
+            except requests.RequestException:
+                if limiter.clock() >= deadline:
+                    # Cut short because the caller stopped waiting, not because the provider failed
+                    breaker.release()
+                    raise PlatformThrottled(f'{endpoint} call abandoned at its deadline', 0)
+                breaker.record_failure()
+                if attempt >= self.max_retries:
+                    raise
+                reason = 'transport'
+            else:
+                metrics.inc('argus_platform_api_responses_total', endpoint=endpoint, status=response.status_code)
+                if response.status_code not in RETRY_STATUSES:
+                    # Other client errors (e.g. unknown user) still mean the provider is up
+                    breaker.record_success()
+                    bucket.succeeded()
+                    with response:
+                        response.raise_for_status()
+                        if parse is None:
+                            return response.json()
+                        response.raw.decode_content = True
+                        return parse(response.raw)
+
+                # Read the short error body, so even a streamed response's connection goes back to the pool
+                response.content
+                response.close()
+                retry_after = parse_retry_after(response.headers.get('Retry-After'))
+                if response.status_code == THROTTLED_STATUS:
+                    reason = 'throttled'
+                    # Quota, not an outage: it slows the endpoint without counting toward the circuit,
+                    # and a throttled probe neither closes nor reopens it
+                    breaker.release()
+                else:
+                    reason = 'unavailable'
+                    breaker.record_failure(retry_after)
+                if attempt >= self.max_retries:
+                    if reason == 'throttled':
+                        bucket.throttled(retry_after or self.backoff_base)
+                    response.raise_for_status()
+
+            delay = backoff_delay(attempt, self.backoff_base, self.backoff_max, retry_after)
+            if reason == 'throttled':
+                # Every caller of this endpoint holds off, not just this one
+                bucket.throttled(delay)
+            if limiter.clock() + delay > deadline:
+                raise PlatformThrottled(f'{endpoint} kept failing ({reason}); retry in {delay:.1f}s', delay)
+
+            metrics.inc('argus_platform_api_retries_total', endpoint=endpoint, reason=reason)
+            attempt += 1
+            if reason != 'throttled':
+                # A throttled bucket already holds the next acquire back
+                limiter.sleep(delay)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+
+class PlatformAdapter(ABC):
+    """One platform's API calls, made through any ``call(endpoint, query, parse=None)``
+
+    The collector passes its cached call; scans pass the client directly.
+    With ``compact``, responses are reduced to the fields Argus reads, for
+    callers that analyze them without storing them. History pages are always
+    reduced, since scans keep only their counts.
+    """
+
+    platform = ''
+
+    def __init__(self, call: ApiCall, compact: bool = False):
+        self.call = call
+        self.compact = compact
+
+    @abstractmethod
+    def collect(self, username: str) -> Dict[str, Any]:
+        """Every response the collector gathers for a handle, keyed by section"""
+
+    def iter_history(self, username: str, max_items: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+        """(section, response) pairs covering the handle's full history, fetched lazily
+
+        Profile responses come first, then one page of content at a time.
+        Platforms without paginated content yield what ``collect`` returns.
+        """
+        yield from self.collect(username).items()
+
+    def paginate(self, endpoint: str, query: Dict[str, Any], cursor_param: str,
+                 next_cursor: Callable[[Any], Optional[str]], count_items: Callable[[Any], int],
+                 max_items: Optional[int] = None, parse: Optional[ResponseParser] = None) -> Iterator[Any]:
+        """Follow an endpoint's cursors, yielding each page as soon as it arrives
+
+        Stops at the last page, an empty page, a repeated cursor, or once
+        ``max_items`` items have been yielded.
+        """
+        cursor = None
+        seen = set()
+        total = 0
+        while True:
+            page_query = dict(query, **{cursor_param: cursor}) if cursor else query
+            page = self.call(endpoint, page_query, parse=parse)
+            count = count_items(page) if page else 0
+            total += count
+            yield page
+
+            cursor = next_cursor(page) if page else None
+            if not cursor or not count or cursor in seen or (max_items and total >= max_items):
+                return
+            seen.add(cursor)
+
+
+class TwitterAdapter(PlatformAdapter):
+    platform = 'twitter'
+
+    def get_user_profile_by_username(self, username: str) -> Any:
+        return self.call('Twitter/get_user_profile_by_username', {'username': username})
+
+    def get_user_tweets(self, user_id: str, count: int = 20) -> Any:
+        # Timelines are mostly markup around the tweets: analysis only needs what Argus reads
+        return self.call('Twitter/get_user_tweets', {'user': user_id, 'count': str(count)},
+                         parse=compact_timeline if self.compact else None)
+
+    def iter_tweet_pages(self, user_id: str, page_size: int = HISTORY_PAGE_SIZE,
+                         max_items: Optional[int] = None) -> Iterator[Any]:
+        return self.paginate('Twitter/get_user_tweets', {'user': user_id, 'count': str(page_size)}, 'cursor',
+                             timeline_cursor, lambda page: sum(1 for _ in tweet_items(page)), max_items,
+                             parse=compact_timeline)
+
+    def collect(self, username: str) -> Dict[str, Any]:
+        """Collect Twitter profile and tweets data"""
+        profile_result = self.get_user_profile_by_username(username)
+        data = {'profile': profile_result}
+
+        # Get user tweets if profile exists
+        user_id = twitter_user_id(profile_result)
+        if user_id:
+            data['tweets'] = self.get_user_tweets(user_id)
+
+        return data
+
+    def iter_history(self, username: str, max_items: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+        profile_result = self.get_user_profile_by_username(username)
+        yield 'profile', profile_result
+
+        user_id = twitter_user_id(profile_result)
+        if user_id:
+            for page in self.iter_tweet_pages(user_id, max_items=max_items):
+                yield 'tweets', page
+
+
+class LinkedInAdapter(PlatformAdapter):
+    platform = 'linkedin'
+
+    def get_user_profile_by_username(self, username: str) -> Any:
+        return self.call('LinkedIn/get_user_profile_by_username', {'username': username})
+
+    def collect(self, username: str) -> Dict[str, Any]:
+        """Collect LinkedIn profile data"""
+        return {'profile': self.get_user_profile_by_username(username)}
+
+
+class YoutubeAdapter(PlatformAdapter):
+    platform = 'youtube'
+
+    def get_channel_details(self, channel_id: str) -> Any:
+        return self.call('Youtube/get_channel_details', {'id': channel_id, 'hl': 'en'})
+
+    def get_channel_videos(self, channel_id: str, video_filter: str = 'videos_latest') -> Any:
+        return self.call('Youtube/get_channel_videos', {'id': channel_id, 'filter': video_filter})
+
+    def iter_video_pages(self, channel_id: str, video_filter: str = 'videos_latest',
+                         max_items: Optional[int] = None) -> Iterator[Any]:
+        return self.paginate('Youtube/get_channel_videos', {'id': channel_id, 'filter': video_filter}, 'cursor',
+                             video_cursor, lambda page: sum(1 for _ in video_items(page)), max_items)
+
+    def collect(self, username: str) -> Dict[str, Any]:
+        """Collect YouTube channel data"""
+        channel_result = self.get_channel_details(username)
+        data = {'channel': channel_result}
+
+        # Get channel videos if channel exists
+        if channel_result and 'channelId' in channel_result:
+            data['videos'] = self.get_channel_videos(channel_result['channelId'])
+
+        return data
+
+    def iter_history(self, username: str, max_items: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+        channel_result = self.get_channel_details(username)
+        yield 'channel', channel_result
+
+        if channel_result and 'channelId' in channel_result:
+            for page in self.iter_video_pages(channel_result['channelId'], max_items=max_items):
+                yield 'videos', page
+
+
+class TiktokAdapter(PlatformAdapter):
+    platform = 'tiktok'
+
+    def get_user_info(self, username: str) -> Any:
+        return self.call('Tiktok/get_user_info', {'uniqueId': username})
+
+    def collect(self, username: str) -> Dict[str, Any]:
+        """Collect TikTok user data"""
+        return {'user': self.get_user_info(username)}
+
+
+class RedditAdapter(PlatformAdapter):
+    platform = 'reddit'
+
+    def access_api(self, subreddit: str, limit: int = 25) -> Any:
+        return self.call('Reddit/AccessAPI', {'subreddit': subreddit, 'limit': str(limit)})
+
+    def iter_post_pages(self, subreddit: str, page_size: int = HISTORY_PAGE_SIZE,
+                        max_items: Optional[int] = None) -> Iterator[Any]:
+        return self.paginate('Reddit/AccessAPI', {'subreddit': subreddit, 'limit': str(page_size)}, 'after',
+                             post_cursor, lambda page: len(page.get('posts', [])), max_items)
+
+    def collect(self, username: str) -> Dict[str, Any]:
+        """Collect Reddit posts data (the username is treated as a subreddit)"""
+        return {'posts': self.access_api(username)}
+
+    def iter_history(self, username: str, max_items: Optional[int] = None) -> Iterator[Tuple[str, Any]]:
+        for page in self.iter_post_pages(username, max_items=max_items):
+            yield 'posts', page
+
+
+ADAPTERS = {adapter.platform: adapter for adapter in
+            (TwitterAdapter, LinkedInAdapter, YoutubeAdapter, TiktokAdapter, RedditAdapter)}
+
+
+def make_adapters(call: ApiCall, compact: bool = False) -> Dict[str, PlatformAdapter]:
+    """An adapter per supported platform, all calling through ``call``"""
+    return {platform: adapter(call, compact) for platform, adapter in ADAPTERS.items()}
+
+# Global platform client instance
+platform_client = PlatformClient.from_env()
@@ -0,0 +1,60 @@
+"""
+Platform Content Service for Argus Digital Sentinel
+Pulls content items and pagination cursors out of platform API responses
+"""
+
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+from .timeline_parser import timeline_cursor, tweet_items
+
+# (item id, text) pairs, as the analyzer and item ledger consume them
+ContentItem = Tuple[Optional[str], str]
+
+
+def twitter_user_id(profile: Dict[str, Any]) -> Optional[str]:
+    """rest_id from a get_user_profile_by_username response"""
+    if profile and 'result' in profile:
+        user_data = profile['result']['data']['user']['result']
+        return user_data.get('rest_id')
+    return None
+
+
+def video_items(videos: Dict[str, Any]) -> Iterator[ContentItem]:
+    """Video id and title of every video in a get_channel_videos page"""
+    for content in videos.get('contents', []):
+        if content.get('type') == 'video':
+            video = content.get('video', {})
+            title = video.get('title', '')
+            if title:
+                yield video.get('videoId'), title
+
+
+def video_cursor(videos: Dict[str, Any]) -> Optional[str]:
+    return videos.get('cursorNext')
+
+
+def post_items(posts: Dict[str, Any]) -> Iterator[ContentItem]:
+    """Title and self text of every post in a Reddit listing page, as separate items"""
+    for post_wrapper in posts.get('posts', []):
+        post = post_wrapper.get('data', {})
+        post_id = post.get('name') or post.get('id')
+        title = post.get('title', '')
+        selftext = post.get('selftext', '')
+
+        if title:
+            yield (f"{post_id}/title" if post_id else None), title
+        if selftext:
+            yield (f"{post_id}/selftext" if post_id else None), selftext
+
+
+def post_cursor(posts: Dict[str, Any]) -> Optional[str]:
+    """Reddit's ``after`` fullname, which fetches the listing page after this one"""
+    return posts.get('after') or posts.get('data', {}).get('after')
+
+
+# Paginated section of each platform that has one: (section, item extractor)
+PAGED_SECTIONS = {
+    'twitter': ('tweets', tweet_items),
+    'youtube': ('videos', video_items),
+    'reddit': ('posts', post_items)
+}
@@ -0,0 +1,374 @@
+"""
+Rate Limiting Service for Argus Digital Sentinel
+Per-endpoint token buckets, backoff and per-platform circuit breakers for the platform APIs
+"""
+
+import math
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional
+
+from .metrics import metrics
+
+# On a 429 the endpoint's rate halves; each success then wins back this share of the configured rate
+RATE_DECREASE_FACTOR = 0.5
+RATE_RECOVERY_STEP = 0.05
+# The rate never adapts below this share of the configured rate
+MIN_RATE_FRACTION = 1 / 16
+
+CIRCUIT_CLOSED = 'closed'
+CIRCUIT_HALF_OPEN = 'half_open'
+CIRCUIT_OPEN = 'open'
+CIRCUIT_STATE_VALUES = {CIRCUIT_CLOSED: 0, CIRCUIT_HALF_OPEN: 1, CIRCUIT_OPEN: 2}
+
+# When whoever wants the current platform calls' results stops waiting for them (a time.monotonic value)
+_work_deadline: ContextVar[Optional[float]] = ContextVar('argus_work_deadline', default=None)
+
+
+@contextmanager
+def work_deadline(deadline: Optional[float]):
+    """Give up on platform calls made inside the block at ``deadline`` (a time.monotonic value)
+
+    For work whose caller stops waiting at a known time, such as a report
+    collecting a platform: calls then stop waiting for tokens, backing off or
+    reading responses once nobody wants their result, rather than holding a
+    worker until their own ``max_wait``.
+    """
+    token = _work_deadline.set(deadline)
+    try:
+        yield
+    finally:
+        _work_deadline.reset(token)
+
+
+class PlatformThrottled(Exception):
+    """A call was refused locally: the endpoint is out of quota, its platform's circuit is open
+    or no pooled connection freed up in time
+
+    ``retry_after`` is how many seconds until a call is likely to be let
+    through. Callers should surface this rather than substitute other data.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def retry_after_header(seconds: float) -> str:
+    """A delay as an HTTP Retry-After value: whole seconds, at least one"""
+    return str(max(1, math.ceil(seconds)))
+
+
+def throttled_cause(error: Optional[BaseException]) -> Optional[PlatformThrottled]:
+    """The PlatformThrottled behind an error, including one re-raised from a call shared with another caller"""
+    while error is not None:
+        if isinstance(error, PlatformThrottled):
+            return error
+        error = error.__cause__
+    return None
+
+
+def platform_of(endpoint: str) -> str:
+    """'twitter' for 'Twitter/get_user_tweets'"""
+    return endpoint.split('/', 1)[0].lower()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header, given as delta-seconds or an HTTP date"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+
+def backoff_delay(attempt: int, base: float, cap: float, retry_after: Optional[float] = None,
+                  rng: Callable[[], float] = random.random) -> float:
+    """Seconds to wait before retry ``attempt`` (0-based)
+
+    Full-jitter exponential backoff, so clients that failed together do not
+    retry together. A Retry-After from the provider is a floor, with up to
+    ``base`` seconds of jitter on top.
+    """
+    if retry_after is not None:
+        return retry_after + rng() * base
+    return rng() * min(cap, base * 2 ** attempt)
+
+
+class TokenBucket:
+    """Token bucket whose refill rate adapts to upstream throttling
+
+    Holds up to ``burst`` tokens and refills at ``rate`` per second. A
+    throttled response halves the rate and pauses the bucket for the
+    provider's Retry-After; further throttled responses during that pause
+    were sent at the old rate, so they only extend it. Each success then adds
+    back a small share of the configured rate, so throughput climbs back to
+    just under the quota.
+    """
+
+    def __init__(self, rate: float, burst: int, clock: Callable[[], float] = time.monotonic):
+        self.max_rate = rate
+        self.min_rate = rate * MIN_RATE_FRACTION
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.paused_until = 0.0
+        self.clock = clock
+
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        if now > self._updated:
+            self.tokens = min(self.burst, self.tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+    def try_acquire(self) -> float:
+        """Take a token and return 0, or return the seconds until one may be available"""
+        with self._lock:
+            now = self.clock()
+            if now < self.paused_until:
+                return self.paused_until - now
+            self._refill(now)
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+            return (1 - self.tokens) / self.rate
+
+    def throttled(self, pause: float):
+        """The provider pushed back: slow down and hold every caller for ``pause`` seconds"""
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            # Calls in flight when the first 429 arrived come back throttled too; slow down once for them
+            if now >= self.paused_until:
+                self.rate = max(self.min_rate, self.rate * RATE_DECREASE_FACTOR)
+            self.paused_until = max(self.paused_until, now + pause)
+            # No burst straight after the pause
+            self.tokens = min(self.tokens, 1.0)
+            self._updated = max(self._updated, self.paused_until)
+
+    def succeeded(self):
+        if self.rate < self.max_rate:
+            with self._lock:
+                self._refill(self.clock())
+                self.rate = min(self.max_rate, self.rate + self.max_rate * RATE_RECOVERY_STEP)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            now = self.clock()
+            self._refill(now)
+            return {
+                'rate': round(self.rate, 3),
+                'max_rate': self.max_rate,
+                'tokens': round(max(0.0, self.tokens), 3),
+                'paused_for': round(max(0.0, self.paused_until - now), 3)
+            }
+
+
+class CircuitBreaker:
+    """Stops calling a platform after ``failure_threshold`` failures in a row
+
+    While open every call fails fast. After ``reset_timeout`` seconds a single
+    probe call is let through: success closes the circuit, failure opens it
+    again, and a throttled probe frees the slot for another.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 30,
+                 clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.clock = clock
+
+        self.state = CIRCUIT_CLOSED
+        self.failures = 0
+        self.open_until = 0.0
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def retry_in(self) -> float:
+        """Seconds until a call would be let through; 0 if one would be now"""
+        with self._lock:
+            if self.state == CIRCUIT_OPEN:
+                return max(0.0, self.open_until - self.clock())
+            if self.state == CIRCUIT_HALF_OPEN and self._probing:
+                return self.reset_timeout
+            return 0.0
+
+    def allow(self) -> bool:
+        """Claim permission for one call, becoming the probe if the circuit is ready to half-open"""
+        with self._lock:
+            if self.state == CIRCUIT_CLOSED:
+                return True
+            if self.state == CIRCUIT_OPEN:
+                if self.clock() < self.open_until:
+                    return False
+                self._transition(CIRCUIT_HALF_OPEN)
+            if self._probing:
+                return False
+            self._probing = True
+            return True
+
+    def release(self):
+        """Give back a claimed call that says nothing about the platform's health
+
+        Used when the call is not made after all, or the provider throttled it:
+        a waiting probe slot is freed and the circuit state is left alone.
+        """
+        with self._lock:
+            self._probing = False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self._probing = False
+            if self.state != CIRCUIT_CLOSED:
+                self._transition(CIRCUIT_CLOSED)
+
+    def record_failure(self, retry_after: Optional[float] = None):
+        with self._lock:
+            self.failures += 1
+            self._probing = False
+            if self.state == CIRCUIT_HALF_OPEN or self.failures >= self.failure_threshold:
+                self.open_until = self.clock() + max(self.reset_timeout, retry_after or 0.0)
+                if self.state != CIRCUIT_OPEN:
+                    self._transition(CIRCUIT_OPEN)
+
+    def _transition(self, state: str):
+        self.state = state
+        metrics.inc('argus_platform_circuit_transitions_total', platform=self.name, state=state)
+
+
+class RateLimiter:
+    """Token buckets per endpoint and circuit breakers per platform, shared by every caller
+
+    Rates are requests per second per endpoint. ``platform_rates`` and
+    ``platform_bursts`` override the defaults for every endpoint of a
+    platform. Callers wait at most ``max_wait`` seconds for a token before
+    ``acquire`` raises PlatformThrottled.
+    """
+
+    def __init__(self, rate: float = 5.0, burst: int = 10, platform_rates: Optional[Dict[str, float]] = None,
+                 platform_bursts: Optional[Dict[str, int]] = None, failure_threshold: int = 5,
+                 reset_timeout: float = 30, max_wait: float = 30,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.burst = burst
+        self.platform_rates = {platform: value for platform, value in (platform_rates or {}).items() if value}
+        self.platform_bursts = {platform: value for platform, value in (platform_bursts or {}).items() if value}
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.max_wait = max_wait
+        self.clock = clock
+        self.sleep = sleep
+
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_env(cls, platforms) -> 'RateLimiter':
+        """Configure from ARGUS_API_RATE*, ARGUS_API_BURST* and ARGUS_API_CIRCUIT_* variables"""
+        def platform_values(prefix, cast):
+            values = {}
+            for platform in platforms:
+                value = os.environ.get(f'{prefix}_{platform.upper()}')
+                if value:
+                    values[platform] = cast(value)
+            return values
+
+        return cls(
+            rate=float(os.environ.get('ARGUS_API_RATE', 5)),
+            burst=int(os.environ.get('ARGUS_API_BURST', 10)),
+            platform_rates=platform_values('ARGUS_API_RATE', float),
+            platform_bursts=platform_values('ARGUS_API_BURST', int),
+            failure_threshold=int(os.environ.get('ARGUS_API_CIRCUIT_FAILURES', 5)),
+            reset_timeout=float(os.environ.get('ARGUS_API_CIRCUIT_RESET_SECONDS', 30)),
+            max_wait=float(os.environ.get('ARGUS_API_MAX_WAIT_SECONDS', 30))
+        )
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        bucket = self._buckets.get(endpoint)
+        if bucket is None:
+            platform = platform_of(endpoint)
+            with self._lock:
+                bucket = self._buckets.setdefault(endpoint, TokenBucket(
+                    self.platform_rates.get(platform, self.rate),
+                    self.platform_bursts.get(platform, self.burst),
+                    clock=self.clock
+                ))
+        return bucket
+
+    def breaker(self, platform: str) -> CircuitBreaker:
+        breaker = self._breakers.get(platform)
+        if breaker is None:
+            with self._lock:
+                breaker = self._breakers.setdefault(platform, CircuitBreaker(
+                    platform, self.failure_threshold, self.reset_timeout, clock=self.clock))
+        return breaker
+
+    def deadline(self) -> float:
+        """When a call starting now gives up: after ``max_wait``, or at the enclosing work_deadline if sooner"""
+        deadline = self.clock() + self.max_wait
+        abandoned_at = _work_deadline.get()
+        return deadline if abandoned_at is None else min(deadline, abandoned_at)
+
+    def acquire(self, endpoint: str, deadline: Optional[float] = None):
+        """Claim the platform's circuit, then wait for the endpoint's next token; raises PlatformThrottled
+
+        The circuit is checked first, so a refused call never spends a token.
+        Gives up as soon as the wait would run past ``deadline``, so worker
+        threads fail fast instead of piling up behind an exhausted quota.
+        """
+        deadline = self.deadline() if deadline is None else deadline
+        platform = platform_of(endpoint)
+        breaker = self.breaker(platform)
+        bucket = self.bucket(endpoint)
+
+        if self.clock() >= deadline:
+            metrics.inc('argus_platform_api_throttled_total', endpoint=endpoint, reason='deadline')
+            raise PlatformThrottled(f'{endpoint} call abandoned: its deadline has passed', 0)
+
+        if not breaker.allow():
+            retry_in = breaker.retry_in()
+            metrics.inc('argus_platform_api_throttled_total', endpoint=endpoint, reason='circuit_open')
+            raise PlatformThrottled(f'{platform} circuit is open; retry in {retry_in:.1f}s', retry_in)
+
+        while True:
+            wait = bucket.try_acquire()
+            if wait == 0:
+                return
+            if self.clock() + wait > deadline:
+                # The call will not be made, so a claimed probe goes to the next caller
+                breaker.release()
+                metrics.inc('argus_platform_api_throttled_total', endpoint=endpoint, reason='rate_limited')
+                raise PlatformThrottled(f'{endpoint} is rate limited; retry in {wait:.1f}s', wait)
+            self.sleep(wait)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            buckets = dict(self._buckets)
+            breakers = dict(self._breakers)
+        return {
+            'endpoints': {endpoint: bucket.stats() for endpoint, bucket in sorted(buckets.items())},
+            'circuits': {
+                platform: {'state': breaker.state, 'failures': breaker.failures,
+                           'retry_in': round(breaker.retry_in(), 3)}
+                for platform, breaker in sorted(breakers.items())
+            }
+        }
@@ -4,187 +4,66 @@ Generates comprehensive digital footprint analysis reports
 """
 
 import json
-import matplotlib.pyplot as plt
-import matplotlib.dates as mdates
-import seaborn as sns
-import pandas as pd
-from datetime import datetime, timedelta
+import shutil
+from datetime import datetime
 from typing import Dict, List, Any, Optional
 import os
 
+from .metrics import metrics
+from .chart_renderer import (ChartRenderer, DEFAULT_DPI, DEFAULT_START_METHOD, risk_trend_data,
+                             platform_distribution_data, risk_factors_data)
+
+# Charts render in a separate process pool; pandas loads on the first CSV export
+CHART_WORKERS = int(os.environ.get('ARGUS_CHART_WORKERS', 2))
+CHART_TIMEOUT = float(os.environ.get('ARGUS_CHART_TIMEOUT', 60))
+CHART_CACHE_MAX_FILES = int(os.environ.get('ARGUS_CHART_CACHE_MAX_FILES', 500))
+CHART_START_METHOD = os.environ.get('ARGUS_CHART_START_METHOD', DEFAULT_START_METHOD)
+
 class ReportGenerator:
     """Generates comprehensive reports and visualizations"""
     
     def __init__(self):
-        # Set up matplotlib for better rendering
-        plt.style.use('seaborn-v0_8')
-        sns.set_palette("husl")
-        
         # Create reports directory
         self.reports_dir = '/home/ubuntu/argus-digital-sentinel/reports'
         os.makedirs(self.reports_dir, exist_ok=True)
+        
+        # Rendered charts are cached alongside the reports so download URLs keep working
+        self.charts = ChartRenderer(self.reports_dir, workers=CHART_WORKERS, timeout=CHART_TIMEOUT,
+                                    max_cached=CHART_CACHE_MAX_FILES, start_method=CHART_START_METHOD)
     
-    def generate_risk_trend_chart(self, scan_history: List[Dict[str, Any]], output_path: str) -> str:
+    @metrics.timed('argus_report_seconds', method='generate_risk_trend_chart')
+    def generate_risk_trend_chart(self, scan_history: List[Dict[str, Any]], output_path: Optional[str] = None,
+                                  fmt: str = 'png', dpi: int = DEFAULT_DPI) -> Optional[str]:
         """Generate risk trend chart over time"""
-        if not scan_history:
-            return None
-        
-        # Prepare data
-        dates = []
-        risk_scores = []
-        platforms = []
-        
-        for scan in scan_history:
-            if scan.get('completed_at'):
-                dates.append(datetime.fromisoformat(scan['completed_at'].replace('Z', '+00:00')))
-                risk_scores.append(scan.get('risk_score', 0))
-                platforms.append(scan.get('platform', 'unknown'))
-        
-        if not dates:
-            return None
-        
-        # Create DataFrame
-        df = pd.DataFrame({
-            'date': dates,
-            'risk_score': risk_scores,
-            'platform': platforms
-        })
-        
-        # Sort by date
-        df = df.sort_values('date')
-        
-        # Create plot
-        plt.figure(figsize=(12, 6))
-        
-        # Plot overall trend
-        plt.subplot(1, 2, 1)
-        plt.plot(df['date'], df['risk_score'], marker='o', linewidth=2, markersize=6)
-        plt.title('Risk Score Trend Over Time', fontsize=14, fontweight='bold')
-        plt.xlabel('Date')
-        plt.ylabel('Risk Score')
-        plt.grid(True, alpha=0.3)
-        plt.xticks(rotation=45)
-        
-        # Platform breakdown
-        plt.subplot(1, 2, 2)
-        platform_avg = df.groupby('platform')['risk_score'].mean().sort_values(ascending=False)
-        colors = sns.color_palette("husl", len(platform_avg))
-        bars = plt.bar(platform_avg.index, platform_avg.values, color=colors)
-        plt.title('Average Risk Score by Platform', fontsize=14, fontweight='bold')
-        plt.xlabel('Platform')
-        plt.ylabel('Average Risk Score')
-        plt.xticks(rotation=45)
-        
-        # Add value labels on bars
-        for bar in bars:
-            height = bar.get_height()
-            plt.text(bar.get_x() + bar.get_width()/2., height + 0.5,
-                    f'{height:.1f}', ha='center', va='bottom')
-        
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return output_path
+        return self._render_chart('risk_trend', risk_trend_data(scan_history or []), output_path, fmt, dpi)
     
-    def generate_platform_distribution_chart(self, platform_analyses: List[Dict[str, Any]], output_path: str) -> str:
+    @metrics.timed('argus_report_seconds', method='generate_platform_distribution_chart')
+    def generate_platform_distribution_chart(self, platform_analyses: List[Dict[str, Any]], output_path: Optional[str] = None,
+                                             fmt: str = 'png', dpi: int = DEFAULT_DPI) -> Optional[str]:
         """Generate platform risk distribution pie chart"""
-        if not platform_analyses:
-            return None
-        
-        # Prepare data
-        platforms = []
-        risk_scores = []
-        
-        for analysis in platform_analyses:
-            platforms.append(analysis.get('platform', 'unknown').title())
-            risk_scores.append(analysis.get('risk_score', 0))
-        
-        if not platforms:
-            return None
-        
-        # Create pie chart
-        plt.figure(figsize=(10, 8))
-        
-        # Define colors for platforms
-        platform_colors = {
-            'Twitter': '#1DA1F2',
-            'Linkedin': '#0077B5',
-            'Youtube': '#FF0000',
-            'Tiktok': '#000000',
-            'Reddit': '#FF4500'
-        }
-        
-        colors = [platform_colors.get(platform, '#888888') for platform in platforms]
-        
-        # Create pie chart
-        wedges, texts, autotexts = plt.pie(risk_scores, labels=platforms, colors=colors, 
-                                          autopct='%1.1f%%', startangle=90)
-        
-        plt.title('Risk Distribution by Platform', fontsize=16, fontweight='bold', pad=20)
-        
-        # Enhance text appearance
-        for autotext in autotexts:
-            autotext.set_color('white')
-            autotext.set_fontweight('bold')
-        
-        plt.axis('equal')
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        
-        return output_path
+        return self._render_chart('platform_distribution', platform_distribution_data(platform_analyses or []),
+                                  output_path, fmt, dpi)
     
-    def generate_risk_factors_chart(self, analysis_results: List[Dict[str, Any]], output_path: str) -> str:
+    @metrics.timed('argus_report_seconds', method='generate_risk_factors_chart')
+    def generate_risk_factors_chart(self, analysis_results: List[Dict[str, Any]], output_path: Optional[str] = None,
+                                    fmt: str = 'png', dpi: int = DEFAULT_DPI) -> Optional[str]:
         """Generate risk factors analysis chart"""
-        if not analysis_results:
-            return None
-        
-        # Collect all risk factors
-        factor_counts = {}
-        
-        for analysis in analysis_results:
-            factors = analysis.get('factors', [])
-            for factor in factors:
-                # Extract the main factor type
-                if ':' in factor:
-                    factor_type = factor.split(':')[0].strip()
-                else:
-                    factor_type = factor
-                
-                factor_counts[factor_type] = factor_counts.get(factor_type, 0) + 1
-        
-        if not factor_counts:
+        return self._render_chart('risk_factors', risk_factors_data(analysis_results or []), output_path, fmt, dpi)
+    
+    def _render_chart(self, kind: str, data: Optional[Dict[str, Any]], output_path: Optional[str],
+                      fmt: str, dpi: int) -> Optional[str]:
+        """Render (or reuse) a cached chart; copy it to ``output_path`` when one is given"""
+        if data is None:
             return None
         
-        # Sort by frequency
-        sorted_factors = sorted(factor_counts.items(), key=lambda x: x[1], reverse=True)
-        
-        # Take top 10 factors
-        top_factors = sorted_factors[:10]
-        
-        # Create horizontal bar chart
-        plt.figure(figsize=(12, 8))
-        
-        factors, counts = zip(*top_factors)
-        y_pos = range(len(factors))
-        
-        bars = plt.barh(y_pos, counts, color=sns.color_palette("viridis", len(factors)))
-        
-        plt.yticks(y_pos, factors)
-        plt.xlabel('Frequency')
-        plt.title('Most Common Risk Factors', fontsize=16, fontweight='bold')
-        plt.grid(axis='x', alpha=0.3)
-        
-        # Add value labels
-        for i, (factor, count) in enumerate(top_factors):
-            plt.text(count + 0.1, i, str(count), va='center')
-        
-        plt.tight_layout()
-        plt.savefig(output_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        cached_path, _ = self.charts.render(kind, data, fmt, dpi)
+        if output_path is None:
+            return cached_path
         
+        shutil.copyfile(cached_path, output_path)
         return output_path
     
+    @metrics.timed('argus_report_seconds', method='generate_comprehensive_report')
     def generate_comprehensive_report(self, user_data: Dict[str, Any], platform_analyses: List[Dict[str, Any]]) -> str:
         """Generate a comprehensive PDF report"""
         from fpdf import FPDF
@@ -262,31 +141,24 @@ Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         
         return report_path
     
-    def generate_dashboard_data(self, platform_analyses: List[Dict[str, Any]]) -> Dict[str, Any]:
-        """Generate data for dashboard visualizations"""
+    @metrics.timed('argus_report_seconds', method='generate_dashboard_data')
+    def generate_dashboard_data(self, platform_analyses: List[Dict[str, Any]],
+                                risk_trend: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Generate data for dashboard visualizations
+        
+        ``risk_trend`` is the stored per-bucket history (see ``RiskRollups.trend``);
+        without one the trend is left empty.
+        """
+        risk_trend = risk_trend or []
+        
         if not platform_analyses:
             return {
-                'risk_trend': [],
+                'risk_trend': risk_trend,
                 'platform_distribution': [],
                 'risk_factors': [],
                 'overall_metrics': {}
             }
         
-        # Generate mock historical data for trend chart
-        risk_trend = []
-        base_date = datetime.now() - timedelta(days=30)
-        
-        for i in range(6):
-            date = base_date + timedelta(days=i*5)
-            # Simulate improving trend
-            base_risk = sum(analysis.get('risk_score', 0) for analysis in platform_analyses) / len(platform_analyses)
-            trend_risk = max(5, base_risk - (i * 2))  # Gradual improvement
-            
-            risk_trend.append({
-                'date': date.strftime('%Y-%m-%d'),
-                'risk': round(trend_risk, 1)
-            })
-        
         # Platform distribution
         platform_distribution = []
         for analysis in platform_analyses:
@@ -344,6 +216,7 @@ Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
         }
         return colors.get(platform.lower(), '#888888')
     
+    @metrics.timed('argus_report_seconds', method='export_data_csv')
     def export_data_csv(self, platform_analyses: List[Dict[str, Any]], output_path: str) -> str:
         """Export analysis data to CSV format"""
         if not platform_analyses:
@@ -365,12 +238,15 @@ Report generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}
                 'Analysis Date': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             })
         
+        import pandas as pd
+        
         # Create DataFrame and save
         df = pd.DataFrame(csv_data)
         df.to_csv(output_path, index=False)
         
         return output_path
     
+    @metrics.timed('argus_report_seconds', method='generate_detailed_analysis_report')
     def generate_detailed_analysis_report(self, platform_analyses: List[Dict[str, Any]]) -> str:
         """Generate detailed markdown analysis report"""
         report_path = os.path.join(self.reports_dir, f'detailed_analysis_{datetime.now().strftime("%Y%m%d_%H%M%S")}.md')
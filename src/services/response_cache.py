@@ -0,0 +1,192 @@
+"""
+Response Cache Service for Argus Digital Sentinel
+Caches upstream platform API responses with per-platform TTLs and LRU eviction
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+
+# Seconds a cached response stays fresh, keyed by the endpoint's platform prefix
+DEFAULT_PLATFORM_TTLS = {
+    'twitter': 300,
+    'reddit': 300,
+    'tiktok': 900,
+    'youtube': 1800,
+    'linkedin': 3600
+}
+
+
+class ResponseCache:
+    """Bounded in-memory TTL + LRU cache with an optional SQLite backing file
+
+    Entries are keyed by endpoint and query and stored as JSON, so every hit
+    returns a fresh copy that callers are free to modify. Expired rows in the
+    backing file are deleted every ``db_purge_every`` writes, so it holds
+    roughly one TTL's worth of responses however long the process runs.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: int = 64 * 1024 * 1024,
+                 default_ttl: int = 300, platform_ttls: Optional[Dict[str, int]] = None,
+                 db_path: Optional[str] = None, db_purge_every: int = 256):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.platform_ttls = dict(DEFAULT_PLATFORM_TTLS if platform_ttls is None else platform_ttls)
+
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._db = None
+        self.db_purge_every = max(1, db_purge_every)
+        self._db_writes = 0
+        if db_path:
+            self._open_db(db_path)
+
+    def _open_db(self, db_path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.execute(
+            'CREATE TABLE IF NOT EXISTS response_cache ('
+            'key TEXT PRIMARY KEY, expires_at REAL NOT NULL, payload TEXT NOT NULL)'
+        )
+        self._db.execute('CREATE INDEX IF NOT EXISTS response_cache_expires_at ON response_cache (expires_at)')
+        self._purge_db()
+        self._db.commit()
+
+    def _purge_db(self):
+        self._db.execute('DELETE FROM response_cache WHERE expires_at <= ?', (time.time(),))
+
+    @staticmethod
+    def make_key(endpoint: str, query: Optional[Dict[str, Any]]) -> str:
+        """Stable cache key for an endpoint call"""
+        return f"{endpoint}?{json.dumps(query or {}, sort_keys=True)}"
+
+    def ttl_for(self, endpoint: str) -> int:
+        """TTL for an endpoint such as ``Twitter/get_user_tweets``"""
+        platform = endpoint.split('/', 1)[0].lower()
+        return self.platform_ttls.get(platform, self.default_ttl)
+
+    def get(self, endpoint: str, query: Optional[Dict[str, Any]] = None) -> Optional[Any]:
+        """Return a cached response, or None on a miss"""
+        key = self.make_key(endpoint, query)
+        now = time.time()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return json.loads(entry[1])
+
+            if entry:
+                self._remove(key)
+
+            payload = self._load_from_db(key, now)
+            if payload is not None:
+                self._store(key, payload[0], payload[1])
+                self.hits += 1
+                return json.loads(payload[1])
+
+            self.misses += 1
+            return None
+
+    def set(self, endpoint: str, query: Optional[Dict[str, Any]], value: Any):
+        """Cache a response for its platform's TTL"""
+        if value is None:
+            return
+
+        key = self.make_key(endpoint, query)
+        expires_at = time.time() + self.ttl_for(endpoint)
+        payload = json.dumps(value)
+
+        with self._lock:
+            self._store(key, expires_at, payload)
+            if self._db is not None:
+                self._db.execute(
+                    'INSERT OR REPLACE INTO response_cache (key, expires_at, payload) VALUES (?, ?, ?)',
+                    (key, expires_at, payload)
+                )
+                self._db_writes += 1
+                if self._db_writes % self.db_purge_every == 0:
+                    self._purge_db()
+                self._db.commit()
+
+    def get_or_fetch(self, endpoint: str, query: Optional[Dict[str, Any]], fetch: Callable[[], Any]) -> Any:
+        """Return the cached response or call ``fetch`` and cache what it returns"""
+        cached = self.get(endpoint, query)
+        if cached is not None:
+            return cached
+
+        value = fetch()
+        self.set(endpoint, query, value)
+        return value
+
+    def clear(self):
+        """Drop every cached response, including the backing file"""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute('DELETE FROM response_cache')
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 4) if lookups else 0.0,
+                'evictions': self.evictions,
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'persistent': self._db is not None
+            }
+
+    def _load_from_db(self, key: str, now: float) -> Optional[Tuple[float, str]]:
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            'SELECT expires_at, payload FROM response_cache WHERE key = ? AND expires_at > ?',
+            (key, now)
+        ).fetchone()
+        return (row[0], row[1]) if row else None
+
+    def _store(self, key: str, expires_at: float, payload: str):
+        # Payloads larger than the whole budget are never kept in memory
+        if len(payload) > self.max_bytes:
+            return
+
+        if key in self._entries:
+            self._remove(key)
+
+        self._entries[key] = (expires_at, payload)
+        self._bytes += len(payload)
+
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+# Global response cache instance
+response_cache = ResponseCache(
+    max_entries=int(os.environ.get('ARGUS_CACHE_MAX_ENTRIES', 1024)),
+    max_bytes=int(os.environ.get('ARGUS_CACHE_MAX_BYTES', 64 * 1024 * 1024)),
+    db_path=os.environ.get('ARGUS_CACHE_DB') or None,
+    db_purge_every=int(os.environ.get('ARGUS_CACHE_DB_PURGE_EVERY', 256))
+)
@@ -0,0 +1,196 @@
+"""
+Risk Rollup Service for Argus Digital Sentinel
+Maintains daily and weekly risk aggregates per user and platform for trend views
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import sqlalchemy as sa
+
+from ..models.user import db
+from ..models.scan import DigitalFootprintScan, RiskRollup
+
+ROLLUP_PERIODS = ('day', 'week')
+PERIOD_DAYS = {'day': 1, 'week': 7}
+
+# Most buckets a trend request may ask for
+MAX_TREND_BUCKETS = 366
+
+# Completed scans read per batch when rebuilding rollups from history
+REBUILD_BATCH_SIZE = 1000
+
+
+def bucket_start(timestamp: datetime, period: str) -> date:
+    """The day, or the Monday of the week, a timestamp falls in"""
+    day = timestamp.date() if isinstance(timestamp, datetime) else timestamp
+    if period == 'week':
+        return day - timedelta(days=day.weekday())
+    return day
+
+
+class RiskRollups:
+    """Incremental (user, platform, period, bucket) aggregates of completed scan risk
+
+    Each completed scan adds to one daily and one weekly row in the caller's
+    session, so the rollup commits with the scan. Trend reads then touch one
+    row per bucket and platform, however many scans the user has.
+    """
+
+    def record_scan(self, scan: DigitalFootprintScan):
+        """Add a completed scan's risk score to the day and week buckets it completed in"""
+        completed_at = scan.completed_date or scan.scan_date or datetime.utcnow()
+        for period in ROLLUP_PERIODS:
+            self._add(scan.user_id, scan.platform, period, bucket_start(completed_at, period), scan.risk_score or 0.0)
+
+    def remove_user(self, user_id: int):
+        """Delete a deleted user's rollups"""
+        RiskRollup.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+
+    def _add(self, user_id: int, platform: str, period: str, start: date, risk_score: float):
+        values = {
+            'user_id': user_id,
+            'platform': platform,
+            'period': period,
+            'bucket_start': start,
+            'scan_count': 1,
+            'risk_total': risk_score,
+            'risk_min': risk_score,
+            'risk_max': risk_score,
+            'updated_date': datetime.utcnow()
+        }
+
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert
+                least, greatest = sa.func.min, sa.func.max
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+                least, greatest = sa.func.least, sa.func.greatest
+
+            # A single upsert, so concurrent workers finishing scans in the same bucket both count
+            statement = insert(RiskRollup).values(**values)
+            db.session.execute(statement.on_conflict_do_update(
+                index_elements=['user_id', 'period', 'bucket_start', 'platform'],
+                set_={
+                    'scan_count': RiskRollup.scan_count + 1,
+                    'risk_total': RiskRollup.risk_total + statement.excluded.risk_total,
+                    'risk_min': least(RiskRollup.risk_min, statement.excluded.risk_min),
+                    'risk_max': greatest(RiskRollup.risk_max, statement.excluded.risk_max),
+                    'updated_date': statement.excluded.updated_date
+                }
+            ))
+            return
+
+        rollup = RiskRollup.query.filter_by(user_id=user_id, platform=platform, period=period,
+                                            bucket_start=start).with_for_update().first()
+        if rollup is None:
+            db.session.add(RiskRollup(**values))
+        else:
+            rollup.scan_count += 1
+            rollup.risk_total += risk_score
+            rollup.risk_min = min(rollup.risk_min, risk_score)
+            rollup.risk_max = max(rollup.risk_max, risk_score)
+            rollup.updated_date = values['updated_date']
+
+    def trend(self, user_id: int, period: str = 'day', buckets: int = 30,
+              platform: Optional[str] = None, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Average risk per bucket over the last ``buckets`` periods, overall and per platform
+
+        Buckets without scans are left out rather than reported as zero risk.
+        """
+        if period not in ROLLUP_PERIODS:
+            raise ValueError(f"Unsupported period; choose from {', '.join(ROLLUP_PERIODS)}")
+        buckets = max(1, min(int(buckets), MAX_TREND_BUCKETS))
+
+        last = bucket_start(now or datetime.utcnow(), period)
+        first = last - timedelta(days=PERIOD_DAYS[period] * (buckets - 1))
+
+        query = RiskRollup.query.with_entities(
+            RiskRollup.bucket_start, RiskRollup.platform, RiskRollup.scan_count,
+            RiskRollup.risk_total, RiskRollup.risk_min, RiskRollup.risk_max
+        ).filter(
+            RiskRollup.user_id == user_id,
+            RiskRollup.period == period,
+            RiskRollup.bucket_start >= first
+        )
+        if platform:
+            query = query.filter(RiskRollup.platform == platform)
+
+        overall: Dict[date, Dict[str, Any]] = {}
+        platforms: Dict[str, List[Dict[str, Any]]] = {}
+        for row in query.order_by(RiskRollup.bucket_start, RiskRollup.platform):
+            platforms.setdefault(row.platform, []).append(self._point(
+                row.bucket_start, row.scan_count, row.risk_total, row.risk_min, row.risk_max))
+
+            combined = overall.setdefault(row.bucket_start, {'scans': 0, 'total': 0.0, 'min': None, 'max': None})
+            combined['scans'] += row.scan_count
+            combined['total'] += row.risk_total
+            combined['min'] = row.risk_min if combined['min'] is None else min(combined['min'], row.risk_min)
+            combined['max'] = row.risk_max if combined['max'] is None else max(combined['max'], row.risk_max)
+
+        return {
+            'period': period,
+            'start': first.isoformat(),
+            'end': last.isoformat(),
+            'buckets': [self._point(start, values['scans'], values['total'], values['min'], values['max'])
+                        for start, values in overall.items()],
+            'platforms': platforms
+        }
+
+    @staticmethod
+    def _point(start: date, scans: int, total: float, low: float, high: float) -> Dict[str, Any]:
+        return {
+            'date': start.isoformat(),
+            'risk': round(total / scans, 1) if scans else 0.0,
+            'scans': scans,
+            'min': round(low, 1) if low is not None else None,
+            'max': round(high, 1) if high is not None else None
+        }
+
+    def rebuild(self, connection, user_id: Optional[int] = None) -> int:
+        """Recompute rollups from completed scans (all users, or one) on a Core connection"""
+        scans = DigitalFootprintScan.__table__
+        rollups = RiskRollup.__table__
+
+        delete = rollups.delete()
+        # Scans completed before completion times were recorded fall back to their queue time;
+        # earlier migration steps run before the column exists
+        if any(column['name'] == 'completed_date' for column in sa.inspect(connection).get_columns(scans.name)):
+            completed_date = sa.func.coalesce(scans.c.completed_date, scans.c.scan_date)
+        else:
+            completed_date = scans.c.scan_date
+        statement = sa.select(scans.c.user_id, scans.c.platform, completed_date, scans.c.risk_score)\
+                      .where(scans.c.status == 'completed', completed_date.isnot(None))
+        if user_id is not None:
+            delete = delete.where(rollups.c.user_id == user_id)
+            statement = statement.where(scans.c.user_id == user_id)
+        connection.execute(delete)
+
+        totals: Dict[tuple, List[float]] = {}
+        result = connection.execution_options(yield_per=REBUILD_BATCH_SIZE).execute(statement)
+        for scan_user_id, platform, completed_at, risk_score in result:
+            risk_score = risk_score or 0.0
+            for period in ROLLUP_PERIODS:
+                key = (scan_user_id, platform, period, bucket_start(completed_at, period))
+                entry = totals.get(key)
+                if entry is None:
+                    totals[key] = [1, risk_score, risk_score, risk_score]
+                else:
+                    entry[0] += 1
+                    entry[1] += risk_score
+                    entry[2] = min(entry[2], risk_score)
+                    entry[3] = max(entry[3], risk_score)
+
+        now = datetime.utcnow()
+        rows = [{
+            'user_id': key[0], 'platform': key[1], 'period': key[2], 'bucket_start': key[3],
+            'scan_count': count, 'risk_total': total, 'risk_min': low, 'risk_max': high, 'updated_date': now
+        } for key, (count, total, low, high) in totals.items()]
+        if rows:
+            connection.execute(rollups.insert(), rows)
+        return len(rows)
+
+# Global risk rollup instance
+risk_rollups = RiskRollups()
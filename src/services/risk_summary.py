@@ -0,0 +1,219 @@
+"""
+Risk Summary Service for Argus Digital Sentinel
+Keeps each user's weighted overall risk and open alert counts materialized
+"""
+
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import sqlalchemy as sa
+
+from ..models.user import db
+from ..models.scan import DigitalFootprintScan, PlatformConfig, PlatformRiskScore, RiskAlert, UserRiskSummary
+from .ai_analyzer import PLATFORM_WEIGHTS
+
+# Factors stored per platform score, and factor types listed in the user summary
+MAX_PLATFORM_FACTORS = 20
+TOP_FACTORS = 10
+
+
+def factor_type(factor: str) -> str:
+    """Main factor type, e.g. 'Tweets' for 'Tweets: 3 high-risk keywords'"""
+    return factor.split(':')[0].strip() if ':' in factor else factor
+
+
+def summarize(platform_scores: Dict[str, Dict[str, Any]], open_alerts: Dict[str, int]) -> Dict[str, Any]:
+    """UserRiskSummary column values from per-platform scores and open alert counts by severity
+
+    Weighted the same way as ``AIAnalyzer.calculate_overall_risk``.
+    """
+    total_weight = sum(score['weight'] for score in platform_scores.values())
+    weighted_total = sum(score['weighted_risk'] for score in platform_scores.values())
+
+    factor_counts = {}
+    for score in platform_scores.values():
+        for factor in score['factors']:
+            kind = factor_type(factor)
+            factor_counts[kind] = factor_counts.get(kind, 0) + 1
+    top_factors = [
+        {'factor': factor, 'count': count}
+        for factor, count in sorted(factor_counts.items(), key=lambda x: x[1], reverse=True)[:TOP_FACTORS]
+    ]
+
+    return {
+        'overall_risk': round(weighted_total / total_weight, 1) if total_weight > 0 else 0.0,
+        'total_weight': round(total_weight, 3),
+        'platform_breakdown': json.dumps(platform_scores),
+        'top_factors': json.dumps(top_factors),
+        'open_alerts': sum(open_alerts.values()),
+        'open_alerts_by_severity': json.dumps(open_alerts),
+        'updated_date': datetime.utcnow()
+    }
+
+
+class RiskSummaries:
+    """Maintains user_risk_summaries and platform_risk_scores in the caller's transaction
+
+    Every update first locks the user's summary row, so workers finishing
+    scans for the same user apply their changes one at a time and the
+    summary always reflects every committed scan.
+    """
+
+    def record_scan(self, scan: DigitalFootprintScan, analysis_result: Dict[str, Any]):
+        """Make a completed scan the platform's current score and recompute the summary"""
+        self._lock(scan.user_id)
+
+        score = db.session.get(PlatformRiskScore, (scan.user_id, scan.platform))
+        if score is not None and score.scan_id and score.scan_id > scan.id:
+            # A newer scan of this platform finished first; it stays current
+            return
+
+        if score is None:
+            score = PlatformRiskScore(user_id=scan.user_id, platform=scan.platform)
+            db.session.add(score)
+
+        risk_score = scan.risk_score or 0.0
+        score.scan_id = scan.id
+        score.risk_score = risk_score
+        score.weight = PLATFORM_WEIGHTS.get(scan.platform, 1.0)
+        score.weighted_risk = risk_score * score.weight
+        score.factors = json.dumps(analysis_result.get('factors', [])[:MAX_PLATFORM_FACTORS])
+        score.scanned_date = scan.scan_date
+
+        self._refresh(scan.user_id)
+
+    def remove_platform(self, user_id: int, platform: str, username: str):
+        """Drop a deleted platform config's handle from the user's platform score and summary
+
+        Call after deleting the config in the same transaction. When the handle
+        held the platform's current score, the latest completed scan of another
+        handle still configured on that platform takes its place, if there is one.
+        """
+        self._lock(user_id)
+
+        score = db.session.get(PlatformRiskScore, (user_id, platform))
+        if score is not None:
+            current = db.session.get(DigitalFootprintScan, score.scan_id) if score.scan_id else None
+            if current is None or current.username == username:
+                db.session.delete(score)
+                db.session.flush()
+
+                configured = PlatformConfig.query.with_entities(PlatformConfig.username)\
+                                                 .filter_by(user_id=user_id, platform=platform)
+                replacement = DigitalFootprintScan.query.filter(
+                    DigitalFootprintScan.user_id == user_id,
+                    DigitalFootprintScan.platform == platform,
+                    DigitalFootprintScan.status == 'completed',
+                    DigitalFootprintScan.username.in_(configured)
+                ).order_by(DigitalFootprintScan.id.desc()).first()
+                if replacement is not None:
+                    analysis = json.loads(replacement.analysis_results) if replacement.analysis_results else {}
+                    self.record_scan(replacement, analysis)
+                    return
+
+        self._refresh(user_id)
+
+    def remove_user(self, user_id: int):
+        """Delete a deleted user's platform scores and summary"""
+        PlatformRiskScore.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+        UserRiskSummary.query.filter_by(user_id=user_id).delete(synchronize_session=False)
+
+    def refresh_alerts(self, user_id: int):
+        """Recount open alerts after one is created or acknowledged outside a scan"""
+        self._lock(user_id)
+        self._refresh(user_id)
+
+    def get(self, user_id: int) -> Optional[Dict[str, Any]]:
+        summary = db.session.get(UserRiskSummary, user_id)
+        return summary.to_dict() if summary else None
+
+    def _lock(self, user_id: int) -> UserRiskSummary:
+        """Create the user's summary row if needed and lock it until the transaction ends"""
+        dialect = db.session.get_bind().dialect.name
+        if dialect in ('sqlite', 'postgresql'):
+            if dialect == 'sqlite':
+                from sqlalchemy.dialects.sqlite import insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert
+            # On SQLite this write also takes the database write lock that serializes updaters
+            db.session.execute(insert(UserRiskSummary).values(user_id=user_id).on_conflict_do_nothing())
+        elif db.session.get(UserRiskSummary, user_id) is None:
+            db.session.add(UserRiskSummary(user_id=user_id))
+            db.session.flush()
+
+        return UserRiskSummary.query.filter_by(user_id=user_id).with_for_update().populate_existing().one()
+
+    def _refresh(self, user_id: int):
+        platform_scores = {
+            score.platform: score.to_dict()
+            for score in PlatformRiskScore.query.filter_by(user_id=user_id)
+        }
+        open_alerts = dict(
+            db.session.query(RiskAlert.severity, db.func.count(RiskAlert.id))
+                      .filter(RiskAlert.user_id == user_id, RiskAlert.acknowledged.isnot(True))
+                      .group_by(RiskAlert.severity)
+        )
+
+        summary = db.session.get(UserRiskSummary, user_id)
+        for column, value in summarize(platform_scores, open_alerts).items():
+            setattr(summary, column, value)
+
+    def rebuild(self, connection) -> int:
+        """Recompute every user's scores and summary from stored scans and alerts on a Core connection"""
+        scans = DigitalFootprintScan.__table__
+        alerts = RiskAlert.__table__
+        scores_table = PlatformRiskScore.__table__
+        summaries_table = UserRiskSummary.__table__
+
+        latest = sa.select(sa.func.max(scans.c.id))\
+                   .where(scans.c.status == 'completed')\
+                   .group_by(scans.c.user_id, scans.c.platform)
+        rows = connection.execute(
+            sa.select(scans.c.id, scans.c.user_id, scans.c.platform, scans.c.scan_date,
+                      scans.c.risk_score, scans.c.analysis_results)
+              .where(scans.c.id.in_(latest))
+        )
+
+        platform_scores: Dict[int, Dict[str, Dict[str, Any]]] = {}
+        score_rows: List[Dict[str, Any]] = []
+        for scan_id, user_id, platform, scan_date, risk_score, analysis_results in rows:
+            analysis = json.loads(analysis_results) if analysis_results else {}
+            risk_score = risk_score or 0.0
+            weight = PLATFORM_WEIGHTS.get(platform, 1.0)
+            factors = analysis.get('factors', [])[:MAX_PLATFORM_FACTORS]
+
+            score_rows.append({
+                'user_id': user_id, 'platform': platform, 'scan_id': scan_id, 'risk_score': risk_score,
+                'weight': weight, 'weighted_risk': risk_score * weight, 'factors': json.dumps(factors),
+                'scanned_date': scan_date
+            })
+            platform_scores.setdefault(user_id, {})[platform] = {
+                'scan_id': scan_id, 'risk_score': risk_score, 'weight': weight,
+                'weighted_risk': risk_score * weight, 'factors': factors,
+                'scanned_date': scan_date.isoformat() if scan_date else None
+            }
+
+        open_alerts: Dict[int, Dict[str, int]] = {}
+        for user_id, severity, count in connection.execute(
+            sa.select(alerts.c.user_id, alerts.c.severity, sa.func.count(alerts.c.id))
+              .where(alerts.c.acknowledged.isnot(True))
+              .group_by(alerts.c.user_id, alerts.c.severity)
+        ):
+            open_alerts.setdefault(user_id, {})[severity] = count
+
+        connection.execute(scores_table.delete())
+        connection.execute(summaries_table.delete())
+        if score_rows:
+            connection.execute(scores_table.insert(), score_rows)
+
+        summary_rows = [
+            {'user_id': user_id, **summarize(platform_scores.get(user_id, {}), open_alerts.get(user_id, {}))}
+            for user_id in set(platform_scores) | set(open_alerts)
+        ]
+        if summary_rows:
+            connection.execute(summaries_table.insert(), summary_rows)
+        return len(summary_rows)
+
+# Global risk summary instance
+risk_summaries = RiskSummaries()
@@ -0,0 +1,259 @@
+"""
+Scan Queue Service for Argus Digital Sentinel
+Runs digital footprint scans on background workers instead of the request thread
+"""
+
+import os
+import queue
+import socket
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Set
+
+TERMINAL_STATUSES = ('completed', 'failed')
+MAX_TRACKED_SCANS = 1000
+
+# Running scans' heartbeats are refreshed this often; a claim not refreshed for
+# ARGUS_SCAN_STALE_SECONDS belongs to a worker that is gone
+HEARTBEAT_SECONDS = float(os.environ.get('ARGUS_SCAN_HEARTBEAT_SECONDS', 30))
+STALE_CLAIM_SECONDS = float(os.environ.get('ARGUS_SCAN_STALE_SECONDS', 300))
+
+
+class ScanQueue:
+    """In-process worker pool fed by pending DigitalFootprintScan rows
+
+    The database row is the durable job record: scans are queued by id, and a
+    worker claims a scan by moving it from ``pending`` to ``running`` under its
+    ``worker_id``, then keeps the claim's heartbeat fresh. Pending scans, and
+    running scans whose heartbeat has gone stale or that a previous process on
+    this host and pid claimed, are picked up again by ``recover``; scans live
+    workers elsewhere are running are left alone.
+    """
+
+    def __init__(self, num_workers: int = 4, max_backlog_queued: int = 0,
+                 heartbeat_seconds: float = HEARTBEAT_SECONDS, stale_seconds: float = STALE_CLAIM_SECONDS):
+        self.num_workers = num_workers
+        # Backlog scans allowed to wait in the worker queue at once (0: twice the workers)
+        self.max_backlog_queued = max_backlog_queued
+        self.heartbeat_seconds = heartbeat_seconds
+        self.stale_seconds = stale_seconds
+        self.worker_id = f'{socket.gethostname()}:{os.getpid()}'
+        self.app = None
+        self.handler: Optional[Callable[[int], None]] = None
+        self._queue: "queue.Queue[int]" = queue.Queue()
+        self._progress: Dict[int, Dict[str, Any]] = {}
+        self._changed = threading.Condition()
+        self._workers = []
+        self._backlog: Deque[int] = deque()
+        self._backlog_ready = threading.Condition()
+        self._claimed: Set[int] = set()
+        self._claimed_lock = threading.Lock()
+
+    def init_app(self, app, handler: Callable[[int], None]):
+        """Bind the queue to the Flask app, start workers and requeue unfinished scans"""
+        self.app = app
+        self.handler = handler
+        self.num_workers = app.config.get('SCAN_WORKERS', self.num_workers)
+        self.max_backlog_queued = app.config.get('SCAN_MAX_BACKLOG_QUEUED', self.max_backlog_queued) \
+            or self.num_workers * 2
+
+        for index in range(self.num_workers):
+            worker = threading.Thread(target=self._work, name=f'argus-scan-worker-{index}', daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+        threading.Thread(target=self._feed_backlog, name='argus-scan-backlog', daemon=True).start()
+        if self.heartbeat_seconds > 0:
+            threading.Thread(target=self._heartbeat, name='argus-scan-heartbeat', daemon=True).start()
+
+        with app.app_context():
+            self.recover()
+
+    def recover(self):
+        """Requeue scans a previous process accepted but never finished"""
+        from ..models.scan import DigitalFootprintScan
+
+        self.requeue_stale()
+
+        pending = DigitalFootprintScan.query.with_entities(DigitalFootprintScan.id)\
+                                            .filter_by(status='pending')\
+                                            .order_by(DigitalFootprintScan.id).all()
+        self.submit_backlog(scan_id for (scan_id,) in pending)
+
+    def requeue_stale(self) -> List[int]:
+        """Return running scans whose worker is gone to ``pending`` and their ids"""
+        from ..models.user import db
+        from ..models.scan import DigitalFootprintScan
+
+        cutoff = datetime.utcnow() - timedelta(seconds=self.stale_seconds)
+        with self._claimed_lock:
+            claimed = list(self._claimed)
+        stale = DigitalFootprintScan.query.filter(
+            DigitalFootprintScan.status == 'running',
+            db.or_(
+                DigitalFootprintScan.heartbeat_at.is_(None),
+                DigitalFootprintScan.heartbeat_at < cutoff,
+                # A previous process with this host and pid (e.g. a restarted container) cannot still be running it
+                db.and_(DigitalFootprintScan.claimed_by == self.worker_id, DigitalFootprintScan.id.notin_(claimed))
+            )
+        )
+        scan_ids = [scan_id for (scan_id,) in stale.with_entities(DigitalFootprintScan.id)]
+        if not scan_ids:
+            return []
+
+        # Re-check each row's claim in the update itself, so a heartbeat that lands in between wins
+        requeued = []
+        for scan_id in scan_ids:
+            if stale.filter(DigitalFootprintScan.id == scan_id)\
+                    .update({'status': 'pending', 'claimed_by': None}, synchronize_session=False):
+                requeued.append(scan_id)
+        db.session.commit()
+        return requeued
+
+    def claim(self, scan_id: int) -> bool:
+        """Move a pending scan to running under this worker; False if another worker has it"""
+        from ..models.user import db
+        from ..models.scan import DigitalFootprintScan
+
+        # Held before the claim commits, so requeue_stale never takes the scan for a previous process's
+        claimed = 0
+        with self._claimed_lock:
+            held = scan_id in self._claimed
+            self._claimed.add(scan_id)
+        try:
+            claimed = DigitalFootprintScan.query.filter_by(id=scan_id, status='pending').update({
+                'status': 'running',
+                'claimed_by': self.worker_id,
+                'heartbeat_at': datetime.utcnow()
+            }, synchronize_session=False)
+            db.session.commit()
+        finally:
+            if not claimed and not held:
+                self.release(scan_id)
+        return bool(claimed)
+
+    def finish(self, scan_id: int, status: str) -> bool:
+        """Move a scan this worker still holds to a terminal status in the current transaction
+
+        False if its claim was lost (the scan was requeued and another worker
+        may be running it), in which case the caller should roll back rather
+        than record its result. The caller commits.
+        """
+        from ..models.scan import DigitalFootprintScan
+
+        return bool(DigitalFootprintScan.query.filter_by(
+            id=scan_id, status='running', claimed_by=self.worker_id
+        ).update({'status': status}, synchronize_session=False))
+
+    def release(self, scan_id: int):
+        """Stop heartbeating a scan this worker has finished with"""
+        with self._claimed_lock:
+            self._claimed.discard(scan_id)
+
+    def submit(self, scan_id: int):
+        """Queue a pending scan for background execution"""
+        self.update(scan_id, status='pending', stage='queued', progress=0)
+        self._queue.put(scan_id)
+
+    def submit_backlog(self, scan_ids: Iterable[int]):
+        """Queue many pending scans without flooding the workers
+
+        Backlog scans are fed to the worker queue a few at a time, so scans
+        submitted individually afterwards still start promptly.
+        """
+        with self._backlog_ready:
+            self._backlog.extend(scan_ids)
+            self._backlog_ready.notify()
+
+    def depth(self) -> int:
+        """Number of scans waiting for a worker, including the backlog"""
+        return self._queue.qsize() + len(self._backlog)
+
+    def update(self, scan_id: int, **fields):
+        """Record scan progress and wake anyone following it"""
+        with self._changed:
+            state = self._progress.setdefault(scan_id, {'scan_id': scan_id, 'version': 0})
+            state.update(fields)
+            state['version'] += 1
+            state['updated_at'] = datetime.utcnow().isoformat()
+            self._prune()
+            self._changed.notify_all()
+
+    def get_progress(self, scan_id: int) -> Optional[Dict[str, Any]]:
+        """Latest in-memory progress for a scan, if this process has seen it"""
+        with self._changed:
+            state = self._progress.get(scan_id)
+            return dict(state) if state else None
+
+    def wait_for_update(self, scan_id: int, version: int, timeout: float) -> Optional[Dict[str, Any]]:
+        """Block until the scan's progress moves past ``version`` or the timeout expires"""
+        with self._changed:
+            self._changed.wait_for(
+                lambda: self._progress.get(scan_id, {}).get('version', 0) > version,
+                timeout=timeout
+            )
+            state = self._progress.get(scan_id)
+            return dict(state) if state else None
+
+    def _prune(self):
+        # Forget the oldest finished scans; their final state is in the database
+        excess = len(self._progress) - MAX_TRACKED_SCANS
+        if excess <= 0:
+            return
+        finished = [scan_id for scan_id, state in self._progress.items()
+                    if state.get('status') in TERMINAL_STATUSES]
+        for scan_id in finished[:excess]:
+            del self._progress[scan_id]
+
+    def _feed_backlog(self):
+        while True:
+            with self._backlog_ready:
+                self._backlog_ready.wait_for(
+                    lambda: self._backlog and self._queue.qsize() < self.max_backlog_queued
+                )
+                scan_id = self._backlog.popleft()
+            self.submit(scan_id)
+
+    def _work(self):
+        while True:
+            scan_id = self._queue.get()
+            # A worker freed a slot in the queue; let the backlog top it up
+            with self._backlog_ready:
+                self._backlog_ready.notify()
+            try:
+                with self.app.app_context():
+                    self.handler(scan_id)
+            except Exception as e:
+                print(f"Error running scan {scan_id}: {str(e)}")
+                self.update(scan_id, status='failed', stage='failed', error=str(e))
+            finally:
+                self.release(scan_id)
+                self._queue.task_done()
+
+    def _heartbeat(self):
+        from ..models.user import db
+        from ..models.scan import DigitalFootprintScan
+
+        while True:
+            time.sleep(self.heartbeat_seconds)
+            try:
+                with self.app.app_context():
+                    with self._claimed_lock:
+                        claimed = list(self._claimed)
+                    if claimed:
+                        DigitalFootprintScan.query.filter(
+                            DigitalFootprintScan.id.in_(claimed),
+                            DigitalFootprintScan.status == 'running',
+                            DigitalFootprintScan.claimed_by == self.worker_id
+                        ).update({'heartbeat_at': datetime.utcnow()}, synchronize_session=False)
+                        db.session.commit()
+
+                    # Take over scans from workers that stopped heartbeating since this process started
+                    self.submit_backlog(self.requeue_stale())
+            except Exception as e:
+                print(f"Error refreshing scan heartbeats: {str(e)}")
+
+# Global scan queue instance
+scan_queue = ScanQueue()
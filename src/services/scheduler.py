@@ -0,0 +1,289 @@
+"""
+Scan Scheduler Service for Argus Digital Sentinel
+Rescans enabled platform configs whenever their scan_frequency elapses
+"""
+
+import heapq
+import itertools
+import random
+import threading
+import time
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Callable, Deque, Dict, List, Optional, Set, Tuple
+
+EPOCH = datetime(1970, 1, 1)
+
+# Scheduled scans allowed per platform in each budget window
+DEFAULT_PLATFORM_BUDGETS = {
+    'twitter': 300,
+    'linkedin': 100,
+    'youtube': 300,
+    'tiktok': 200,
+    'reddit': 300
+}
+
+
+def to_epoch(timestamp: datetime) -> float:
+    """Epoch seconds of a naive UTC datetime"""
+    return (timestamp - EPOCH).total_seconds()
+
+
+def from_epoch(seconds: float) -> datetime:
+    return EPOCH + timedelta(seconds=seconds)
+
+
+class ScanScheduler:
+    """Due-time priority heap over enabled PlatformConfig rows
+
+    Each config sits in the heap once, ordered by when it is next due. A single
+    thread sleeps until the earliest due time, then hands due scans to the scan
+    queue, subject to a concurrency limit and per-platform rate budgets.
+
+    Several processes may each run a scheduler over the same database. The
+    config's ``next_run`` column is the shared due time: a scheduler only
+    dispatches after moving ``next_run`` forward from the value it read, so
+    exactly one of them runs each rescan. Every ``resync_seconds`` the heap is
+    rebuilt from the table, picking up configs other processes added or changed.
+    """
+
+    def __init__(self, max_concurrent: int = 4, jitter_seconds: float = 300,
+                 platform_budgets: Optional[Dict[str, int]] = None,
+                 budget_window_seconds: float = 3600, retry_delay_seconds: float = 30,
+                 resync_seconds: float = 300):
+        self.max_concurrent = max_concurrent
+        self.jitter_seconds = jitter_seconds
+        self.platform_budgets = dict(DEFAULT_PLATFORM_BUDGETS if platform_budgets is None else platform_budgets)
+        self.budget_window_seconds = budget_window_seconds
+        self.retry_delay_seconds = retry_delay_seconds
+        self.resync_seconds = resync_seconds
+
+        self.app = None
+        self.dispatch: Optional[Callable[[Any], int]] = None
+        self.is_running: Optional[Callable[[int], bool]] = None
+
+        self._heap: List[Tuple[float, int, int]] = []
+        self._scheduled: Dict[int, int] = {}  # config id -> sequence of its live heap entry
+        self._sequence = itertools.count()
+        self._in_flight: Set[int] = set()
+        self._dispatched: Dict[str, Deque[float]] = {}
+        self._wakeup = threading.Condition()
+        self._thread = None
+        self._next_resync = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def init_app(self, app, dispatch: Callable[[Any], int], is_running: Callable[[int], bool]):
+        """Load enabled configs into the heap and start the scheduler thread
+
+        ``dispatch`` queues a scan for a PlatformConfig and returns the scan id;
+        ``is_running`` reports whether a dispatched scan has not yet finished.
+        """
+        self.app = app
+        self.dispatch = dispatch
+        self.is_running = is_running
+        self.max_concurrent = app.config.get('SCHEDULER_MAX_CONCURRENT', self.max_concurrent)
+        self.jitter_seconds = app.config.get('SCHEDULER_JITTER_SECONDS', self.jitter_seconds)
+        self.platform_budgets.update(app.config.get('SCHEDULER_PLATFORM_BUDGETS', {}))
+        self.resync_seconds = app.config.get('SCHEDULER_RESYNC_SECONDS', self.resync_seconds)
+
+        with app.app_context():
+            self.load()
+
+        self._thread = threading.Thread(target=self._run, name='argus-scan-scheduler', daemon=True)
+        self._thread.start()
+
+    def load(self):
+        """Rebuild the heap from every enabled platform config's next_run"""
+        from ..models.user import db
+        from ..models.scan import PlatformConfig
+
+        configs = PlatformConfig.query.with_entities(
+            PlatformConfig.id, PlatformConfig.scan_frequency, PlatformConfig.last_scan, PlatformConfig.next_run
+        ).filter_by(enabled=True).all()
+
+        entries = []
+        unset = False
+        for config in configs:
+            if config.next_run is not None:
+                due = to_epoch(config.next_run)
+            else:
+                # Fix the jittered due time once, so later rebuilds do not keep pushing it out
+                due = self.next_due(config.last_scan, config.scan_frequency)
+                PlatformConfig.query.filter_by(id=config.id, next_run=None)\
+                                    .update({'next_run': from_epoch(due)}, synchronize_session=False)
+                unset = True
+            entries.append((due, config.id))
+        if unset:
+            db.session.commit()
+
+        with self._wakeup:
+            self._heap = []
+            self._scheduled = {}
+            for due, config_id in entries:
+                sequence = next(self._sequence)
+                self._scheduled[config_id] = sequence
+                self._heap.append((due, sequence, config_id))
+            heapq.heapify(self._heap)
+            self._next_resync = time.time() + self.resync_seconds
+            self._wakeup.notify()
+
+    def schedule(self, config):
+        """(Re)schedule a config from its next_run, or its last_scan and scan_frequency
+
+        Does nothing unless this process runs the scheduler; the process that
+        does picks the change up from the table on its next resync.
+        """
+        if not self.running:
+            return
+
+        if not getattr(config, 'enabled', True):
+            self.unschedule(config.id)
+            return
+
+        next_run = getattr(config, 'next_run', None)
+        due = to_epoch(next_run) if next_run else self.next_due(config.last_scan, config.scan_frequency)
+        self._push(config.id, due)
+
+    def unschedule(self, config_id: int):
+        """Stop scheduling a config; its heap entry is discarded lazily"""
+        with self._wakeup:
+            self._scheduled.pop(config_id, None)
+
+    def next_due(self, last_scan: Optional[datetime], scan_frequency: Optional[int]) -> float:
+        """Epoch seconds when a config is next due, spread by random jitter"""
+        jitter = random.uniform(0, self.jitter_seconds)
+
+        # Never-scanned configs are spread across the jitter window to avoid a startup herd
+        if last_scan is None:
+            return time.time() + jitter
+
+        return to_epoch(last_scan) + (scan_frequency or 24) * 3600 + jitter
+
+    def stats(self) -> Dict[str, Any]:
+        """Current heap size, in-flight scans and budget use"""
+        with self._wakeup:
+            return {
+                'scheduled': len(self._scheduled),
+                'in_flight': len(self._in_flight),
+                'next_due': min((due for due, sequence, config_id in self._heap
+                                 if self._scheduled.get(config_id) == sequence), default=None),
+                'budget_used': {platform: len(sent) for platform, sent in self._dispatched.items()}
+            }
+
+    def _push(self, config_id: int, due: float):
+        with self._wakeup:
+            sequence = next(self._sequence)
+            self._scheduled[config_id] = sequence
+            heapq.heappush(self._heap, (due, sequence, config_id))
+            self._wakeup.notify()
+
+    def _pop_due(self) -> Optional[int]:
+        """Block until a live heap entry is due and return its config id, or None when a resync is due"""
+        with self._wakeup:
+            while True:
+                # Skip entries superseded by a later schedule() or unschedule()
+                while self._heap and self._scheduled.get(self._heap[0][2]) != self._heap[0][1]:
+                    heapq.heappop(self._heap)
+
+                now = time.time()
+                resync_in = self._next_resync - now
+                if self.resync_seconds > 0 and resync_in <= 0:
+                    return None
+
+                if self._heap:
+                    delay = self._heap[0][0] - now
+                    if delay <= 0:
+                        _, _, config_id = heapq.heappop(self._heap)
+                        del self._scheduled[config_id]
+                        return config_id
+                    self._wakeup.wait(timeout=min(delay, resync_in) if self.resync_seconds > 0 else delay)
+                else:
+                    self._wakeup.wait(timeout=resync_in if self.resync_seconds > 0 else None)
+
+    def _has_capacity(self) -> bool:
+        self._in_flight = {scan_id for scan_id in self._in_flight if self.is_running(scan_id)}
+        return len(self._in_flight) < self.max_concurrent
+
+    def _budget_wait(self, platform: str) -> float:
+        """Seconds until the platform's budget allows another scan (0 if it does now)"""
+        budget = self.platform_budgets.get(platform)
+        if budget is None:
+            return 0.0
+
+        sent = self._dispatched.setdefault(platform, deque())
+        now = time.time()
+        while sent and sent[0] <= now - self.budget_window_seconds:
+            sent.popleft()
+
+        if len(sent) < budget:
+            return 0.0
+        return sent[0] + self.budget_window_seconds - now
+
+    def _run(self):
+        while True:
+            config_id = self._pop_due()
+            if config_id is None:
+                try:
+                    with self.app.app_context():
+                        self.load()
+                except Exception as e:
+                    print(f"Error reloading scan schedule: {str(e)}")
+                    with self._wakeup:
+                        self._next_resync = time.time() + self.retry_delay_seconds
+                continue
+
+            try:
+                with self.app.app_context():
+                    self._dispatch_config(config_id)
+            except Exception as e:
+                print(f"Error scheduling scan for platform config {config_id}: {str(e)}")
+                self._push(config_id, time.time() + self.retry_delay_seconds)
+
+    def _dispatch_config(self, config_id: int):
+        from ..models.user import db
+        from ..models.scan import PlatformConfig
+
+        config = PlatformConfig.query.get(config_id)
+        if config is None or not config.enabled:
+            return
+
+        read_next_run = config.next_run
+        if read_next_run is not None and to_epoch(read_next_run) > time.time():
+            # Another scheduler already ran it, or its schedule changed
+            self._push(config_id, to_epoch(read_next_run))
+            return
+
+        if not self._has_capacity():
+            self._push(config_id, time.time() + self.retry_delay_seconds + random.uniform(0, self.retry_delay_seconds))
+            return
+
+        budget_wait = self._budget_wait(config.platform)
+        if budget_wait > 0:
+            self._push(config_id, time.time() + budget_wait + random.uniform(0, self.retry_delay_seconds))
+            return
+
+        # Next run counts from now; last_scan itself is written when the scan completes.
+        # Claim the run by moving next_run on from the value read: of several schedulers, one succeeds
+        due = self.next_due(datetime.utcnow(), config.scan_frequency)
+        claimed = PlatformConfig.query.filter(
+            PlatformConfig.id == config_id,
+            PlatformConfig.next_run.is_(None) if read_next_run is None else PlatformConfig.next_run == read_next_run
+        ).update({'next_run': from_epoch(due)}, synchronize_session=False)
+        db.session.commit()
+
+        if not claimed:
+            db.session.refresh(config)
+            if config.next_run is not None:
+                self._push(config_id, to_epoch(config.next_run))
+            return
+
+        scan_id = self.dispatch(config)
+        self._in_flight.add(scan_id)
+        self._dispatched.setdefault(config.platform, deque()).append(time.time())
+        self._push(config_id, due)
+
+# Global scan scheduler instance
+scan_scheduler = ScanScheduler()
@@ -0,0 +1,85 @@
+"""
+Single Flight Service for Argus Digital Sentinel
+Coalesces concurrent identical calls into one execution whose result every caller shares
+"""
+
+import pickle
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional
+
+from .metrics import metrics
+
+
+class SharedCallError(Exception):
+    """Raised to a caller whose shared call failed; the leader's exception is its ``__cause__``
+
+    Each waiting caller gets its own instance, so tracebacks and handlers in
+    different threads never mutate one shared exception object.
+    """
+
+
+class _Call:
+    __slots__ = ('done', 'snapshot', 'error', 'followers')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.snapshot: Optional[bytes] = None
+        self.error: Optional[BaseException] = None
+        self.followers = 0
+
+
+class SingleFlight:
+    """Runs at most one call per key at a time; callers arriving meanwhile wait for its outcome
+
+    Nothing is kept once a call finishes, so this only deduplicates work that
+    overlaps in time (caching is the response cache's job). The first caller
+    runs ``fn`` and keeps its result; later callers with the same key block
+    until it returns, then get their own copy, unpickled from one snapshot
+    (several times cheaper than a deepcopy each), or a SharedCallError
+    chained to the leader's exception. Results must therefore be picklable.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                call.followers += 1
+
+        if not leader:
+            metrics.inc('argus_single_flight_total', group=self.name, role='shared')
+            call.done.wait()
+            if call.error is not None:
+                raise SharedCallError(str(call.error)) from call.error
+            return pickle.loads(call.snapshot)
+
+        metrics.inc('argus_single_flight_total', group=self.name, role='leader')
+        try:
+            result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            # Unregister before waking followers, so a later caller starts a fresh call
+            with self._lock:
+                del self._calls[key]
+                shared = call.followers > 0
+            if shared and call.error is None:
+                try:
+                    call.snapshot = pickle.dumps(result, pickle.HIGHEST_PROTOCOL)
+                except Exception as e:
+                    call.error = e
+            call.done.set()
+
+        return result
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
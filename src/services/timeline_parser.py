@@ -0,0 +1,159 @@
+"""
+Timeline Parser Service for Argus Digital Sentinel
+Pulls tweets and cursors out of Twitter timeline responses, incrementally when given the raw stream
+"""
+
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import ijson
+
+# Bytes read from the stream per parser step; yajl hands back a whole step's events at once,
+# so larger reads mostly add to peak memory
+PARSE_CHUNK_SIZE = 8 * 1024
+
+INSTRUCTION_PREFIX = 'result.timeline.instructions.item'
+# Entries arrive in a list on TimelineAddEntries, or singly on TimelineReplaceEntry
+ENTRY_PREFIXES = (f'{INSTRUCTION_PREFIX}.entries.item', f'{INSTRUCTION_PREFIX}.entry')
+
+# Entry fields kept, by path below the entry
+TWEET_PATH = 'content.itemContent.tweet_results.result'
+ENTRY_FIELDS = {
+    'entryId': 'entry_id',
+    f'{TWEET_PATH}.rest_id': 'tweet_id',
+    f'{TWEET_PATH}.legacy.full_text': 'text',
+    f'{TWEET_PATH}.legacy.created_at': 'created_at',
+    'content.cursorType': 'cursor_type',
+    'content.value': 'cursor'
+}
+FIELD_PREFIXES = {
+    f'{entry_prefix}.{path}': field
+    for entry_prefix in ENTRY_PREFIXES
+    for path, field in ENTRY_FIELDS.items()
+}
+
+
+class TimelineEntry(NamedTuple):
+    instruction: Optional[str]
+    entry_id: str
+    tweet_id: Optional[str] = None
+    text: Optional[str] = None
+    created_at: Optional[str] = None
+    cursor_type: Optional[str] = None
+    cursor: Optional[str] = None
+
+    @property
+    def is_tweet(self) -> bool:
+        return self.instruction == 'TimelineAddEntries' and self.entry_id.startswith('tweet-')
+
+
+def iter_timeline(source: Any) -> Iterator[TimelineEntry]:
+    """Every entry of a get_user_tweets response, reduced to the fields Argus reads
+
+    ``source`` is an already-parsed response, or the raw JSON as bytes, text or
+    a binary file. Raw input is parsed incrementally with ijson, so only one
+    instruction's reduced entries are held at a time.
+    """
+    if isinstance(source, dict):
+        yield from _walk(source)
+    else:
+        yield from _parse(source)
+
+
+def _walk(tweets: Dict[str, Any]) -> Iterator[TimelineEntry]:
+    instructions = tweets.get('result', {}).get('timeline', {}).get('instructions', [])
+    for instruction in instructions:
+        kind = instruction.get('type')
+        entries = instruction.get('entries') or ([instruction['entry']] if instruction.get('entry') else [])
+        for entry in entries:
+            content = entry.get('content', {})
+            tweet_data = content.get('itemContent', {}).get('tweet_results', {}).get('result', {})
+            legacy = tweet_data.get('legacy', {})
+            # Ids are strings, as the streaming parser reads them, whatever type the provider sent
+            rest_id = tweet_data.get('rest_id')
+            yield TimelineEntry(
+                instruction=kind,
+                entry_id=entry.get('entryId', ''),
+                tweet_id=str(rest_id) if rest_id is not None else None,
+                text=legacy.get('full_text'),
+                created_at=legacy.get('created_at'),
+                cursor_type=content.get('cursorType'),
+                cursor=content.get('value')
+            )
+
+
+def _parse(source: Any) -> Iterator[TimelineEntry]:
+    kind = None
+    pending: List[Dict[str, Any]] = []
+    entry: Optional[Dict[str, Any]] = None
+
+    for prefix, event, value in ijson.parse(source, buf_size=PARSE_CHUNK_SIZE):
+        if entry is not None:
+            field = FIELD_PREFIXES.get(prefix)
+            if field is not None and event in ('string', 'number'):
+                entry[field] = str(value)
+            elif event == 'end_map' and prefix in ENTRY_PREFIXES:
+                pending.append(entry)
+                entry = None
+        elif event == 'start_map' and prefix in ENTRY_PREFIXES:
+            entry = {}
+        elif prefix == f'{INSTRUCTION_PREFIX}.type':
+            kind = value
+        elif prefix == INSTRUCTION_PREFIX:
+            if event == 'start_map':
+                kind, pending = None, []
+            elif event == 'end_map':
+                # The instruction's type may follow its entries, so they are released here
+                for fields in pending:
+                    yield TimelineEntry(instruction=kind, **{'entry_id': '', **fields})
+                pending = []
+
+
+def tweet_items(source: Any) -> Iterator[Tuple[Optional[str], str]]:
+    """Tweet id and full text of every tweet entry"""
+    for entry in iter_timeline(source):
+        if entry.is_tweet and entry.text:
+            yield entry.tweet_id or entry.entry_id, entry.text
+
+
+def timeline_cursor(source: Any) -> Optional[str]:
+    """The bottom cursor, which fetches the next older page"""
+    for entry in iter_timeline(source):
+        if entry.entry_id.startswith('cursor-bottom'):
+            return entry.cursor
+    return None
+
+
+def compact_timeline(source: Any) -> Dict[str, Any]:
+    """The response reduced to its tweet and cursor entries' used fields, in the original shape
+
+    Consumers that walk the full response read the compact one the same way,
+    while it is a fraction of the size to cache and hold in memory. Only for
+    responses Argus analyzes: what a scan stores keeps the provider's fields.
+    """
+    instructions: List[Dict[str, Any]] = []
+    for entry in iter_timeline(source):
+        if entry.is_tweet:
+            tweet = {'rest_id': entry.tweet_id,
+                     'legacy': {'full_text': entry.text, 'created_at': entry.created_at}}
+            content = {'itemContent': {'tweet_results': {'result': _present(tweet)}}}
+        elif entry.cursor is not None:
+            content = {'cursorType': entry.cursor_type, 'value': entry.cursor}
+        else:
+            continue
+
+        if not instructions or instructions[-1]['type'] != entry.instruction:
+            instructions.append({'type': entry.instruction, 'entries': []})
+        instructions[-1]['entries'].append({'entryId': entry.entry_id, 'content': _present(content)})
+
+    return {'result': {'timeline': {'instructions': instructions}}}
+
+
+def _present(fields: Dict[str, Any]) -> Dict[str, Any]:
+    """Drop missing values, recursing into nested dicts"""
+    result = {}
+    for key, value in fields.items():
+        if isinstance(value, dict):
+            value = _present(value)
+        if value is not None and value != {}:
+            result[key] = value
+    return result